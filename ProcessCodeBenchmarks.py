@@ -0,0 +1,760 @@
+import argparse
+import logging
+import os
+import random
+import re
+import string
+import tempfile
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+
+import pandas as pd
+
+import ProcessCodeProject as pcp
+
+logger = logging.getLogger(__name__)
+
+def generate_synthetic_module_bom(rows, seed=42):
+    """Build a ModuleBOM_Simple-shaped frame with realistic MPN, Design ID and process code values."""
+    rng = random.Random(seed)
+    
+    form_factors = ["SODIMM", "UDIMM", "RDIMM", "CUDIMM", "CSODIMM", "MRDIMM", "LPCAMM", "SOCAMM"]
+    speeds = ["4800", "5600", "6400", "7200", "8000", "8800", "12800"]
+    
+    # Many BOM rows share an MPN, so draw rows from a smaller pool of distinct parts
+    distinct_mpns = max(1, rows // 8)
+    mpn_pool = [
+        "MT" + "".join(rng.choices(string.ascii_uppercase + string.digits, k=rng.randint(12, 18)))
+        for _ in range(distinct_mpns)
+    ]
+    
+    records = []
+    for _ in range(rows):
+        design_prefix = rng.choice("ABCDEFGHJKLMNPQRSTZVU")
+        records.append((
+            rng.choice(mpn_pool),
+            design_prefix + "".join(rng.choices(string.digits, k=5)),
+            "".join(rng.choices("ABCDEF0", k=rng.choice([3, 5]))),
+            rng.choice(form_factors),
+            rng.choice(speeds)
+        ))
+    
+    return pd.DataFrame.from_records(records, columns=pcp.MODULE_BOM_LOAD_CONFIG['columns'])
+
+def load_benchmark_bom(args):
+    if args.snapshot:
+        snapshot = pcp.load_data_snapshot()
+        if not snapshot:
+            raise SystemExit(f"No usable snapshot in {pcp.SNAPSHOT_CONFIG['directory']}")
+        return snapshot[0]
+    
+    return generate_synthetic_module_bom(args.rows)
+
+@contextmanager
+def config_override(config, **values):
+    """Set entries of a pcp config dict for the duration of a block, restoring the previous values afterwards."""
+    previous = {key: config[key] for key in values}
+    config.update(values)
+    try:
+        yield
+    finally:
+        config.update(previous)
+
+def time_call(function, *args, repeat=1):
+    start_time = time.perf_counter()
+    for _ in range(repeat):
+        result = function(*args)
+    return (time.perf_counter() - start_time) / repeat, result
+
+def search_mpn_scan(search_term, module_bom_simple_df):
+    """search_mpn_in_rest_api() with the n-gram index switched off: a str.contains scan over every row."""
+    with config_override(pcp.MPN_SEARCH_CONFIG, index=False):
+        return pcp.search_mpn_in_rest_api(search_term, module_bom_simple_df)
+
+def mpn_search_mismatches(terms, module_bom_simple_df):
+    """Search terms whose indexed results differ from the scan."""
+    return [term for term in terms if search_mpn_scan(term, module_bom_simple_df) != pcp.search_mpn_in_rest_api(term, module_bom_simple_df)]
+
+def benchmark_mpn_search(args):
+    """Compare the in-memory str.contains scan, the n-gram index and pushdown LIKE queries on the SQLite stand-in."""
+    module_bom_simple_df = load_benchmark_bom(args)
+    sqlite_path = os.path.join(tempfile.mkdtemp(), "module_bom_standin.sqlite")
+    pcp.build_sqlite_standin(module_bom_simple_df, sqlite_path)
+    
+    with config_override(pcp.MPN_SEARCH_CONFIG, sqlite_path=sqlite_path):
+        run_mpn_search_benchmark(args, module_bom_simple_df)
+
+def run_mpn_search_benchmark(args, module_bom_simple_df):
+    build_seconds, search_index = time_call(pcp.get_mpn_search_index, module_bom_simple_df)
+    
+    terms = args.terms or ["M", "MT", "A1", "Q7Z", "MT4", "MTA1B2", "MT.*Z"]
+    
+    print(f"MPN search benchmark on {len(module_bom_simple_df)} rows ({len(search_index.values)} distinct MPNs, {len(search_index.ngrams)} n-grams, index built in {build_seconds:.2f}s)")
+    print(f"{'term':<10}{'scan ms':>10}{'index ms':>10}{'pushdown ms':>13}{'matches':>10}{'same':>6}")
+    
+    mismatches = []
+    for term in terms:
+        scan_seconds, scan_result = time_call(search_mpn_scan, term, module_bom_simple_df, repeat=args.repeat)
+        index_seconds, index_result = time_call(pcp.search_mpn_in_rest_api, term, module_bom_simple_df, repeat=args.repeat)
+        pushdown_seconds, pushdown_result = time_call(pcp.search_mpn_pushdown, term, 'sqlite', repeat=args.repeat)
+        
+        print(
+            f"{term:<10}{scan_seconds * 1000:>10.1f}{index_seconds * 1000:>10.2f}{pushdown_seconds * 1000:>13.1f}"
+            f"{len(index_result):>10}{str(scan_result == index_result):>6}"
+        )
+        if scan_result != index_result:
+            mismatches.append(term)
+    
+    if mismatches:
+        raise AssertionError(f"Indexed MPN search differs from the scan for {mismatches}")
+    
+    # A refresh builds the next version's indexes while sessions keep searching the current one
+    next_version_df = module_bom_simple_df.copy()
+    builder = threading.Thread(target=lambda: (pcp.get_mpn_search_index(next_version_df), pcp.get_mpn_row_index(next_version_df)))
+    builder.start()
+    time.sleep(0.05)
+    
+    latencies = []
+    while builder.is_alive():
+        seconds, _ = time_call(pcp.search_mpn_in_rest_api, terms[-1], module_bom_simple_df)
+        latencies.append(seconds)
+    builder.join()
+    
+    if latencies:
+        print(f"Searches during the next version's index build: {len(latencies)}, median {sorted(latencies)[len(latencies) // 2] * 1000:.2f} ms, worst {max(latencies) * 1000:.2f} ms")
+
+def get_mpn_records_scan(selected_mpn, module_bom_simple_df):
+    """get_process_code_from_rest_api() with the indexes switched off: a str.contains scan over every row."""
+    with config_override(pcp.MPN_SEARCH_CONFIG, index=False):
+        return pcp.get_process_code_from_rest_api(selected_mpn, module_bom_simple_df)[1]
+
+def get_mpn_records_exact_scan(selected_mpn, module_bom_simple_df):
+    """Rows with a valid Design ID whose normalized MPN equals the selection, by a scan over every row."""
+    mpn_column = pcp.find_material_description_column(module_bom_simple_df)
+    descriptions = module_bom_simple_df[mpn_column]
+    mask = pcp.get_valid_design_id_mask(module_bom_simple_df) & descriptions.notna().to_numpy()
+    mask = mask & (descriptions.astype(str).str.strip().str.upper() == pcp.normalize_mpn(selected_mpn)).to_numpy()
+    return module_bom_simple_df[mask] if mask.any() else None
+
+def same_rows(frames, expected_frames):
+    return all(
+        (frame is None and expected is None) or (frame is not None and expected is not None and frame.index.equals(expected.index))
+        for frame, expected in zip(frames, expected_frames)
+    )
+
+def mpn_select_mismatches(selections, module_bom_simple_df):
+    """Match modes whose rows differ from their scan: contains against the str.contains scan, exact against an equality scan."""
+    expected = {
+        'contains': [get_mpn_records_scan(mpn, module_bom_simple_df) for mpn in selections],
+        'exact': [get_mpn_records_exact_scan(mpn, module_bom_simple_df) for mpn in selections]
+    }
+    return [
+        match for match, expected_frames in expected.items()
+        if not same_rows([pcp.get_process_code_from_rest_api(mpn, module_bom_simple_df, match)[1] for mpn in selections], expected_frames)
+    ]
+
+def benchmark_mpn_select(args):
+    """Rows for a selected MPN: contains scan vs the exact row index vs contains through the n-gram index."""
+    module_bom_simple_df = load_benchmark_bom(args)
+    
+    build_seconds, _ = time_call(lambda: (pcp.get_mpn_search_index(module_bom_simple_df), pcp.get_mpn_row_index(module_bom_simple_df)))
+    
+    rng = random.Random(3)
+    mpn_column = pcp.find_material_description_column(module_bom_simple_df)
+    selections = rng.sample(sorted(module_bom_simple_df[mpn_column].dropna().astype(str).unique()), args.selections)
+    
+    print(f"MPN selection benchmark on {len(module_bom_simple_df)} rows, {len(selections)} MPNs (indexes built in {build_seconds:.2f}s)")
+    print(f"{'method':<10}{'ms/select':>12}{'rows':>10}{'same as scan':>14}")
+    
+    scan_seconds, scan_frames = time_call(lambda: [get_mpn_records_scan(mpn, module_bom_simple_df) for mpn in selections])
+    scan_rows = sum(len(frame) for frame in scan_frames if frame is not None)
+    print(f"{'scan':<10}{scan_seconds * 1000 / len(selections):>12.2f}{scan_rows:>10}{'':>14}")
+    
+    for match in ['exact', 'contains']:
+        seconds, results = time_call(lambda: [pcp.get_process_code_from_rest_api(mpn, module_bom_simple_df, match)[1] for mpn in selections], repeat=args.repeat)
+        rows = sum(len(frame) for frame in results if frame is not None)
+        print(f"{match:<10}{seconds * 1000 / len(selections):>12.3f}{rows:>10}{str(same_rows(results, scan_frames)):>14}")
+    
+    mismatches = mpn_select_mismatches(selections, module_bom_simple_df)
+    if mismatches:
+        raise AssertionError(f"Selected-MPN rows differ from the scan for match {mismatches}")
+
+def generate_synthetic_list_items(count, seed=42):
+    """Item properties shaped like the component validation list, with gaps in the ID sequence from deleted items."""
+    rng = random.Random(seed)
+    
+    items = []
+    item_id = 0
+    for _ in range(count):
+        item_id += rng.choice([1, 1, 1, 2, 5])
+        component_type = rng.choice(["PMIC", "Power Management IC", "SPD&#x2F;Hub", "Temp Sensor", "RCD", "Clock Driver", "Data Buffer", "CKD", "Voltage Regulator", None, "nan"])
+        process_code = "".join(rng.choices("ABCDEF", k=2 if component_type == "Voltage Regulator" else 1))
+        items.append({
+            'ID': item_id,
+            'Title': f"Component {item_id}",
+            'Modified': f"2024-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}T{rng.randint(0, 23):02d}:00:00Z",
+            'Segment': rng.choice(["Client", "Server", "Server/Client"]),
+            'Supplier': rng.choice(["Renesas", "Montage", "Rambus", "TI", "MPS", None]),
+            'Product_x0020_Family': rng.choice(["Gen1", "Gen2", "Gen3"]),
+            'REV': rng.choice(["A0", "B0", "C1"]),
+            'ts0w': component_type,
+            'Process_x0020_Code': process_code,
+            'Supplier_x0020_PN': "".join(rng.choices(string.ascii_uppercase + string.digits, k=10)),
+            'Product_x0020_Comment': rng.choice(["4800", "5600", "6400"]),
+            'Product_x0020_Status': rng.choice(["Qualified", "In Progress", "Obsolete"]),
+            'SAP_x0020_Number': str(rng.randint(100000, 999999))
+        })
+    
+    return items
+
+def benchmark_sharepoint_fetch(args):
+    """Time the partitioned parallel fetch against a recorded list at several concurrency levels."""
+    recording_path = args.recording
+    if not recording_path:
+        recording_path = os.path.join(tempfile.mkdtemp(), "component_validations.json")
+        pcp.save_list_recording(generate_synthetic_list_items(args.items), recording_path)
+    
+    source = pcp.RecordedListSource(recording_path, latency_seconds=args.latency)
+    
+    print(f"SharePoint fetch benchmark on {len(source.items)} items, {args.latency * 1000:.0f} ms per request, page size {args.page_size}")
+    print(f"{'workers':>8}{'partitions':>12}{'pages':>8}{'seconds':>10}{'pages/sec':>11}{'items':>8}{'MB':>8}{'parse s':>9}")
+    
+    for workers in args.workers:
+        _, stats = pcp.fetch_list_items_parallel(
+            source, page_size=args.page_size, max_workers=workers, partition_size=args.partition_size,
+            view_fields=pcp.get_projected_view_fields()
+        )
+        print(
+            f"{workers:>8}{stats['partitions']:>12}{stats['pages']:>8}{stats['seconds']:>10.2f}"
+            f"{stats['pages_per_second']:>11.1f}{stats['rows']:>8}{stats['bytes'] / 1024 ** 2:>8.1f}{stats['parse_seconds']:>9.2f}"
+        )
+
+def legacy_component_validations_frame(items):
+    """The original per-item loop, kept as the baseline for the columnar transform."""
+    component_validations_data = []
+    
+    for item_properties in items:
+        try:
+            record = {'ID': int(item_properties['ID'])}
+            for key, field in pcp.COMPONENT_VALIDATION_FIELD_MAPPING.items():
+                if field and field in item_properties:
+                    if key == 'Component_Type':
+                        component_type_value = str(item_properties[field])
+                        if component_type_value and component_type_value.lower() not in ['none', 'nan', 'null', '']:
+                            record[key] = component_type_value
+                        else:
+                            record[key] = component_type_value if component_type_value else ''
+                    else:
+                        record[key] = str(item_properties[field])
+                else:
+                    record[key] = ""
+            
+            if not record.get('Product_Description'):
+                record['Product_Description'] = str(item_properties.get('Title', ''))
+            
+            if record.get('Segment') and (record.get('Supplier') or record.get('Component_Type') or record.get('Process_Code')):
+                component_validations_data.append(record)
+                
+        except Exception:
+            continue
+    
+    return pd.DataFrame(component_validations_data)
+
+def benchmark_sharepoint_transform(args):
+    """Compare the per-item loop against the columnar transform of list items into component_validations_df."""
+    print(f"{'items':>10}{'loop s':>10}{'columnar s':>12}{'speedup':>9}{'loop rows':>11}{'columnar rows':>15}")
+    
+    for count in args.items:
+        items = generate_synthetic_list_items(count)
+        loop_seconds, loop_df = time_call(legacy_component_validations_frame, items, repeat=args.repeat)
+        columnar_seconds, columnar_df = time_call(pcp.build_component_validations_frame, items, repeat=args.repeat)
+        
+        # Row counts differ by design: the columnar transform also treats 'None'/'nan' text as empty
+        print(
+            f"{count:>10}{loop_seconds:>10.2f}{columnar_seconds:>12.2f}{loop_seconds / columnar_seconds:>8.1f}x"
+            f"{len(loop_df):>11}{len(columnar_df):>15}"
+        )
+
+def ignore_progress(event):
+    pass
+
+def benchmark_load_pipeline(args):
+    """Time the SQL and SharePoint load paths end to end against recorded result sets and list pages, with no network."""
+    overrides = dict(mode='replay', latency_seconds=args.latency, page_size=args.page_size)
+    if args.recordings:
+        overrides['directory'] = args.recordings
+    
+    with config_override(pcp.DATA_SOURCE_CONFIG, **overrides):
+        run_load_pipeline_benchmark(args)
+
+def run_load_pipeline_benchmark(args):
+    print(f"Load pipeline replay from {pcp.DATA_SOURCE_CONFIG['directory']}, {args.latency * 1000:.0f} ms per fetch, page size {args.page_size or 'default'}")
+    print(f"{'run':>4}{'sql s':>9}{'sql rows':>11}{'sp full s':>11}{'sp delta s':>12}{'sp rows':>9}{'peak MB':>9}")
+    
+    for run in range(args.repeat):
+        pcp.reset_module_bom_delta_state()
+        pcp.reset_sharepoint_delta_state()
+        
+        sql_seconds, module_bom_simple_df = time_call(pcp.load_data_incremental, ignore_progress)
+        full_seconds, _ = time_call(pcp.load_data_from_sharepoint, "", "", ignore_progress)
+        delta_seconds, sharepoint_data = time_call(pcp.load_data_from_sharepoint, "", "", ignore_progress)
+        
+        print(
+            f"{run + 1:>4}{sql_seconds:>9.2f}{len(module_bom_simple_df):>11}{full_seconds:>11.2f}{delta_seconds:>12.2f}"
+            f"{len(sharepoint_data['component_validations_df']):>9}{pcp.get_peak_rss_mb() or 0:>9.0f}"
+        )
+
+# Component_Type matching as it worked before Component_Role: decoding scanned search terms per position and
+# the generator dropdowns tested keywords, so the baselines show where role classification changes results
+LEGACY_DECODE_SEARCH_TERMS = {
+    'socamm': {1: ['SPD/Hub', 'SPD', 'Hub'], '2-3': ['Voltage Regulator', 'VR', 'Regulator']},
+    'server': {1: ['PMIC'], 2: ['SPD/Hub', 'SPD', 'Hub'], 3: ['Temp Sensor', 'Temperature Sensor'], 4: ['RCD', 'MRCD', 'Muxed RCD', 'RCD/MRCD'], 5: ['Data Buffer', 'Buffer']},
+    'client': {1: ['PMIC'], 2: ['SPD/Hub', 'SPD', 'Hub'], 3: ['CKD', 'Clock Driver']}
+}
+
+LEGACY_GENERATOR_KEYWORDS = {
+    'pmic': ['pmic', 'power management', 'power mgmt'],
+    'spd/hub': ['spd', 'hub', 'serial presence', 'voltage regulator', 'vr'],
+    'temp sensor': ['temp', 'temperature', 'sensor', 'thermal'],
+    'rcd/mrcd': ['rcd', 'mrcd', 'registering', 'clock driver', 'muxed'],
+    'data buffer': ['data buffer', 'buffer', 'db'],
+    'ckd': ['ckd', 'clock driver']
+}
+
+def legacy_decode_process_code(process_code, segment, component_validations_df, is_socamm=False):
+    """Scan-per-lookup decoding as it worked before the position index: each position and search term filters the segment slice again."""
+    layout_key = pcp.get_position_layout_key(segment, is_socamm)
+    layout = pcp.PROCESS_CODE_POSITION_MAPPINGS.get(layout_key)
+    if layout is None:
+        return pd.DataFrame(), f"Unknown segment: {segment}"
+    
+    segment_data = component_validations_df[pcp.text_isin(component_validations_df['Segment'], [segment, 'Server/Client', 'Client/Server'])]
+    if segment_data.empty:
+        return pd.DataFrame(), f"No data found for segment: {segment}"
+    
+    if is_socamm:
+        positions = [(spec, process_code[spec['start']:spec['start'] + spec['length']]) for spec in layout if len(process_code) >= spec['start'] + spec['length']]
+    else:
+        positions = [(layout[i] if i < len(layout) else None, char) for i, char in enumerate(process_code)]
+    
+    results = []
+    for i, (spec, code) in enumerate(positions):
+        if spec is None:
+            results.append(pcp.build_decode_result_row(i + 1, 'Unknown', code, description=f'Position {i + 1} not defined for {segment}'))
+            continue
+        
+        position_matches = []
+        for search_term in LEGACY_DECODE_SEARCH_TERMS[layout_key][spec['position']]:
+            type_matches = segment_data[
+                pcp.text_upper_equals(segment_data['Process_Code'], code) &
+                pcp.text_contains(segment_data['Component_Type'], search_term, case=False)
+            ]
+            position_matches.extend(type_matches.to_dict('records'))
+        
+        seen_components = set()
+        unique_matches = []
+        for match in position_matches:
+            if pcp.get_component_key(match) not in seen_components:
+                seen_components.add(pcp.get_component_key(match))
+                unique_matches.append(match)
+        if layout_key != 'socamm' and len(unique_matches) > 1:
+            unique_matches.sort(key=pcp.get_component_preference)
+        
+        if unique_matches:
+            for option, match in enumerate(unique_matches):
+                results.append(pcp.build_decode_result_row(spec['position'], spec['expected_type'], code, match, option + 1 if len(unique_matches) > 1 else None))
+        else:
+            results.append(pcp.build_decode_result_row(spec['position'], spec['expected_type'], code, description=f'No {spec["expected_type"]} found with code "{code}"'))
+    
+    results_df = pd.DataFrame(results)
+    if results_df.empty:
+        return pd.DataFrame(), "No components found for this process code"
+    return results_df, f"Found {len(results_df)} component options"
+
+def generate_decode_requests(count, seed=7):
+    """Random (code, segment, is_socamm) lookups covering every position layout."""
+    rng = random.Random(seed)
+    requests = []
+    for _ in range(count):
+        segment, is_socamm, length = rng.choice([("Server", False, 5), ("Client", False, 3), ("Client", True, 3)])
+        requests.append(("".join(rng.choices("ABCDEF", k=length)), segment, is_socamm))
+    return requests
+
+def load_benchmark_catalog(args):
+    items = generate_synthetic_list_items(args.items)
+    return pcp.prepare_component_validations_frame(pcp.build_component_validations_frame(items))
+
+def benchmark_decode(args):
+    """Lookups per second for scan-per-lookup decoding vs the per-version position index."""
+    component_validations_df = load_benchmark_catalog(args)
+    requests = generate_decode_requests(args.lookups)
+    
+    build_start = time.perf_counter()
+    for layout_key, segment in (('server', 'Server'), ('client', 'Client'), ('socamm', 'Client')):
+        pcp.get_position_index(component_validations_df, segment, layout_key)
+    build_seconds = time.perf_counter() - build_start
+    
+    scan_seconds, scan_results = time_call(lambda: [legacy_decode_process_code(code, segment, component_validations_df, is_socamm) for code, segment, is_socamm in requests])
+    index_seconds, index_results = time_call(lambda: [pcp.decode_process_code(code, segment, component_validations_df, is_socamm) for code, segment, is_socamm in requests])
+    
+    # Warm the decode cache once, then time repeat lookups as a rerun would issue them
+    [pcp.decode_process_code_cached(code, segment, component_validations_df, is_socamm) for code, segment, is_socamm in requests]
+    cached_seconds, _ = time_call(lambda: [pcp.decode_process_code_cached(code, segment, component_validations_df, is_socamm) for code, segment, is_socamm in requests])
+    
+    differences = decode_differences(requests, scan_results, index_results)
+    
+    print(f"Decode benchmark: {len(requests)} lookups against {len(component_validations_df)} catalog rows (index built in {build_seconds:.2f}s)")
+    print(f"{'method':<10}{'lookups/sec':>14}{'ms/lookup':>12}")
+    print(f"{'scan':<10}{len(requests) / scan_seconds:>14.0f}{scan_seconds * 1000 / len(requests):>12.3f}")
+    print(f"{'index':<10}{len(requests) / index_seconds:>14.0f}{index_seconds * 1000 / len(requests):>12.3f}")
+    print(f"{'cached':<10}{len(requests) / cached_seconds:>14.0f}{cached_seconds * 1000 / len(requests):>12.3f}")
+    print(f"Lookups decoded differently from the search-term scan: {len(differences)} of {len(requests)}")
+    for (code, segment, is_socamm), (_, scan_message), (_, index_message) in differences[:args.show_differences]:
+        print(f"  {code} {segment}{' SOCAMM' if is_socamm else ''}: scan '{scan_message}', index '{index_message}'")
+    
+    if differences:
+        print(f"{'rows':>8}  {'side':<11}{'position':>9}  {'expected':<18}{'Component_Type':<22}{'Segment':<14}")
+        for (side, position, expected_type, component_type, segment), count in sorted(summarize_decode_differences(differences).items()):
+            print(f"{count:>8}  {side:<11}{position:>9}  {expected_type:<18}{component_type:<22}{segment:<14}")
+        
+        raise AssertionError(f"Indexed decoding differs from the search-term scan on {len(differences)} lookups")
+
+def decode_differences(requests, scan_results, index_results):
+    """(request, scan result, index result) for every lookup whose result frame or message differs."""
+    return [
+        (request, scan, index) for request, scan, index in zip(requests, scan_results, index_results)
+        if decode_rows(scan[0]) != decode_rows(index[0]) or scan[1] != index[1]
+    ]
+
+def decode_rows(results_df):
+    """Decode result rows as comparable tuples; option numbers may be float, Int64 or None."""
+    if results_df.empty:
+        return []
+    return [
+        tuple(None if pd.isna(value) else (int(value) if column == 'Option_Number' else str(value)) for column, value in zip(pcp.DECODE_RESULT_COLUMNS, row))
+        for row in results_df[pcp.DECODE_RESULT_COLUMNS].itertuples(index=False)
+    ]
+
+def decode_matches(results_df):
+    """Decoded rows without their option numbers, so a different option order is not reported as a different match."""
+    option_position = pcp.DECODE_RESULT_COLUMNS.index('Option_Number')
+    return {row[:option_position] + row[option_position + 1:] for row in decode_rows(results_df)}
+
+def summarize_decode_differences(differences):
+    """Rows found by only one of the decoders, counted by position and the Component_Type and segment they carry."""
+    columns = [column for column in pcp.DECODE_RESULT_COLUMNS if column != 'Option_Number']
+    groups = Counter()
+    for _, (scan_df, _), (index_df, _) in differences:
+        scan_rows, index_rows = decode_matches(scan_df), decode_matches(index_df)
+        for side, rows in (('scan only', scan_rows - index_rows), ('index only', index_rows - scan_rows)):
+            for row in rows:
+                row = dict(zip(columns, row))
+                groups[(side, str(row['Position']), row['Expected_Component_Type'], row['Actual_Component_Type'], row['Actual_Segment'])] += 1
+    return groups
+
+def batch_matches_single_decodes(batch_results, requests, component_validations_df):
+    """Check the batch frame against decode_process_code() request by request."""
+    batch_by_request = dict(tuple(batch_results.groupby('Request_ID')))
+    for request_id, (code, segment, is_socamm) in enumerate(requests):
+        single_df, message = pcp.decode_process_code(code, segment, component_validations_df, is_socamm)
+        batch_df = batch_by_request[request_id]
+        if decode_rows(single_df) != decode_rows(batch_df[batch_df['Position'].notna()]) or batch_df['Decode_Message'].iloc[0] != message:
+            return False
+    return True
+
+def benchmark_decode_batch(args):
+    """Codes per second for one decode_process_code() call per code vs the batch join, at several batch sizes."""
+    component_validations_df = load_benchmark_catalog(args)
+    
+    print(f"Batch decode benchmark against {len(component_validations_df)} catalog rows")
+    print(f"{'codes':>10}{'loop codes/sec':>16}{'batch codes/sec':>17}{'rows':>10}")
+    
+    for count in args.codes:
+        requests = generate_decode_requests(count)
+        
+        batch_seconds, batch_results = time_call(lambda: pcp.decode_process_codes_batch(requests, component_validations_df))
+        
+        # The per-code loop is timed on a capped sample and extrapolated
+        loop_requests = requests[:args.loop_limit]
+        loop_seconds, _ = time_call(lambda: [pcp.decode_process_code(code, segment, component_validations_df, is_socamm) for code, segment, is_socamm in loop_requests])
+        loop_rate = len(loop_requests) / loop_seconds if loop_seconds else float('inf')
+        
+        print(f"{count:>10}{loop_rate:>16.0f}{count / batch_seconds:>17.0f}{len(batch_results):>10}")
+    
+    sample = generate_decode_requests(min(args.codes[0], 500))
+    same = batch_matches_single_decodes(pcp.decode_process_codes_batch(sample, component_validations_df), sample, component_validations_df)
+    print(f"Matches single decodes on {len(sample)} codes: {same}")
+    if not same:
+        raise AssertionError("Batch decoding differs from decode_process_code()")
+
+GENERATOR_COMPONENTS = {
+    'Client': ['PMIC', 'SPD/Hub', 'CKD'],
+    'Server': ['PMIC', 'SPD/Hub', 'Temp Sensor', 'RCD/MRCD', 'Data Buffer']
+}
+
+def legacy_component_type_mask(component_types, component_type):
+    keywords = LEGACY_GENERATOR_KEYWORDS.get(str(component_type).lower())
+    if not keywords:
+        return pd.Series(False, index=component_types.index)
+    return pcp.text_contains(component_types, '|'.join(re.escape(keyword) for keyword in keywords), case=False)
+
+def legacy_filtered_options(df, column, **filters):
+    """get_filtered_options as it worked before Component_Role, matching component types on keywords."""
+    filtered_df = df
+    for filter_col, filter_value in filters.items():
+        if filter_value:
+            if filter_col == 'Component_Type':
+                filtered_df = filtered_df[legacy_component_type_mask(filtered_df['Component_Type'], filter_value)]
+            else:
+                filtered_df = filtered_df[pcp.text_contains(filtered_df[filter_col], str(filter_value), case=False)]
+    
+    values = {str(value).strip() for value in filtered_df[column].dropna().unique()}
+    return sorted(value for value in values if value and value.lower() not in pcp.NULL_LIKE_VALUES)
+
+def legacy_component_process_code(segment, supplier, generation, revision, component_type, component_validations_df):
+    """Filter-per-call component lookup as it worked before the generator option index and Component_Role."""
+    filtered_df = component_validations_df[pcp.text_isin(component_validations_df['Segment'], [segment, 'Server/Client', 'Client/Server'])]
+    filtered_df = filtered_df[pcp.text_equals(filtered_df['Supplier'], supplier)]
+    filtered_df = filtered_df[pcp.text_equals(filtered_df['Component_Generation'], generation)]
+    filtered_df = filtered_df[pcp.text_equals(filtered_df['Revision'], revision)]
+    filtered_df = filtered_df[pcp.text_equals(filtered_df['Component_Type'], component_type)]
+    if filtered_df.empty:
+        return "No matching component found", filtered_df
+    
+    process_codes = filtered_df['Process_Code'].dropna().astype(str)
+    process_codes = process_codes[process_codes.str.strip() != '']
+    return (process_codes.iloc[0] if not process_codes.empty else "Process code is empty"), filtered_df
+
+def render_generator_scan(component_validations_df, segment):
+    """Dropdown options and code for the first choice of every component, as one generator rerun computed them."""
+    codes = []
+    for component_type in GENERATOR_COMPONENTS[segment]:
+        suppliers = legacy_filtered_options(component_validations_df, 'Supplier', Segment=segment, Component_Type=component_type)
+        generations = legacy_filtered_options(component_validations_df, 'Component_Generation', Segment=segment, Component_Type=component_type, Supplier=suppliers[0]) if suppliers else []
+        revisions = legacy_filtered_options(component_validations_df, 'Revision', Segment=segment, Component_Type=component_type, Supplier=suppliers[0], Component_Generation=generations[0]) if generations else []
+        if revisions:
+            codes.append(legacy_component_process_code(segment, suppliers[0], generations[0], revisions[0], component_type, component_validations_df)[0])
+    return codes
+
+def render_generator_index(component_validations_df, segment):
+    codes = []
+    for component_type in GENERATOR_COMPONENTS[segment]:
+        suppliers = pcp.get_generator_options(component_validations_df, segment, component_type)
+        generations = pcp.get_generator_options(component_validations_df, segment, component_type, suppliers[0]) if suppliers else []
+        revisions = pcp.get_generator_options(component_validations_df, segment, component_type, suppliers[0], generations[0]) if generations else []
+        if revisions:
+            codes.append(pcp.get_component_process_code(segment, suppliers[0], generations[0], revisions[0], component_type, component_validations_df)[0])
+    return codes
+
+def generator_leaves(component_validations_df, segment, component_type):
+    """(supplier, generation, revision) selections in dropdown order, from the option index and from the keyword scan."""
+    index_leaves = [
+        (supplier, generation, revision)
+        for supplier in pcp.get_generator_options(component_validations_df, segment, component_type)
+        for generation in pcp.get_generator_options(component_validations_df, segment, component_type, supplier)
+        for revision in pcp.get_generator_options(component_validations_df, segment, component_type, supplier, generation)
+    ]
+    
+    filters = {'Segment': segment, 'Component_Type': component_type}
+    scan_leaves = [
+        (supplier, generation, revision)
+        for supplier in legacy_filtered_options(component_validations_df, 'Supplier', **filters)
+        for generation in legacy_filtered_options(component_validations_df, 'Component_Generation', Supplier=supplier, **filters)
+        for revision in legacy_filtered_options(component_validations_df, 'Revision', Supplier=supplier, Component_Generation=generation, **filters)
+    ]
+    return index_leaves, scan_leaves
+
+def generator_index_differences(component_validations_df):
+    """Every selection against the filter-per-call lookup, listing those with different dropdown options, process code or rows.
+    
+    Rows found by only one side are also counted by generator component and the Component_Type and segment they carry.
+    """
+    differences = []
+    row_groups = Counter()
+    selections = 0
+    for segment, component_types in GENERATOR_COMPONENTS.items():
+        for component_type in component_types:
+            index_leaves, scan_leaves = generator_leaves(component_validations_df, segment, component_type)
+            if index_leaves != scan_leaves:
+                for supplier, generation, revision in sorted(set(index_leaves) ^ set(scan_leaves)):
+                    offered_by = 'index' if (supplier, generation, revision) in index_leaves else 'scan'
+                    differences.append((segment, component_type, supplier, generation, revision, f"only offered by the {offered_by}", '', 0, 0))
+            
+            for supplier, generation, revision in sorted(set(index_leaves) | set(scan_leaves)):
+                selections += 1
+                code, _, index_df = pcp.get_component_process_code(segment, supplier, generation, revision, component_type, component_validations_df)
+                scan_code, scan_df = legacy_component_process_code(segment, supplier, generation, revision, component_type, component_validations_df)
+                if code != scan_code or not index_df.index.equals(scan_df.index):
+                    differences.append((segment, component_type, supplier, generation, revision, scan_code, code, len(scan_df), len(index_df)))
+                    for side, rows in (('scan only', scan_df.index.difference(index_df.index)), ('index only', index_df.index.difference(scan_df.index))):
+                        for row_type, row_segment in component_validations_df.loc[rows, ['Component_Type', 'Segment']].itertuples(index=False):
+                            row_groups[(side, segment, component_type, row_type, row_segment)] += 1
+    return differences, row_groups, selections
+
+def benchmark_generator(args):
+    """Generator page renders per second with filter-per-dropdown scans vs the per-version option index."""
+    component_validations_df = load_benchmark_catalog(args)
+    
+    build_seconds, _ = time_call(lambda: [pcp.get_generator_option_index(component_validations_df, segment) for segment in GENERATOR_COMPONENTS])
+    
+    print(f"Generator benchmark against {len(component_validations_df)} catalog rows (index built in {build_seconds:.2f}s)")
+    print(f"{'segment':<10}{'scan ms/render':>16}{'index ms/render':>17}{'same codes':>12}")
+    
+    render_mismatches = []
+    for segment in GENERATOR_COMPONENTS:
+        scan_seconds, scan_codes = time_call(render_generator_scan, component_validations_df, segment, repeat=args.repeat)
+        index_seconds, index_codes = time_call(render_generator_index, component_validations_df, segment, repeat=args.repeat)
+        print(f"{segment:<10}{scan_seconds * 1000:>16.2f}{index_seconds * 1000:>17.3f}{str(scan_codes == index_codes):>12}")
+        if scan_codes != index_codes:
+            render_mismatches.append(segment)
+    
+    if render_mismatches:
+        raise AssertionError(f"Generator renders produce different codes for {', '.join(render_mismatches)}")
+    
+    differences, row_groups, selections = generator_index_differences(component_validations_df)
+    print(f"Selections resolved differently from the keyword scan: {len(differences)} of {selections}")
+    if differences:
+        for segment, component_type, supplier, generation, revision, scan_code, code, scan_rows, index_rows in differences[:args.show_differences]:
+            print(f"  {segment} {component_type} {supplier} {generation} {revision}: scan '{scan_code}' ({scan_rows} rows), index '{code}' ({index_rows} rows)")
+        
+        print(f"{'rows':>8}  {'side':<11}{'segment':<9}{'component':<13}{'Component_Type':<22}{'row Segment':<14}")
+        for (side, segment, component_type, row_type, row_segment), count in sorted(row_groups.items()):
+            print(f"{count:>8}  {side:<11}{segment:<9}{component_type:<13}{row_type:<22}{row_segment:<14}")
+        
+        raise AssertionError(f"Generator option index differs from the filter-per-call path on {len(differences)} selections")
+
+def benchmark_module_codes(args):
+    """Stream every valid module code to CSV and report throughput and peak memory."""
+    component_validations_df = load_benchmark_catalog(args)
+    candidates = pcp.get_module_code_candidates(component_validations_df, args.segment, args.supplier, args.status)
+    combination_count = pcp.count_module_code_combinations(candidates)
+    
+    print(f"{args.segment} module codes from {len(component_validations_df)} catalog rows: {combination_count:,} combinations")
+    print("Candidates per position: " + ", ".join(f"{component_type} {len(options)}" for component_type, options in candidates))
+    
+    output_path = args.output or os.path.join(tempfile.mkdtemp(), f"{args.segment.lower()}_module_codes.csv")
+    with open(output_path, "w", newline="") as output_file:
+        start_time = time.perf_counter()
+        written = pcp.write_module_codes_csv(
+            pcp.enumerate_module_codes(candidates, limit=args.limit),
+            output_file,
+            [component_type for component_type, _ in candidates]
+        )
+        seconds = time.perf_counter() - start_time
+    
+    print(f"Wrote {written:,} codes to {output_path} in {seconds:.2f}s ({written / seconds if seconds else 0:,.0f} codes/sec, peak RSS {pcp.get_peak_rss_mb() or 0:.0f} MB)")
+
+def run_checks(args):
+    """Assert that every indexed path returns what the scan it replaced returns; raises AssertionError on divergence."""
+    component_validations_df = load_benchmark_catalog(args)
+    requests = generate_decode_requests(args.lookups)
+    
+    scan_results = [legacy_decode_process_code(code, segment, component_validations_df, is_socamm) for code, segment, is_socamm in requests]
+    index_results = [pcp.decode_process_code(code, segment, component_validations_df, is_socamm) for code, segment, is_socamm in requests]
+    differences = decode_differences(requests, scan_results, index_results)
+    if differences:
+        raise AssertionError(f"Decode: {len(differences)} of {len(requests)} lookups differ from the search-term scan, first {differences[0][0]}")
+    
+    if not batch_matches_single_decodes(pcp.decode_process_codes_batch(requests, component_validations_df), requests, component_validations_df):
+        raise AssertionError("Decode: batch decoding differs from decode_process_code()")
+    
+    generator_differences, _, generator_selections = generator_index_differences(component_validations_df)
+    if generator_differences:
+        raise AssertionError(f"Generator: {len(generator_differences)} of {generator_selections} selections differ from the filter-per-call path, first {generator_differences[0][:5]}")
+    
+    for segment in GENERATOR_COMPONENTS:
+        if render_generator_scan(component_validations_df, segment) != render_generator_index(component_validations_df, segment):
+            raise AssertionError(f"Generator: {segment} render codes differ from the filter-per-call path")
+    
+    module_bom_simple_df = generate_synthetic_module_bom(args.bom_rows)
+    terms = ["M", "MT", "A1", "Q7Z", "MT4", "MTA1B2", "MT.*Z", "zz", ""]
+    search_mismatches = mpn_search_mismatches(terms, module_bom_simple_df)
+    if search_mismatches:
+        raise AssertionError(f"MPN search: indexed results differ from the scan for {search_mismatches}")
+    
+    mpn_column = pcp.find_material_description_column(module_bom_simple_df)
+    selections = random.Random(3).sample(sorted(module_bom_simple_df[mpn_column].dropna().astype(str).unique()), args.selections)
+    select_mismatches = mpn_select_mismatches(selections, module_bom_simple_df)
+    if select_mismatches:
+        raise AssertionError(f"MPN selection: rows differ from the scan for match {select_mismatches}")
+    
+    print(
+        f"All checks passed: {len(requests)} decodes, {generator_selections} generator selections, {len(terms)} MPN searches "
+        f"and {len(selections)} MPN selections match the scans"
+    )
+
+def main():
+    parser = argparse.ArgumentParser(description="Offline benchmarks for the Process Code app")
+    parser.add_argument("--rows", type=int, default=1000000, help="Rows of synthetic ModuleBOM_Simple data")
+    parser.add_argument("--snapshot", action="store_true", help="Use the local data snapshot instead of synthetic data")
+    parser.add_argument("--repeat", type=int, default=3, help="Repetitions per measurement")
+    
+    subparsers = parser.add_subparsers(dest="benchmark", required=True)
+    
+    mpn_search_parser = subparsers.add_parser("mpn-search", help="In-memory vs pushdown MPN search")
+    mpn_search_parser.add_argument("terms", nargs="*", help="Search terms to time")
+    mpn_search_parser.set_defaults(run=benchmark_mpn_search)
+    
+    mpn_select_parser = subparsers.add_parser("mpn-select", help="Contains scan vs row index for a selected MPN")
+    mpn_select_parser.add_argument("--selections", type=int, default=20, help="Distinct MPNs to select")
+    mpn_select_parser.set_defaults(run=benchmark_mpn_select)
+    
+    sharepoint_fetch_parser = subparsers.add_parser("sharepoint-fetch", help="Partitioned parallel SharePoint list fetch")
+    sharepoint_fetch_parser.add_argument("--recording", help="JSON recording of list items; synthetic items when omitted")
+    sharepoint_fetch_parser.add_argument("--items", type=int, default=20000, help="Synthetic list items")
+    sharepoint_fetch_parser.add_argument("--latency", type=float, default=0.2, help="Simulated seconds per request")
+    sharepoint_fetch_parser.add_argument("--page-size", type=int, default=pcp.SHAREPOINT_CONFIG['page_size'])
+    sharepoint_fetch_parser.add_argument("--partition-size", type=int, default=pcp.SHAREPOINT_CONFIG['partition_size'])
+    sharepoint_fetch_parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8])
+    sharepoint_fetch_parser.set_defaults(run=benchmark_sharepoint_fetch)
+    
+    sharepoint_transform_parser = subparsers.add_parser("sharepoint-transform", help="Per-item loop vs columnar item transform")
+    sharepoint_transform_parser.add_argument("--items", type=int, nargs="+", default=[10000, 100000, 1000000])
+    sharepoint_transform_parser.set_defaults(run=benchmark_sharepoint_transform)
+    
+    load_pipeline_parser = subparsers.add_parser("load-pipeline", help="SQL and SharePoint loaders replayed from recordings")
+    load_pipeline_parser.add_argument("--recordings", help="Recording directory (default DATA_SOURCE_CONFIG directory)")
+    load_pipeline_parser.add_argument("--latency", type=float, default=pcp.DATA_SOURCE_CONFIG['latency_seconds'], help="Simulated seconds per fetch")
+    load_pipeline_parser.add_argument("--page-size", type=int, help="Rows per cursor fetch and items per list page")
+    load_pipeline_parser.set_defaults(run=benchmark_load_pipeline)
+    
+    decode_parser = subparsers.add_parser("decode", help="Scan vs indexed process code decoding")
+    decode_parser.add_argument("--items", type=int, default=5000, help="Synthetic component validation items")
+    decode_parser.add_argument("--lookups", type=int, default=2000, help="Process codes to decode")
+    decode_parser.add_argument("--show-differences", type=int, default=10, help="Differing lookups to list")
+    decode_parser.set_defaults(run=benchmark_decode)
+    
+    decode_batch_parser = subparsers.add_parser("decode-batch", help="Per-code vs batch process code decoding")
+    decode_batch_parser.add_argument("--items", type=int, default=300, help="Synthetic component validation items (kept small so codes have a few options each)")
+    decode_batch_parser.add_argument("--codes", type=int, nargs="+", default=[10000, 100000, 1000000], help="Batch sizes to time")
+    decode_batch_parser.add_argument("--loop-limit", type=int, default=20000, help="Codes timed with the per-code loop")
+    decode_batch_parser.set_defaults(run=benchmark_decode_batch)
+    
+    generator_parser = subparsers.add_parser("generator", help="Filter scans vs option index for the Process Code Generator tab")
+    generator_parser.add_argument("--items", type=int, default=20000, help="Synthetic component validation items")
+    generator_parser.add_argument("--show-differences", type=int, default=10, help="Differing selections to list")
+    generator_parser.set_defaults(run=benchmark_generator)
+    
+    module_codes_parser = subparsers.add_parser("module-codes", help="Stream all valid module process codes to CSV")
+    module_codes_parser.add_argument("--items", type=int, default=5000, help="Synthetic component validation items")
+    module_codes_parser.add_argument("--segment", default="Server", choices=["Client", "Server"])
+    module_codes_parser.add_argument("--supplier", nargs="*", help="Only components from these suppliers")
+    module_codes_parser.add_argument("--status", nargs="*", help="Only components with these Product_Status values")
+    module_codes_parser.add_argument("--limit", type=int, help="Stop after this many codes")
+    module_codes_parser.add_argument("--output", help="CSV path (default: a temporary file)")
+    module_codes_parser.set_defaults(run=benchmark_module_codes)
+    
+    check_parser = subparsers.add_parser("check", help="Assert the indexed paths match the scans they replaced")
+    check_parser.add_argument("--items", type=int, default=3000, help="Synthetic component validation items")
+    check_parser.add_argument("--lookups", type=int, default=500, help="Process codes to decode")
+    check_parser.add_argument("--bom-rows", type=int, default=50000, help="Rows of synthetic ModuleBOM_Simple data")
+    check_parser.add_argument("--selections", type=int, default=50, help="Distinct MPNs to select")
+    check_parser.set_defaults(run=run_checks)
+    
+    args = parser.parse_args()
+    args.run(args)
+
+if __name__ == "__main__":
+    main()
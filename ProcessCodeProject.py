@@ -1,17 +1,59 @@
 import streamlit as st
 import pandas as pd
+import numpy as np
 import pyodbc
 from datetime import datetime
 import pytz
 import logging
-import ssl
 import urllib3
 import requests
-from office365.sharepoint.client_context import ClientContext
-from office365.runtime.auth.user_credential import UserCredential
-from office365.sharepoint.listitems.caml.query import CamlQuery
+from office365.runtime.auth.authentication_context import AuthenticationContext
+from office365.runtime.http.request_options import RequestOptions
 import os
 import re
+import sys
+import json
+import csv
+import io
+import math
+import hashlib
+import pickle
+import copy
+from urllib.parse import quote
+import bisect
+from collections import OrderedDict
+import sqlite3
+from concurrent.futures import ThreadPoolExecutor, wait
+from contextlib import contextmanager
+import threading
+import weakref
+import time
+
+try:
+    import resource
+except ImportError:
+    resource = None
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+try:
+    from streamlit.runtime.scriptrunner import get_script_run_ctx
+except ImportError:
+    get_script_run_ctx = None
+
+try:
+    from office365.runtime.auth.providers import saml_token_provider
+except ImportError:
+    saml_token_provider = None
+
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+except ImportError:
+    pa = None
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -27,12 +69,211 @@ DATABASE_CONFIG = {
     "timeout": 600
 }
 
+# ModuleBOM_Simple load configuration - only the columns the app actually uses are fetched
+MODULE_BOM_LOAD_CONFIG = {
+    "table": "ModuleBOM_Simple",
+    "columns": ["MATERIAL_DESCRIPTION", "DESIGN_ID", "PROCESS_CODE", "FORM_FACTOR", "TRANSFERS_PER_SECOND"],
+    "chunk_size": 50000,
+    "categorical_columns": ["PROCESS_CODE", "FORM_FACTOR", "TRANSFERS_PER_SECOND"]
+}
+
+# Incremental refresh of ModuleBOM_Simple - watermark_column may be a rowversion or a last-modified column
+# Off until watermark_column and key_columns are confirmed against the production ModuleBOM_Simple table
+MODULE_BOM_DELTA_CONFIG = {
+    "enabled": False,
+    "watermark_column": "LAST_MODIFIED_DATE",
+    "key_columns": ["ID"]
+}
+
+# pyodbc connection pool - driver probing runs once per process and connections are reused
+CONNECTION_POOL_CONFIG = {
+    "max_connections": 4,
+    "max_idle_seconds": 600,
+    "health_check_after_seconds": 30,
+    "acquire_timeout": 120
+}
+
+# Local columnar snapshot of the loaded frames, served on cold start while freshness is checked in the background
+SNAPSHOT_CONFIG = {
+    "enabled": True,
+    "directory": os.path.join(os.path.dirname(os.path.abspath(__file__)), "snapshot_cache"),
+    "manifest_file": "manifest.json",
+    "frames": {
+        "module_bom_simple": "module_bom_simple.parquet",
+        "component_validations": "component_validations.parquet"
+    }
+}
+
+# MPN search pushdown - send LIKE queries to SQL instead of scanning the in-memory BOM frame
+MPN_SEARCH_CONFIG = {
+    "pushdown": False,
+    "backend": "sqlserver",
+    "sqlite_path": os.path.join(os.path.dirname(os.path.abspath(__file__)), "snapshot_cache", "module_bom_standin.sqlite"),
+    "cache_size": 256,
+    "cache_ttl": 600,
+    "index": True,
+    "ngram_size": 3,
+    "selected_mpn_match": "contains"  # "contains" keeps the original rows for every MPN containing the selection; "exact" matches the normalized MPN only
+}
+
+# SQL fragments that differ between the production backend and the SQLite stand-in
+PUSHDOWN_DIALECTS = {
+    "sqlserver": {
+        "first_char": "LEFT(LTRIM({column}), 1)",
+        "like_special_chars": "\\%_["
+    },
+    "sqlite": {
+        "first_char": "SUBSTR(LTRIM({column}), 1, 1)",
+        "like_special_chars": "\\%_"
+    }
+}
+
+# Dtype compaction of the loaded frames - low-cardinality text becomes categorical, the rest a compact string dtype
+COMPACTION_CONFIG = {
+    "max_category_ratio": 0.5,
+    "max_categories": 50000,
+    "string_dtype": "string[pyarrow]"
+}
+
+# Boolean column added to ModuleBOM_Simple at load time marking rows with a valid Design ID
+VALID_DESIGN_ID_COLUMN = "DESIGN_ID_VALID"
+
+# Generator component roles assigned to every component_validations_df row at load time, from the keywords the
+# generator has always looked for in Component_Type. A row carries every role whose keywords it contains, joined in
+# rule order into one categorical label; the first is its primary role. Decoding keeps its own per-position search
+# terms (PROCESS_CODE_POSITION_MAPPINGS).
+COMPONENT_ROLE_COLUMN = "Component_Role"
+COMPONENT_ROLE_SEPARATOR = "|"
+COMPONENT_ROLE_KEYWORDS = [
+    ('PMIC', ['pmic', 'power management', 'power mgmt']),
+    ('SPD/Hub', ['spd', 'hub', 'serial presence', 'voltage regulator', 'vr']),
+    ('Temp Sensor', ['temp', 'temperature', 'sensor', 'thermal']),
+    ('RCD/MRCD', ['rcd', 'mrcd', 'registering', 'clock driver', 'muxed']),
+    ('Data Buffer', ['data buffer', 'buffer', 'db']),
+    ('CKD', ['ckd', 'clock driver'])
+]
+COMPONENT_ROLES = [role for role, _ in COMPONENT_ROLE_KEYWORDS]
+
+# Every role-set label, indexed by its bitmask over COMPONENT_ROLES ('' for no role)
+COMPONENT_ROLE_LABELS = [
+    COMPONENT_ROLE_SEPARATOR.join(role for bit, role in enumerate(COMPONENT_ROLES) if role_bits >> bit & 1)
+    for role_bits in range(2 ** len(COMPONENT_ROLES))
+]
+
+# Module generator components per segment in position order, with whether each is required
+MODULE_COMPONENT_LAYOUTS = {
+    'server': [('PMIC', True), ('SPD/Hub', True), ('Temp Sensor', True), ('RCD/MRCD', True), ('Data Buffer', False)],
+    'client': [('PMIC', True), ('SPD/Hub', True), ('CKD', False)]
+}
+
+# Enumeration of every module code the catalog can produce. Streamlit keeps download data in server memory
+# for the session (files passed to download_button are read into bytes too), so max_limit keeps one download small
+MODULE_CODE_ENUMERATION_CONFIG = {
+    "default_limit": 100000,
+    "max_limit": 200000
+}
+
+# SharePoint component validation list - fetched as ID-range partitions in parallel
+SHAREPOINT_CONFIG = {
+    "site_url": "https://microncorp.sharepoint.com/sites/mdg",
+    "list_title": "Module HW Design Component Validations",
+    "page_size": 500,
+    "partition_size": 5000,  # Span of item IDs fetched by one worker
+    "max_workers": 4,
+    "max_retries": 3,
+    "retry_backoff_seconds": 1.0,
+    "project_fields": True  # Request only the mapped fields plus ID/Modified instead of every list column
+}
+
+# HTTP transport owned by the SharePoint client - nothing process-wide is patched
+SHAREPOINT_HTTP_CONFIG = {
+    "verify": False,  # Corporate TLS interception; set to a CA bundle path to verify certificates
+    "connect_timeout": 10,
+    "read_timeout": 60,
+    "pool_maxsize": 16,  # Keep at least SHAREPOINT_CONFIG max_workers so parallel pages reuse connections
+    "connect_retries": 2
+}
+
+# SharePoint internal field names for each component_validations_df column
+COMPONENT_VALIDATION_FIELD_MAPPING = {
+    'Segment': 'Segment',
+    'Supplier': 'Supplier',
+    'Component_Generation': 'Product_x0020_Family',
+    'Revision': 'REV',
+    'Component_Type': 'ts0w',
+    'Process_Code': 'Process_x0020_Code',
+    'SPN': 'Supplier_x0020_PN',
+    'Speed': 'Product_x0020_Comment',
+    'Product_Description': 'Title',
+    'Product_Status': 'Product_x0020_Status',
+    'SAP_Number': 'SAP_x0020_Number'
+}
+
+# Incremental SharePoint sync - items modified since the last sync plus deletions detected from the live ID set
+# The delta query filters on modified_field, which must be indexed in the list settings (List settings ->
+# Indexed columns). Lists over the 5000-item list view threshold reject filters on non-indexed columns;
+# that error is detected and turns delta sync off for the process instead of failing on every refresh.
+SHAREPOINT_DELTA_CONFIG = {
+    "enabled": True,
+    "modified_field": "Modified",
+    "id_page_size": 5000  # ID-only pages are small, so use the CAML maximum
+}
+
+# Record/replay of SQL result sets and SharePoint list pages for offline load benchmarking
+# mode: "live", "record" (live, saving everything fetched) or "replay" (no network, served from recordings)
+DATA_SOURCE_CONFIG = {
+    "mode": os.environ.get("PROCESS_CODE_DATA_MODE", "live"),
+    "directory": os.path.join(os.path.dirname(os.path.abspath(__file__)), "recordings"),
+    "latency_seconds": 0.05,  # Simulated round-trip per cursor fetch or list page in replay
+    "page_size": None  # Replay rows per fetch / items per list page; None keeps the loaders' own sizes
+}
+
+# Stale-while-revalidate refresh - data is rebuilt in the background and swapped in when complete
+DATA_REFRESH_CONFIG = {
+    "interval_seconds": 3600,
+    "min_bom_rows": 1,
+    "required_bom_columns": ["MATERIAL_DESCRIPTION", "PROCESS_CODE"]
+}
+
+# Shared data store - sessions reference a version number instead of holding their own frames
+DATA_STORE_CONFIG = {
+    "session_ttl_seconds": 900
+}
+
+# Decode result memo - repeat lookups of a process code on the same catalog version skip the decode
+DECODE_CACHE_CONFIG = {
+    "max_entries": 4096
+}
+
 def get_available_sql_drivers():
     drivers = pyodbc.drivers()
     sql_drivers = [d for d in drivers if 'SQL Server' in d]
     return sql_drivers
 
-def get_direct_pyodbc_connection():
+def build_connection_string(driver):
+    conn_str = (
+        f"DRIVER={{{driver}}};"
+        f"SERVER={DATABASE_CONFIG['server']};"
+        f"DATABASE={DATABASE_CONFIG['database']};"
+        f"UID={DATABASE_CONFIG['username']};"
+        f"PWD={DATABASE_CONFIG['password']};"
+        f"Connection Timeout={DATABASE_CONFIG['timeout']};"
+    )
+    
+    if "18" in driver:
+        conn_str += "TrustServerCertificate=yes;Encrypt=no;"
+    elif "17" in driver:
+        conn_str += "TrustServerCertificate=yes;"
+    
+    return conn_str
+
+@st.cache_resource
+def get_connection_string_cache():
+    """Process-wide memo of the connection string that last connected successfully."""
+    return {'connection_string': None, 'driver': None, 'lock': threading.Lock()}
+
+def probe_pyodbc_connection():
+    """Try the known drivers in order and return the first connection, remembering its connection string."""
     drivers_to_try = [
         "ODBC Driver 13 for SQL Server",
         "ODBC Driver 17 for SQL Server", 
@@ -41,27 +282,20 @@ def get_direct_pyodbc_connection():
         "SQL Server"
     ]
     
+    cache = get_connection_string_cache()
     available_drivers = get_available_sql_drivers()
     
     for driver in drivers_to_try:
         if driver in available_drivers:
             try:
-                conn_str = (
-                    f"DRIVER={{{driver}}};"
-                    f"SERVER={DATABASE_CONFIG['server']};"
-                    f"DATABASE={DATABASE_CONFIG['database']};"
-                    f"UID={DATABASE_CONFIG['username']};"
-                    f"PWD={DATABASE_CONFIG['password']};"
-                    f"Connection Timeout={DATABASE_CONFIG['timeout']};"
-                )
-                
-                if "18" in driver:
-                    conn_str += "TrustServerCertificate=yes;Encrypt=no;"
-                elif "17" in driver:
-                    conn_str += "TrustServerCertificate=yes;"
+                conn_str = build_connection_string(driver)
                 
                 logger.info(f"Trying connection with driver: {driver}")
-                return pyodbc.connect(conn_str)
+                conn = pyodbc.connect(conn_str)
+                
+                cache['connection_string'] = conn_str
+                cache['driver'] = driver
+                return conn
                 
             except Exception as e:
                 logger.warning(f"Failed with driver {driver}: {str(e)}")
@@ -69,282 +303,2118 @@ def get_direct_pyodbc_connection():
     
     raise Exception(f"Could not connect with any available driver. Available: {available_drivers}")
 
+def get_direct_pyodbc_connection():
+    """Open a new connection, probing drivers only the first time in this process."""
+    cache = get_connection_string_cache()
+    
+    with cache['lock']:
+        conn_str = cache['connection_string']
+        
+        if conn_str is None:
+            return probe_pyodbc_connection()
+    
+    try:
+        return pyodbc.connect(conn_str)
+    except Exception as e:
+        # The memoized driver stopped working (driver removed, server moved) - probe again once
+        logger.warning(f"Cached connection string for driver {cache['driver']} failed, re-probing drivers: {str(e)}")
+        with cache['lock']:
+            cache['connection_string'] = None
+            cache['driver'] = None
+            return probe_pyodbc_connection()
+
+class PyodbcConnectionPool:
+    """Bounded pool of pyodbc connections that health-checks idle connections before reuse."""
+    
+    def __init__(self, max_connections, max_idle_seconds, health_check_after_seconds, acquire_timeout):
+        self.max_connections = max_connections
+        self.max_idle_seconds = max_idle_seconds
+        self.health_check_after_seconds = health_check_after_seconds
+        self.acquire_timeout = acquire_timeout
+        self._slots = threading.BoundedSemaphore(max_connections)
+        self._idle = []
+        self._lock = threading.Lock()
+        self.created_count = 0
+        self.reused_count = 0
+        self.discarded_count = 0
+    
+    def _is_healthy(self, conn):
+        try:
+            cursor = conn.cursor()
+            cursor.execute("SELECT 1")
+            cursor.fetchone()
+            cursor.close()
+            return True
+        except Exception as e:
+            logger.info(f"Discarding unhealthy pooled connection: {str(e)}")
+            return False
+    
+    def _discard(self, conn):
+        self.discarded_count += 1
+        try:
+            conn.close()
+        except Exception:
+            pass
+    
+    def _checkout(self):
+        while True:
+            with self._lock:
+                if not self._idle:
+                    break
+                conn, last_used = self._idle.pop()
+            
+            idle_seconds = time.monotonic() - last_used
+            
+            if idle_seconds > self.max_idle_seconds:
+                self._discard(conn)
+                continue
+            
+            if idle_seconds > self.health_check_after_seconds and not self._is_healthy(conn):
+                self._discard(conn)
+                continue
+            
+            self.reused_count += 1
+            return conn
+        
+        conn = get_direct_pyodbc_connection()
+        self.created_count += 1
+        return conn
+    
+    def _checkin(self, conn):
+        try:
+            # End the implicit transaction so pooled connections never hold locks or stale snapshots
+            conn.rollback()
+        except Exception:
+            self._discard(conn)
+            return
+        
+        with self._lock:
+            self._idle.append((conn, time.monotonic()))
+    
+    @contextmanager
+    def connection(self):
+        """Borrow a connection; it goes back to the pool on success and is closed on error."""
+        if not self._slots.acquire(timeout=self.acquire_timeout):
+            raise Exception(f"Timed out after {self.acquire_timeout}s waiting for one of {self.max_connections} database connections")
+        
+        try:
+            conn = self._checkout()
+            
+            try:
+                yield conn
+            except Exception:
+                self._discard(conn)
+                raise
+            else:
+                self._checkin(conn)
+        finally:
+            self._slots.release()
+    
+    def close_all(self):
+        with self._lock:
+            idle, self._idle = self._idle, []
+        
+        for conn, _ in idle:
+            self._discard(conn)
+    
+    def stats(self):
+        with self._lock:
+            idle_count = len(self._idle)
+        
+        return {
+            'max_connections': self.max_connections,
+            'idle': idle_count,
+            'created': self.created_count,
+            'reused': self.reused_count,
+            'discarded': self.discarded_count
+        }
+
+@st.cache_resource
+def get_connection_pool():
+    """Process-wide connection pool shared by every loader and session."""
+    return PyodbcConnectionPool(
+        max_connections=CONNECTION_POOL_CONFIG['max_connections'],
+        max_idle_seconds=CONNECTION_POOL_CONFIG['max_idle_seconds'],
+        health_check_after_seconds=CONNECTION_POOL_CONFIG['health_check_after_seconds'],
+        acquire_timeout=CONNECTION_POOL_CONFIG['acquire_timeout']
+    )
+
+def borrow_database_connection():
+    """Context manager that lends a pooled connection, e.g. `with borrow_database_connection() as conn:`.
+    
+    In record mode the connection saves every result set; in replay mode no database is touched.
+    """
+    mode = DATA_SOURCE_CONFIG['mode']
+    if mode == 'replay':
+        return replay_database_connection()
+    if mode == 'record':
+        return record_database_connection()
+    return get_connection_pool().connection()
+
+def get_sql_recording_path(query, params):
+    key = hashlib.sha1(f"{' '.join(query.split())}|{repr(list(params or []))}".encode('utf-8')).hexdigest()
+    return os.path.join(DATA_SOURCE_CONFIG['directory'], "sql", f"{key}.pkl")
+
+class RecordedCursor:
+    """DB-API cursor over a result set held in memory, with simulated latency per fetch in replay."""
+    
+    def __init__(self, latency_seconds=0.0, page_size=None):
+        self.latency_seconds = latency_seconds
+        self.page_size = page_size
+        self.description = None
+        self._rows = []
+        self._position = 0
+    
+    def _load(self, recording):
+        self.description = recording['description']
+        self._rows = recording['rows']
+        self._position = 0
+    
+    def execute(self, query, params=None):
+        path = get_sql_recording_path(query, params)
+        if not os.path.exists(path):
+            raise LookupError(f"No SQL recording for query in {path}; run once with PROCESS_CODE_DATA_MODE=record")
+        
+        with open(path, 'rb') as f:
+            self._load(pickle.load(f))
+        time.sleep(self.latency_seconds)
+        return self
+    
+    def fetchmany(self, size=1):
+        if self.page_size:
+            size = min(size, self.page_size)
+        time.sleep(self.latency_seconds)
+        rows = self._rows[self._position:self._position + size]
+        self._position += len(rows)
+        return rows
+    
+    def fetchone(self):
+        rows = self.fetchmany(1)
+        return rows[0] if rows else None
+    
+    def fetchall(self):
+        time.sleep(self.latency_seconds)
+        rows = self._rows[self._position:]
+        self._position = len(self._rows)
+        return rows
+    
+    def close(self):
+        self._rows = []
+
+class RecordingCursor(RecordedCursor):
+    """Runs queries on a live cursor and saves each full result set before serving it."""
+    
+    def __init__(self, cursor):
+        super().__init__()
+        self._cursor = cursor
+    
+    def execute(self, query, params=None):
+        if params:
+            self._cursor.execute(query, params)
+        else:
+            self._cursor.execute(query)
+        
+        recording = {
+            'description': [tuple(column) for column in self._cursor.description or []],
+            'rows': [tuple(row) for row in self._cursor.fetchall()] if self._cursor.description else []
+        }
+        
+        path = get_sql_recording_path(query, params)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(f"{path}.tmp", 'wb') as f:
+            pickle.dump(recording, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(f"{path}.tmp", path)
+        
+        self._load(recording)
+        return self
+    
+    def close(self):
+        super().close()
+        self._cursor.close()
+
+class RecordedConnection:
+    def __init__(self, make_cursor):
+        self._make_cursor = make_cursor
+    
+    def cursor(self):
+        return self._make_cursor()
+    
+    def commit(self):
+        pass
+    
+    def rollback(self):
+        pass
+
+@contextmanager
+def replay_database_connection():
+    yield RecordedConnection(lambda: RecordedCursor(DATA_SOURCE_CONFIG['latency_seconds'], DATA_SOURCE_CONFIG['page_size']))
+
+@contextmanager
+def record_database_connection():
+    with get_connection_pool().connection() as conn:
+        yield RecordedConnection(lambda: RecordingCursor(conn.cursor()))
+
 def test_database_connection():
     try:
         logger.info("Testing database connection...")
         
-        conn = get_direct_pyodbc_connection()
-        cursor = conn.cursor()
-        cursor.execute("SELECT 1 as test")
-        result = cursor.fetchone()
+        with borrow_database_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("SELECT 1 as test")
+            result = cursor.fetchone()
+            cursor.close()
+        
+        logger.info("Database connection successful")
+        return True
+        
+    except Exception as e:
+        logger.error(f"Database connection failed: {str(e)}")
+        return False
+
+def report_progress(progress, level, message="", **counters):
+    """Report loader status. Without a callback, messages go to the sidebar; 'progress' counter events are dropped.
+    
+    Loaders running on a worker thread cannot touch Streamlit elements, so they pass a callback that
+    receives {'level', 'message', **counters} events and the script thread renders them.
+    """
+    if progress is not None:
+        progress({'level': level, 'message': message, **counters})
+    elif level != 'progress':
+        getattr(st.sidebar, level)(message)
+
+def get_peak_rss_mb():
+    """Return the peak resident set size of this process in MB, or None if it cannot be measured."""
+    if resource is not None:
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # ru_maxrss is reported in bytes on macOS and in kilobytes on Linux
+        return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+    
+    if psutil is not None:
+        memory_info = psutil.Process().memory_info()
+        return getattr(memory_info, 'peak_wset', memory_info.rss) / (1024 * 1024)
+    
+    return None
+
+def build_module_bom_query(columns=None, table=None, where=None):
+    """Build the SELECT statement for ModuleBOM_Simple, projecting only the requested columns."""
+    table = table or MODULE_BOM_LOAD_CONFIG['table']
+    
+    if columns:
+        select_list = ", ".join(f"[{column}]" for column in columns)
+    else:
+        select_list = "*"
+    
+    query = f"SELECT {select_list} FROM {table}"
+    if where:
+        query += f" WHERE {where}"
+    
+    return query
+
+def compact_bom_chunk(rows, column_names, categorical_columns=None):
+    """Turn a batch of fetched rows into a DataFrame with compact dtypes."""
+    chunk_df = pd.DataFrame.from_records([tuple(row) for row in rows], columns=column_names)
+    
+    for column in categorical_columns or []:
+        if column in chunk_df.columns:
+            chunk_df[column] = chunk_df[column].astype('category')
+    
+    return chunk_df
+
+def concat_compact_chunks(chunks):
+    """Concatenate chunk frames without falling back to object dtype for categorical columns."""
+    chunks = [chunk.copy(deep=False) for chunk in chunks if chunk is not None]
+    
+    if not chunks:
+        return pd.DataFrame()
+    
+    if len(chunks) == 1:
+        return chunks[0].reset_index(drop=True)
+    
+    # pd.concat only keeps a categorical dtype when every chunk has identical categories
+    for column in chunks[0].columns:
+        if not isinstance(chunks[0][column].dtype, pd.CategoricalDtype):
+            continue
+        
+        categories = chunks[0][column].cat.categories
+        for chunk in chunks[1:]:
+            if column in chunk.columns and isinstance(chunk[column].dtype, pd.CategoricalDtype):
+                categories = categories.append(chunk[column].cat.categories)
+        categories = categories.unique()
+        
+        for chunk in chunks:
+            if column in chunk.columns and isinstance(chunk[column].dtype, pd.CategoricalDtype):
+                chunk[column] = chunk[column].cat.set_categories(categories)
+    
+    return pd.concat(chunks, ignore_index=True)
+
+def stream_query_to_frame(conn, query, params=None, chunk_size=None, description="ModuleBOM_Simple", progress=None):
+    """Run a query and build the result frame chunk by chunk, logging rows/sec and peak RSS."""
+    if chunk_size is None:
+        chunk_size = MODULE_BOM_LOAD_CONFIG['chunk_size']
+    
+    start_time = time.perf_counter()
+    
+    cursor = conn.cursor()
+    try:
+        if params:
+            cursor.execute(query, params)
+        else:
+            cursor.execute(query)
+        column_names = [column[0] for column in cursor.description]
+        
+        chunks = []
+        total_rows = 0
+        
+        while True:
+            rows = cursor.fetchmany(chunk_size)
+            if not rows:
+                break
+            
+            chunks.append(compact_bom_chunk(rows, column_names, MODULE_BOM_LOAD_CONFIG['categorical_columns']))
+            total_rows += len(rows)
+            logger.debug(f"Fetched {total_rows} rows from {description} so far")
+            report_progress(progress, 'progress', f"{description}: {total_rows:,} rows", rows=total_rows)
+    finally:
         cursor.close()
-        conn.close()
+    
+    result_df = concat_compact_chunks(chunks)
+    if not chunks:
+        result_df = pd.DataFrame(columns=column_names)
+    
+    elapsed = time.perf_counter() - start_time
+    rows_per_second = total_rows / elapsed if elapsed > 0 else float('inf')
+    peak_rss_mb = get_peak_rss_mb()
+    memory_mb = result_df.memory_usage(deep=True).sum() / (1024 * 1024)
+    
+    logger.info(
+        f"Loaded {total_rows} records from {description} in {elapsed:.1f}s "
+        f"({rows_per_second:,.0f} rows/sec, {len(chunks)} chunks, frame {memory_mb:.1f} MB, "
+        f"peak RSS {f'{peak_rss_mb:.1f} MB' if peak_rss_mb is not None else 'unavailable'})"
+    )
+    
+    return result_df
+
+def is_text_dtype(series):
+    return pd.api.types.is_object_dtype(series.dtype) or pd.api.types.is_string_dtype(series.dtype)
+
+def get_compact_string_dtype():
+    """The configured compact string dtype, or None when pyarrow is not installed."""
+    try:
+        return pd.StringDtype(COMPACTION_CONFIG['string_dtype'].split('[')[1].rstrip(']'))
+    except Exception:
+        return None
+
+def build_memory_report(before_df, after_df):
+    """Per-column memory usage in bytes before and after compaction."""
+    before_bytes = before_df.memory_usage(deep=True, index=False)
+    after_bytes = after_df.memory_usage(deep=True, index=False)
+    
+    report_df = pd.DataFrame({
+        'Before_Dtype': before_df.dtypes.astype(str),
+        'After_Dtype': after_df.dtypes.astype(str),
+        'Before_Bytes': before_bytes,
+        'After_Bytes': after_bytes
+    })
+    report_df.loc['TOTAL'] = ['', '', before_bytes.sum(), after_bytes.sum()]
+    return report_df
+
+def compact_dataframe(df, name="frame"):
+    """Convert low-cardinality text columns to categoricals and the remaining text to a compact string dtype."""
+    if df is None or df.empty:
+        return df
+    
+    string_dtype = get_compact_string_dtype()
+    compacted_df = df.copy(deep=False)
+    row_count = len(df)
+    
+    for column in df.columns:
+        series = df[column]
+        
+        if not is_text_dtype(series) or isinstance(series.dtype, pd.CategoricalDtype):
+            continue
+        
+        distinct_count = series.nunique(dropna=True)
+        
+        if distinct_count <= COMPACTION_CONFIG['max_categories'] and distinct_count <= row_count * COMPACTION_CONFIG['max_category_ratio']:
+            compacted_df[column] = series.astype('category')
+        elif string_dtype is not None and series.dtype != string_dtype:
+            # Only pure text is converted - bytes (rowversion) or mixed values stay as objects
+            if pd.api.types.infer_dtype(series, skipna=True) in ('string', 'empty'):
+                compacted_df[column] = series.astype(string_dtype)
+    
+    report_df = build_memory_report(df, compacted_df)
+    before_mb = report_df.loc['TOTAL', 'Before_Bytes'] / (1024 * 1024)
+    after_mb = report_df.loc['TOTAL', 'After_Bytes'] / (1024 * 1024)
+    logger.info(f"Compacted {name}: {before_mb:.1f} MB -> {after_mb:.1f} MB")
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug(f"Per-column memory of {name}:\n{report_df.to_string()}")
+    
+    return compacted_df
+
+def text_contains(series, pattern, case=False):
+    """str.contains that works per category for categoricals and treats missing values as non-matching."""
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        category_matches = pd.Series(series.cat.categories.astype(str)).str.contains(pattern, case=case, na=False).to_numpy()
+        codes = series.cat.codes.to_numpy()
+        mask = np.zeros(len(series), dtype=bool)
+        present = codes >= 0
+        mask[present] = category_matches[codes[present]]
+        return pd.Series(mask, index=series.index)
+    
+    if isinstance(series.dtype, pd.StringDtype):
+        return series.str.contains(pattern, case=case, na=False).fillna(False).astype(bool)
+    
+    return series.astype(str).str.contains(pattern, case=case, na=False)
+
+def text_isin(series, values):
+    """Equality test against one or more values, done on category codes for categoricals."""
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        categories = series.cat.categories
+        selected_codes = [categories.get_loc(value) for value in values if value in categories]
+        return pd.Series(np.isin(series.cat.codes.to_numpy(), selected_codes), index=series.index)
+    
+    return series.isin(values).fillna(False).astype(bool)
+
+def text_equals(series, value):
+    return text_isin(series, [value])
+
+def text_upper_equals(series, value):
+    """Case-insensitive equality (`astype(str).str.upper() == value`), evaluated once per category for categoricals."""
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        category_upper = pd.Series(series.cat.categories.astype(str)).str.upper()
+        selected_codes = np.flatnonzero(category_upper.to_numpy() == value)
+        return pd.Series(np.isin(series.cat.codes.to_numpy(), selected_codes), index=series.index)
+    
+    return series.astype(str).str.upper() == value
+
+def prepare_component_validations_frame(component_validations_df):
+    # Roles are recomputed on every build so patched delta rows are classified like the rest
+    component_validations_df = component_validations_df.drop(columns=[COMPONENT_ROLE_COLUMN], errors='ignore')
+    return add_component_roles(compact_dataframe(component_validations_df, "component_validations_df"))
+
+def prepare_module_bom_frame(module_bom_simple_df):
+    """Post-load stage for ModuleBOM_Simple: compact dtypes and precompute Design ID validity."""
+    module_bom_simple_df = compact_dataframe(module_bom_simple_df, "ModuleBOM_Simple")
+    return add_design_id_validity(module_bom_simple_df)
+
+def load_data_from_database(columns=None, chunk_size=None, progress=None):
+    """Stream ModuleBOM_Simple in fixed-size chunks, compacting each chunk as it arrives."""
+    if columns is None:
+        columns = MODULE_BOM_LOAD_CONFIG['columns']
+    
+    try:
+        with borrow_database_connection() as conn:
+            module_bom_simple_df = stream_query_to_frame(conn, build_module_bom_query(columns), chunk_size=chunk_size, progress=progress)
+        
+        return prepare_module_bom_frame(module_bom_simple_df)
+        
+    except Exception as e:
+        logger.error(f"Error loading data from database: {str(e)}")
+        raise
+
+def get_module_bom_schema_signature(conn, table=None):
+    """Return the (column name, data type) pairs of ModuleBOM_Simple, used to detect schema changes."""
+    table = table or MODULE_BOM_LOAD_CONFIG['table']
+    
+    cursor = conn.cursor()
+    try:
+        cursor.execute(
+            "SELECT COLUMN_NAME, DATA_TYPE FROM INFORMATION_SCHEMA.COLUMNS "
+            "WHERE TABLE_NAME = ? ORDER BY ORDINAL_POSITION",
+            table
+        )
+        return tuple((row[0], row[1]) for row in cursor.fetchall())
+    finally:
+        cursor.close()
+
+def build_key_index(df, key_columns):
+    """Build an index over the key columns so rows can be matched between frames."""
+    if len(key_columns) == 1:
+        return pd.Index(df[key_columns[0]])
+    return pd.MultiIndex.from_frame(df[key_columns])
+
+def get_max_watermark(df, watermark_column, current_watermark=None):
+    """Return the highest watermark value in the frame, never moving backwards from the current one."""
+    values = df[watermark_column].dropna() if watermark_column in df.columns else pd.Series(dtype=object)
+    
+    if values.empty:
+        return current_watermark
+    
+    max_value = values.max()
+    if isinstance(max_value, pd.Timestamp):
+        max_value = max_value.to_pydatetime()
+    
+    if current_watermark is not None and current_watermark >= max_value:
+        return current_watermark
+    
+    return max_value
+
+@st.cache_resource
+def get_module_bom_delta_state():
+    """Process-wide delta state (last loaded frame, high-water mark and schema), kept across script reruns."""
+    return {
+        'frame': None,
+        'watermark': None,
+        'schema_signature': None,
+        'missing_tracking_columns': None,
+        'lock': threading.Lock()
+    }
+
+def reset_module_bom_delta_state():
+    """Forget the cached frame, watermark and tracking column check so the next incremental load does a full reload."""
+    state = get_module_bom_delta_state()
+    with state['lock']:
+        state.update({'frame': None, 'watermark': None, 'schema_signature': None, 'missing_tracking_columns': None})
+
+def load_data_incremental(progress=None):
+    """Refresh ModuleBOM_Simple by pulling only the rows changed since the stored watermark."""
+    config = MODULE_BOM_DELTA_CONFIG
+    
+    if not config['enabled']:
+        return load_data_from_database(progress=progress)
+    
+    watermark_column = config['watermark_column']
+    key_columns = list(config['key_columns'])
+    tracking_columns = key_columns + [watermark_column]
+    columns = list(MODULE_BOM_LOAD_CONFIG['columns'])
+    columns += [column for column in tracking_columns if column not in columns]
+    
+    state = get_module_bom_delta_state()
+    
+    with state['lock']:
+        try:
+            with borrow_database_connection() as conn:
+                # A table without the tracking columns is remembered, so later refreshes skip the schema query
+                if state['missing_tracking_columns']:
+                    return prepare_module_bom_frame(stream_query_to_frame(conn, build_module_bom_query(MODULE_BOM_LOAD_CONFIG['columns']), progress=progress))
+                
+                schema_signature = get_module_bom_schema_signature(conn)
+                available_columns = {name for name, _ in schema_signature}
+                missing_columns = [column for column in tracking_columns if column not in available_columns]
+                state['missing_tracking_columns'] = missing_columns
+                
+                if missing_columns:
+                    logger.warning(f"Delta refresh disabled, ModuleBOM_Simple is missing tracking columns: {missing_columns}")
+                    state.update({'frame': None, 'watermark': None, 'schema_signature': None})
+                    return prepare_module_bom_frame(stream_query_to_frame(conn, build_module_bom_query(MODULE_BOM_LOAD_CONFIG['columns']), progress=progress))
+                
+                if state['frame'] is None or state['watermark'] is None:
+                    reason = "no stored watermark"
+                elif state['schema_signature'] != schema_signature:
+                    reason = "schema changed"
+                else:
+                    reason = None
+                
+                if reason:
+                    logger.info(f"Full reload of ModuleBOM_Simple ({reason})")
+                    module_bom_simple_df = stream_query_to_frame(conn, build_module_bom_query(columns), progress=progress)
+                    watermark = get_max_watermark(module_bom_simple_df, watermark_column)
+                else:
+                    previous_df = state['frame']
+                    
+                    changed_df = stream_query_to_frame(
+                        conn,
+                        build_module_bom_query(columns, where=f"[{watermark_column}] > ?"),
+                        params=[state['watermark']],
+                        description="ModuleBOM_Simple (changed rows)",
+                        progress=progress
+                    )
+                    
+                    live_keys_df = stream_query_to_frame(
+                        conn,
+                        build_module_bom_query(key_columns),
+                        description="ModuleBOM_Simple (live keys)"
+                    )
+                    
+                    # Replace changed rows, then drop rows whose keys no longer exist (deletes)
+                    if not changed_df.empty:
+                        previous_df = previous_df[~build_key_index(previous_df, key_columns).isin(build_key_index(changed_df, key_columns))]
+                        previous_df = concat_compact_chunks([previous_df, changed_df])
+                    
+                    live_mask = build_key_index(previous_df, key_columns).isin(build_key_index(live_keys_df, key_columns))
+                    deleted_count = int((~live_mask).sum())
+                    module_bom_simple_df = previous_df[live_mask].reset_index(drop=True) if deleted_count else previous_df
+                    watermark = get_max_watermark(changed_df, watermark_column, state['watermark'])
+                    
+                    logger.info(f"Delta refresh of ModuleBOM_Simple: {len(changed_df)} changed, {deleted_count} deleted, {len(module_bom_simple_df)} total")
+            
+            module_bom_simple_df = prepare_module_bom_frame(module_bom_simple_df)
+            
+            state.update({
+                'frame': module_bom_simple_df,
+                'watermark': watermark,
+                'schema_signature': schema_signature
+            })
+            
+            return module_bom_simple_df
+            
+        except Exception as e:
+            logger.error(f"Error during incremental load of ModuleBOM_Simple: {str(e)}")
+            raise
+
+def get_sharepoint_credentials():
+    """SharePoint credentials from the session, falling back to secrets. Must be called on the script thread."""
+    username = st.session_state.get("sharepoint_username", "")
+    password = st.session_state.get("sharepoint_password", "")
+    
+    # If not in session state, try secrets
+    if not username and "sharepoint_username" in st.secrets:
+        username = st.secrets["sharepoint_username"]
+    if not password and "sharepoint_password" in st.secrets:
+        password = st.secrets["sharepoint_password"]
+    
+    return username, password
+
+def build_caml_condition(condition):
+    """Render one (operator, field, value, value_type) condition; 'In' takes a list of values."""
+    operator, field, value, value_type = condition
+    value_attributes = " IncludeTimeValue='TRUE' StorageTZ='TRUE'" if value_type == 'DateTime' else ""
+    
+    if operator == 'In':
+        values = "".join(f"<Value Type='{value_type}'>{v}</Value>" for v in value)
+        return f"<In><FieldRef Name='{field}' /><Values>{values}</Values></In>"
+    
+    return f"<{operator}><FieldRef Name='{field}' /><Value Type='{value_type}'{value_attributes}>{value}</Value></{operator}>"
+
+def build_id_range_view(after_id=None, max_id=None, page_size=None, ascending=True, conditions=None, view_fields=None):
+    """CAML view over an ID range, ordered by ID so pages can resume from the last ID seen."""
+    all_conditions = []
+    if after_id is not None:
+        all_conditions.append(('Gt', 'ID', after_id, 'Number'))
+    if max_id is not None:
+        all_conditions.append(('Leq', 'ID', max_id, 'Number'))
+    all_conditions.extend(conditions or [])
+    
+    # CAML <And> takes exactly two children, so nest them
+    where = ""
+    if all_conditions:
+        where = build_caml_condition(all_conditions[0])
+        for condition in all_conditions[1:]:
+            where = f"<And>{where}{build_caml_condition(condition)}</And>"
+        where = f"<Where>{where}</Where>"
+    
+    fields = ""
+    if view_fields:
+        fields = "<ViewFields>" + "".join(f"<FieldRef Name='{field}' />" for field in view_fields) + "</ViewFields>"
+    
+    order = "True" if ascending else "False"
+    return (
+        f"<View><Query>{where}<OrderBy><FieldRef Name='ID' Ascending='{order}' /></OrderBy></Query>"
+        f"{fields}<RowLimit>{page_size or SHAREPOINT_CONFIG['page_size']}</RowLimit></View>"
+    )
+
+CAML_OPERATORS = {
+    'Eq': lambda left, right: left == right,
+    'Neq': lambda left, right: left != right,
+    'Gt': lambda left, right: left > right,
+    'Geq': lambda left, right: left >= right,
+    'Lt': lambda left, right: left < right,
+    'Leq': lambda left, right: left <= right,
+    'In': lambda left, right: left in right
+}
+
+def item_matches_conditions(item, conditions):
+    """Evaluate CAML-style conditions against item properties, for list stand-ins."""
+    for operator, field, value, value_type in conditions or []:
+        left = item.get(field)
+        if left is None:
+            return False
+        if value_type == 'Number':
+            left, value = float(left), ([float(v) for v in value] if operator == 'In' else float(value))
+        else:
+            left, value = str(left), ([str(v) for v in value] if operator == 'In' else str(value))
+        if not CAML_OPERATORS[operator](left, value):
+            return False
+    return True
+
+def get_component_validation_view_fields():
+    """ViewFields for component validation queries: the mapped internal names plus ID and Modified."""
+    fields = ['ID', SHAREPOINT_DELTA_CONFIG['modified_field']] + list(COMPONENT_VALIDATION_FIELD_MAPPING.values())
+    return list(dict.fromkeys(field for field in fields if field))
+
+def build_component_validation_filters(segments=None, product_statuses=None):
+    """Server-side CAML filters for callers that need only some segments or product statuses."""
+    conditions = []
+    if segments:
+        conditions.append(('In', COMPONENT_VALIDATION_FIELD_MAPPING['Segment'], list(segments), 'Text'))
+    if product_statuses:
+        conditions.append(('In', COMPONENT_VALIDATION_FIELD_MAPPING['Product_Status'], list(product_statuses), 'Text'))
+    return conditions
+
+def configure_sharepoint_transport(session):
+    """Apply the SharePoint TLS setting, keep-alive connection pool and connect retries to a session."""
+    session.verify = SHAREPOINT_HTTP_CONFIG['verify']
+    
+    retry = urllib3.util.Retry(total=SHAREPOINT_HTTP_CONFIG['connect_retries'], connect=SHAREPOINT_HTTP_CONFIG['connect_retries'], read=0, status=0)
+    adapter = requests.adapters.HTTPAdapter(pool_connections=1, pool_maxsize=SHAREPOINT_HTTP_CONFIG['pool_maxsize'], max_retries=retry)
+    session.mount('https://', adapter)
+    
+    if session.verify is False:
+        urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
+    
+    return session
+
+def build_sharepoint_http_session():
+    """requests.Session for SharePoint REST calls with its own transport settings."""
+    session = configure_sharepoint_transport(requests.Session())
+    session.headers.update({
+        'Accept': 'application/json;odata=nometadata',
+        'Content-Type': 'application/json;odata=nometadata'
+    })
+    return session
+
+class SharePointHandshakeSession(requests.Session):
+    """Session used by the SAML handshake: the SharePoint transport settings plus default timeouts."""
+    
+    def __init__(self):
+        super().__init__()
+        configure_sharepoint_transport(self)
+    
+    def request(self, method, url, **kwargs):
+        kwargs.setdefault('timeout', (SHAREPOINT_HTTP_CONFIG['connect_timeout'], SHAREPOINT_HTTP_CONFIG['read_timeout']))
+        return super().request(method, url, **kwargs)
+
+class SharePointHandshakeRequests:
+    """Stands in for the requests module inside office365's SAML token provider during a handshake.
+    
+    The provider sends its handshake calls with module-level requests.post / requests.session() and neither
+    AuthenticationContext.acquire_token_for_user nor SamlTokenProvider accepts a session or verify argument
+    (checked against office365-rest-python-client 2.5.3, the version pinned in requirements.txt, and 3.2).
+    sharepoint_handshake_transport() binds this object in place of the provider's `requests` name only while
+    SharePointClient authenticates, so the handshake gets SHAREPOINT_HTTP_CONFIG's verify and timeouts.
+    """
+    
+    def __getattr__(self, name):
+        return getattr(requests, name)
+    
+    def session(self):
+        return SharePointHandshakeSession()
+    
+    Session = session
+    
+    def request(self, method, url, **kwargs):
+        with SharePointHandshakeSession() as session:
+            return session.request(method, url, **kwargs)
+    
+    def get(self, url, **kwargs):
+        return self.request('GET', url, **kwargs)
+    
+    def post(self, url, **kwargs):
+        return self.request('POST', url, **kwargs)
+
+if saml_token_provider is not None and not hasattr(saml_token_provider, 'requests'):
+    raise ImportError(
+        "office365's saml_token_provider no longer has a module-level `requests` name, so the SharePoint handshake "
+        "cannot be given its transport settings. Install the office365-rest-python-client version pinned in requirements.txt."
+    )
+
+SAML_HANDSHAKE_LOCK = threading.Lock()
+
+@contextmanager
+def sharepoint_handshake_transport():
+    """Send office365's SAML handshake calls through SharePointHandshakeRequests for the duration of the block."""
+    if saml_token_provider is None:
+        yield
+        return
+    
+    # The provider module is shared, so one handshake at a time swaps the name and always puts the original back
+    with SAML_HANDSHAKE_LOCK:
+        original_requests = saml_token_provider.requests
+        saml_token_provider.requests = SharePointHandshakeRequests()
+        try:
+            yield
+        finally:
+            saml_token_provider.requests = original_requests
+
+class SharePointClient:
+    """Long-lived SharePoint connection that reuses one authentication and the resolved list ids across refreshes.
+    
+    REST calls go through the client's own pooled requests.Session and are safe to make from several threads.
+    When the auth cookies expire (401/403) the authentication is rebuilt once and the request retried.
+    """
+    
+    def __init__(self, site_url, username):
+        self.site_url = site_url
+        self.username = username
+        self._password = None
+        self._lock = threading.Lock()
+        self._auth_context = None
+        self._digest = None
+        self._digest_expires_at = 0.0
+        self._list_ids = {}
+        self._session = build_sharepoint_http_session()
+        self.stats = {'authentications': 0, 'list_lookups': 0, 'reauthentications': 0}
+    
+    def set_password(self, password):
+        with self._lock:
+            if password != self._password:
+                self._password = password
+                self._auth_context = None
+                self._digest = None
+    
+    def _get_auth_context(self):
+        with self._lock:
+            if self._auth_context is None:
+                auth_context = AuthenticationContext(self.site_url)
+                auth_context.acquire_token_for_user(self.username, self._password)
+                
+                # The token and cookies are fetched lazily on the first request, so do it now
+                with sharepoint_handshake_transport():
+                    auth_context.authenticate_request(RequestOptions(self.site_url))
+                
+                self._auth_context = auth_context
+                self.stats['authentications'] += 1
+            return self._auth_context
+    
+    def _invalidate(self, auth_context):
+        with self._lock:
+            if self._auth_context is auth_context:
+                self._auth_context = None
+                self._digest = None
+                self.stats['reauthentications'] += 1
+    
+    def _auth_headers(self, auth_context):
+        options = RequestOptions(self.site_url)
+        # The provider repeats the handshake here once its cookies expire
+        with sharepoint_handshake_transport():
+            auth_context.authenticate_request(options)
+        return dict(options.headers)
+    
+    def _get_digest(self, auth_headers):
+        """The form digest for POST requests, or None when contextinfo rejects the session (401/403)."""
+        with self._lock:
+            if self._digest and time.monotonic() < self._digest_expires_at:
+                return self._digest
+        
+        response = self._session.post(
+            f"{self.site_url}/_api/contextinfo",
+            headers=auth_headers,
+            timeout=(SHAREPOINT_HTTP_CONFIG['connect_timeout'], SHAREPOINT_HTTP_CONFIG['read_timeout'])
+        )
+        if response.status_code in (401, 403):
+            return None
+        response.raise_for_status()
+        context_info = response.json()
+        
+        with self._lock:
+            self._digest = context_info['FormDigestValue']
+            # Renew a minute early so in-flight pages never carry an expired digest
+            self._digest_expires_at = time.monotonic() + context_info['FormDigestTimeoutSeconds'] - 60
+            return self._digest
+    
+    def request(self, method, path, **kwargs):
+        """Send a REST request on the scoped session, re-authenticating once if the session has expired."""
+        for attempt in range(2):
+            auth_context = self._get_auth_context()
+            headers = self._auth_headers(auth_context)
+            if method == 'POST':
+                digest = self._get_digest(dict(headers))
+                if digest is None:
+                    if attempt == 0:
+                        logger.info("SharePoint session expired while fetching the request digest, re-authenticating")
+                        self._invalidate(auth_context)
+                        continue
+                    raise requests.HTTPError("SharePoint rejected the request digest call after re-authenticating")
+                headers['X-RequestDigest'] = digest
+            
+            response = self._session.request(
+                method, f"{self.site_url}{path}", headers=headers,
+                timeout=(SHAREPOINT_HTTP_CONFIG['connect_timeout'], SHAREPOINT_HTTP_CONFIG['read_timeout']),
+                **kwargs
+            )
+            
+            if response.status_code in (401, 403) and attempt == 0:
+                logger.info(f"SharePoint session expired (HTTP {response.status_code}), re-authenticating")
+                self._invalidate(auth_context)
+                continue
+            
+            response.raise_for_status()
+            return response
+    
+    def get_list_id(self, list_title):
+        """Resolve a list by title once; later refreshes address it by id without discovery calls."""
+        with self._lock:
+            list_id = self._list_ids.get(list_title)
+        if list_id:
+            return list_id
+        
+        escaped_title = quote(list_title.replace("'", "''"))
+        list_id = self.request('GET', f"/_api/web/lists/GetByTitle('{escaped_title}')?$select=Id").json()['Id']
+        
+        with self._lock:
+            self._list_ids[list_title] = list_id
+            self.stats['list_lookups'] += 1
+        return list_id
+    
+    def forget_list(self, list_title):
+        with self._lock:
+            self._list_ids.pop(list_title, None)
+    
+    def get_items(self, list_id, view_xml):
+        """Run a CAML query with GetItems. Returns (item properties, page stats with payload bytes and parse seconds)."""
+        response = self.request('POST', f"/_api/web/lists(guid'{list_id}')/GetItems", data=json.dumps({'query': {'ViewXml': view_xml}}))
+        
+        start_time = time.perf_counter()
+        items = response.json()['value']
+        return items, {'bytes': len(response.content), 'parse_seconds': time.perf_counter() - start_time}
+
+@st.cache_resource
+def get_sharepoint_client(site_url, username):
+    return SharePointClient(site_url, username)
+
+class SharePointListSource:
+    """Pages of list items fetched from SharePoint as property dicts, through a shared SharePointClient."""
+    
+    page_size = None
+    
+    def __init__(self, client, list_title):
+        self.client = client
+        self.list_title = list_title
+        self.list_id = client.get_list_id(list_title)
+    
+    def _query(self, view_xml):
+        return self.client.get_items(self.list_id, view_xml)
+    
+    def get_id_range(self):
+        lowest, _ = self._query(build_id_range_view(page_size=1, ascending=True, view_fields=['ID']))
+        highest, _ = self._query(build_id_range_view(page_size=1, ascending=False, view_fields=['ID']))
+        if not lowest or not highest:
+            return None
+        return int(lowest[0]['ID']), int(highest[0]['ID'])
+    
+    def fetch_page(self, after_id, max_id, page_size, conditions=None, view_fields=None):
+        return self._query(build_id_range_view(after_id, max_id, page_size, conditions=conditions, view_fields=view_fields))
+
+class RecordedListSource:
+    """Local stand-in for a SharePoint list, served from a JSON file of item properties with simulated latency."""
+    
+    def __init__(self, path, latency_seconds=0.0, page_size=None):
+        with open(path, 'r') as f:
+            self.items = sorted(json.load(f), key=lambda item: int(item['ID']))
+        self.ids = [int(item['ID']) for item in self.items]
+        self.latency_seconds = latency_seconds
+        self.page_size = page_size
+    
+    def get_id_range(self):
+        time.sleep(self.latency_seconds * 2)
+        if not self.ids:
+            return None
+        return self.ids[0], self.ids[-1]
+    
+    def fetch_page(self, after_id, max_id, page_size, conditions=None, view_fields=None):
+        time.sleep(self.latency_seconds)
+        start = bisect.bisect_right(self.ids, after_id)
+        end = bisect.bisect_right(self.ids, max_id)
+        
+        page = []
+        for item in self.items[start:end]:
+            if item_matches_conditions(item, conditions):
+                page.append({field: item.get(field) for field in ['ID'] + view_fields} if view_fields else item)
+                if len(page) == page_size:
+                    break
+        
+        # Round-trip the page through JSON so payload size and parse time resemble the live list
+        payload = json.dumps(page, default=str)
+        start_time = time.perf_counter()
+        page = json.loads(payload)
+        return page, {'bytes': len(payload), 'parse_seconds': time.perf_counter() - start_time}
+
+class RecordingListSource:
+    """Wraps a live list source and keeps every item it returns, merged by ID, for save_list_recording."""
+    
+    def __init__(self, source, path):
+        self.source = source
+        self.path = path
+        self.items = {}
+        self._lock = threading.Lock()
+        if os.path.exists(path):
+            with open(path, 'r') as f:
+                self.items = {int(item['ID']): item for item in json.load(f)}
+    
+    @property
+    def page_size(self):
+        return self.source.page_size
+    
+    def get_id_range(self):
+        return self.source.get_id_range()
+    
+    def fetch_page(self, after_id, max_id, page_size, conditions=None, view_fields=None):
+        page, page_stats = self.source.fetch_page(after_id, max_id, page_size, conditions, view_fields)
+        with self._lock:
+            for item in page:
+                self.items.setdefault(int(item['ID']), {}).update(item)
+        return page, page_stats
+    
+    def save(self):
+        with self._lock:
+            items = [self.items[item_id] for item_id in sorted(self.items)]
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        save_list_recording(items, f"{self.path}.tmp")
+        os.replace(f"{self.path}.tmp", self.path)
+        logger.info(f"Recorded {len(items)} SharePoint items to {self.path}")
+
+def get_list_recording_path(list_title):
+    return os.path.join(DATA_SOURCE_CONFIG['directory'], "sharepoint", f"{re.sub(r'[^A-Za-z0-9]+', '_', list_title)}.json")
+
+def open_list_source(site_url, list_title, username, password):
+    """List source for the configured data mode: live SharePoint, live with recording, or a replayed recording."""
+    mode = DATA_SOURCE_CONFIG['mode']
+    if mode == 'replay':
+        return RecordedListSource(get_list_recording_path(list_title), DATA_SOURCE_CONFIG['latency_seconds'], DATA_SOURCE_CONFIG['page_size'])
+    
+    client = get_sharepoint_client(site_url, username)
+    client.set_password(password)
+    source = SharePointListSource(client, list_title)
+    
+    if mode == 'record':
+        return RecordingListSource(source, get_list_recording_path(list_title))
+    return source
+
+def save_list_recording(items, path):
+    """Write item properties to a JSON file that RecordedListSource can replay."""
+    with open(path, 'w') as f:
+        json.dump(items, f, default=str)
+
+def plan_id_partitions(min_id, max_id, partition_size):
+    return [(low, min(low + partition_size - 1, max_id)) for low in range(min_id, max_id + 1, partition_size)]
+
+def fetch_partition_with_retry(source, low_id, high_id, page_size, counters, counters_lock, conditions=None, view_fields=None):
+    """Fetch one ID partition page by page. A failed page is retried from the last ID seen, not from the start."""
+    items = []
+    after_id = low_id - 1
+    
+    while True:
+        for attempt in range(SHAREPOINT_CONFIG['max_retries'] + 1):
+            try:
+                page, page_stats = source.fetch_page(after_id, high_id, page_size, conditions, view_fields)
+                break
+            except Exception as e:
+                if attempt == SHAREPOINT_CONFIG['max_retries']:
+                    raise
+                logger.warning(f"SharePoint page after ID {after_id} failed (attempt {attempt + 1}), retrying: {str(e)}")
+                time.sleep(SHAREPOINT_CONFIG['retry_backoff_seconds'] * (2 ** attempt))
+        
+        items.extend(page)
+        with counters_lock:
+            counters['pages'] += 1
+            counters['rows'] += len(page)
+            counters['bytes'] += page_stats['bytes']
+            counters['parse_seconds'] += page_stats['parse_seconds']
+        
+        logger.info(f"SharePoint page after ID {after_id}: {len(page)} items, {page_stats['bytes'] / 1024:.0f} KB, parsed in {page_stats['parse_seconds'] * 1000:.0f} ms")
+        
+        if len(page) < page_size:
+            return items
+        after_id = int(page[-1]['ID'])
+
+def fetch_list_items_parallel(source, page_size=None, max_workers=None, partition_size=None, progress=None, conditions=None, view_fields=None):
+    """Fetch every list item matching conditions by splitting the ID range into partitions fetched concurrently.
+    
+    Returns (items sorted and de-duplicated by ID, stats dict). Progress is reported from the calling thread.
+    """
+    page_size = page_size or source.page_size or SHAREPOINT_CONFIG['page_size']
+    max_workers = max_workers or SHAREPOINT_CONFIG['max_workers']
+    partition_size = partition_size or SHAREPOINT_CONFIG['partition_size']
+    start_time = time.perf_counter()
+    
+    id_range = source.get_id_range()
+    if id_range is None:
+        return [], {'pages': 0, 'rows': 0, 'bytes': 0, 'parse_seconds': 0.0, 'partitions': 0, 'seconds': time.perf_counter() - start_time, 'pages_per_second': 0.0}
+    
+    partitions = plan_id_partitions(id_range[0], id_range[1], partition_size)
+    counters = {'pages': 0, 'rows': 0, 'bytes': 0, 'parse_seconds': 0.0}
+    counters_lock = threading.Lock()
+    
+    with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="sharepoint-fetch") as executor:
+        pending = {
+            executor.submit(fetch_partition_with_retry, source, low_id, high_id, page_size, counters, counters_lock, conditions, view_fields)
+            for low_id, high_id in partitions
+        }
+        futures = list(pending)
+        
+        while pending:
+            _, pending = wait(pending, timeout=0.5)
+            with counters_lock:
+                pages, rows, payload_mb = counters['pages'], counters['rows'], counters['bytes'] / 1024 ** 2
+            report_progress(progress, 'progress', f"SharePoint: {pages} pages, {rows:,} items, {payload_mb:.1f} MB", pages=pages, rows=rows)
+    
+    items_by_id = {}
+    for future in futures:
+        for item in future.result():
+            items_by_id[int(item['ID'])] = item
+    
+    seconds = time.perf_counter() - start_time
+    stats = {
+        'pages': counters['pages'],
+        'rows': len(items_by_id),
+        'bytes': counters['bytes'],
+        'parse_seconds': counters['parse_seconds'],
+        'partitions': len(partitions),
+        'seconds': seconds,
+        'pages_per_second': counters['pages'] / seconds if seconds else 0.0
+    }
+    logger.info(
+        f"Fetched {stats['rows']} SharePoint items in {stats['pages']} pages across {stats['partitions']} partitions "
+        f"with {max_workers} workers: {seconds:.1f}s, {stats['pages_per_second']:.1f} pages/sec, "
+        f"{stats['bytes'] / 1024 ** 2:.1f} MB payload, {stats['parse_seconds']:.2f}s parsing"
+    )
+    
+    return [items_by_id[item_id] for item_id in sorted(items_by_id)], stats
+
+NULL_LIKE_VALUES = ['none', 'nan', 'null', '']
+
+def clean_text_column(values):
+    """Stringify a column, mapping missing and null-like values ('None', 'nan', 'null') to ''."""
+    text = values.astype(object).where(values.notna(), '').astype(str)
+    return text.mask(text.str.strip().str.lower().isin(NULL_LIKE_VALUES), '')
+
+def clean_text_values(values):
+    """clean_text_column for a list of raw field values, returning a compact string column.
+    
+    Plain text is cleaned in Arrow without an object round-trip; mixed values (numbers, lookups) and
+    installs without pyarrow fall back to clean_text_column.
+    """
+    string_dtype = get_compact_string_dtype()
+    if pa is not None and string_dtype is not None:
+        try:
+            text = pa.array(values, type=pa.string())
+        except (pa.ArrowInvalid, pa.ArrowTypeError):
+            text = None
+        
+        if text is not None:
+            null_like = pc.is_in(pc.utf8_lower(pc.utf8_trim_whitespace(text)), value_set=pa.array(NULL_LIKE_VALUES))
+            return pd.Series(pc.if_else(pc.or_kleene(pc.is_null(text), null_like), '', text), dtype=string_dtype)
+    
+    return clean_text_column(pd.Series(values, dtype=object))
+
+def build_component_validations_frame(items, progress=None):
+    """Map SharePoint item properties to component_validations_df columns, keeping the item ID for delta sync.
+    
+    Works column-wise: each mapped field is pulled straight from the items into one array, cleaned
+    and filtered with one mask.
+    """
+    columns = ['ID'] + list(COMPONENT_VALIDATION_FIELD_MAPPING)
+    if not items:
+        return pd.DataFrame(columns=columns)
+    
+    item_ids = pd.Series(pd.to_numeric([item.get('ID') for item in items], errors='coerce'))
+    if item_ids.isna().any():
+        report_progress(progress, 'warning', f"Skipped {int(item_ids.isna().sum())} component validation items without a valid ID")
+    
+    frame = pd.DataFrame({'ID': item_ids})
+    for key, field in COMPONENT_VALIDATION_FIELD_MAPPING.items():
+        frame[key] = clean_text_values([item.get(field) for item in items])
+    
+    frame['Component_Type'] = normalize_component_type_column(frame['Component_Type'])
+    
+    # Only keep records with meaningful data
+    meaningful = (
+        item_ids.notna()
+        & (frame['Segment'] != '')
+        & ((frame['Supplier'] != '') | (frame['Component_Type'] != '') | (frame['Process_Code'] != ''))
+    )
+    
+    frame = frame[meaningful].reset_index(drop=True)
+    frame['ID'] = frame['ID'].astype('int64')
+    return frame[columns]
+
+def get_max_modified(items, current_watermark=None):
+    modified_field = SHAREPOINT_DELTA_CONFIG['modified_field']
+    values = [str(item[modified_field]) for item in items if item.get(modified_field)]
+    if current_watermark:
+        values.append(current_watermark)
+    return max(values) if values else None
+
+def get_sharepoint_field_signature():
+    return sorted(COMPONENT_VALIDATION_FIELD_MAPPING.items())
+
+@st.cache_resource
+def get_sharepoint_delta_state():
+    """Process-wide SharePoint sync point. Survives reruns like the SQL delta state."""
+    return {
+        'frame': None,
+        'watermark': None,
+        'field_signature': None,
+        'threshold_blocked': False,
+        'lock': threading.Lock()
+    }
+
+def reset_sharepoint_delta_state():
+    state = get_sharepoint_delta_state()
+    with state['lock']:
+        state.update({'frame': None, 'watermark': None, 'field_signature': None})
+
+def is_valid_sharepoint_delta_state(frame, watermark, field_signature):
+    if frame is None or frame.empty or 'ID' not in frame.columns or not watermark:
+        return False
+    if field_signature != get_sharepoint_field_signature():
+        return False
+    try:
+        datetime.fromisoformat(watermark.replace('Z', '+00:00'))
+    except ValueError:
+        return False
+    return True
+
+def apply_sharepoint_delta(source, frame, watermark, progress=None):
+    """Fetch items modified since the watermark plus the live ID set, and return the patched frame and new watermark."""
+    modified_condition = ('Geq', SHAREPOINT_DELTA_CONFIG['modified_field'], watermark, 'DateTime')
+    changed_items, _ = fetch_list_items_parallel(source, progress=progress, conditions=[modified_condition], view_fields=get_projected_view_fields())
+    id_items, _ = fetch_list_items_parallel(source, page_size=SHAREPOINT_DELTA_CONFIG['id_page_size'], view_fields=['ID'])
+    
+    live_ids = {int(item['ID']) for item in id_items}
+    changed_ids = {int(item['ID']) for item in changed_items}
+    frame_ids = frame['ID'].astype('int64')
+    
+    deleted_rows = int((~frame_ids.isin(live_ids)).sum())
+    unchanged = frame[frame_ids.isin(live_ids) & ~frame_ids.isin(changed_ids)]
+    changes = build_component_validations_frame(changed_items, progress)
+    
+    # Published versions share frames, so build a new frame rather than editing the cached one
+    patched = concat_compacted(unchanged, changes)
+    patched = patched.sort_values('ID', kind='stable').reset_index(drop=True)
+    patched['ID'] = patched['ID'].astype('int64')
+    
+    report_progress(progress, 'info', f"SharePoint delta sync: {len(changed_ids)} added or modified, {deleted_rows} deleted")
+    return patched, get_max_modified(changed_items, watermark)
+
+def concat_compacted(compacted_df, new_df):
+    """Append rows to a compacted frame, bringing the new rows to its categorical and string dtypes first."""
+    compacted_df = compacted_df.copy(deep=False)
+    new_df = new_df.copy(deep=False)
+    
+    for column in compacted_df.columns.intersection(new_df.columns):
+        dtype = compacted_df[column].dtype
+        
+        if isinstance(dtype, pd.CategoricalDtype):
+            new_values = pd.Index(new_df[column].dropna().unique())
+            categories = dtype.categories.append(new_values.difference(dtype.categories))
+            compacted_df[column] = compacted_df[column].cat.set_categories(categories)
+            new_df[column] = new_df[column].astype(compacted_df[column].dtype)
+        elif isinstance(dtype, pd.StringDtype) and pd.api.types.infer_dtype(new_df[column], skipna=True) in ('string', 'empty'):
+            new_df[column] = new_df[column].astype(dtype)
+    
+    return pd.concat([compacted_df, new_df], ignore_index=True)
+
+def is_list_view_threshold_error(error):
+    """True when SharePoint refused a query for scanning more items than the list view threshold."""
+    response = getattr(error, 'response', None)
+    text = response.text if response is not None else str(error)
+    return 'SPQueryThrottledException' in text or 'list view threshold' in text.lower()
+
+def get_projected_view_fields():
+    return get_component_validation_view_fields() if SHAREPOINT_CONFIG['project_fields'] else None
+
+def sync_component_validations(source, progress=None, segments=None, product_statuses=None):
+    """Delta sync on top of the last sync point when it is valid, otherwise a full fetch of the list.
+    
+    Passing segments or product_statuses filters on the server and leaves the shared sync point untouched.
+    """
+    filters = build_component_validation_filters(segments, product_statuses)
+    if filters:
+        items, _ = fetch_list_items_parallel(source, progress=progress, conditions=filters, view_fields=get_projected_view_fields())
+        return prepare_component_validations_frame(build_component_validations_frame(items, progress)), 'filtered'
+    
+    state = get_sharepoint_delta_state()
+    with state['lock']:
+        frame, watermark, field_signature = state['frame'], state['watermark'], state['field_signature']
+        threshold_blocked = state['threshold_blocked']
+    
+    start_time = time.perf_counter()
+    patched = None
+    
+    if SHAREPOINT_DELTA_CONFIG['enabled'] and not threshold_blocked and is_valid_sharepoint_delta_state(frame, watermark, field_signature):
+        try:
+            patched, watermark = apply_sharepoint_delta(source, frame, watermark, progress)
+            mode = 'delta'
+        except Exception as e:
+            if is_list_view_threshold_error(e):
+                logger.warning(
+                    f"SharePoint rejected the delta query for exceeding the list view threshold. Index the "
+                    f"'{SHAREPOINT_DELTA_CONFIG['modified_field']}' column on the list; delta sync is off until restart"
+                )
+                with state['lock']:
+                    state['threshold_blocked'] = True
+            else:
+                logger.warning(f"SharePoint delta sync failed, falling back to a full sync: {str(e)}")
+    
+    if patched is None:
+        items, _ = fetch_list_items_parallel(source, progress=progress, view_fields=get_projected_view_fields())
+        patched = build_component_validations_frame(items, progress)
+        watermark = get_max_modified(items)
+        mode = 'full'
+    
+    component_validations_df = prepare_component_validations_frame(patched)
+    
+    if not component_validations_df.empty:
+        with state['lock']:
+            state.update({
+                'frame': component_validations_df,
+                'watermark': watermark,
+                'field_signature': get_sharepoint_field_signature()
+            })
+    
+    logger.info(f"SharePoint {mode} sync: {len(component_validations_df)} rows in {time.perf_counter() - start_time:.1f}s, watermark {watermark}")
+    return component_validations_df, mode
+
+def load_data_from_sharepoint(username=None, password=None, progress=None, segments=None, product_statuses=None):
+    """Load data from SharePoint with comprehensive error handling.
+    
+    Pass credentials and a progress callback when calling from a worker thread; otherwise they are
+    read from the session and messages are shown in the sidebar. segments / product_statuses limit
+    the load to a subset, filtered on the server.
+    """
+    data = {
+        'component_validations_df': pd.DataFrame(),
+        'module_validation_df': pd.DataFrame(),
+        'end_products_df': pd.DataFrame()
+    }
+    
+    sharepoint_site = SHAREPOINT_CONFIG['site_url']
+    list_name = SHAREPOINT_CONFIG['list_title']
+    
+    # Always get credentials from session state first, then fall back to secrets
+    if username is None or password is None:
+        username, password = get_sharepoint_credentials()
+    
+    replay = DATA_SOURCE_CONFIG['mode'] == 'replay'
+    if not (username and password) and not replay:
+        report_progress(progress, 'warning', "Please provide SharePoint credentials to load data.")
+        return data
+    
+    try:
+        # Live sources reuse the process-wide client: its auth cookies and the resolved list id survive across refreshes
+        try:
+            source = open_list_source(sharepoint_site, list_name, username, password)
+            
+        except Exception as ctx_error:
+            report_progress(progress, 'error', f"Failed to connect to SharePoint list '{list_name}': {str(ctx_error)}")
+            return data
+        
+        # Retrieve items as ID-range partitions fetched in parallel - only changes when a sync point exists
+        try:
+            fetch_start_time = time.perf_counter()
+            component_validations_df, sync_mode = sync_component_validations(source, progress, segments, product_statuses)
+            
+        except Exception as items_error:
+            # The cached list id may be stale (list recreated), so resolve it again next time
+            if not replay:
+                get_sharepoint_client(sharepoint_site, username).forget_list(list_name)
+            report_progress(progress, 'error', f"Failed to retrieve items from target list: {str(items_error)}")
+            return data
+        
+        if component_validations_df.empty:
+            report_progress(progress, 'error', "No items found in the list")
+            return data
+        
+        report_progress(progress, 'success', f"Loaded {len(component_validations_df)} component validations from SharePoint ({sync_mode} sync, {time.perf_counter() - fetch_start_time:.1f}s)")
+        
+        data['component_validations_df'] = component_validations_df
+        
+        if isinstance(source, RecordingListSource):
+            source.save()
+        
+    except Exception as e:
+        report_progress(progress, 'error', f"Error connecting to SharePoint: {str(e)}")
+
+    return data
+
+def empty_sharepoint_data():
+    return {
+        'component_validations_df': pd.DataFrame(),
+        'module_validation_df': pd.DataFrame(),
+        'end_products_df': pd.DataFrame()
+    }
+
+def render_load_progress(placeholders, status):
+    labels = {'sql': 'SQL', 'sharepoint': 'SharePoint'}
+    
+    for source, placeholder in placeholders.items():
+        source_status = status[source]
+        counters = []
+        if source_status['pages']:
+            counters.append(f"{source_status['pages']:,} pages")
+        counters.append(f"{source_status['rows']:,} rows")
+        placeholder.caption(f"{labels[source]} - {source_status['state']}: {', '.join(counters)}")
+
+def run_loaders_concurrently(username, password, on_event):
+    """Load SQL and SharePoint at the same time. on_event(source, event) receives progress from the worker threads.
+    
+    Returns (sql_data, sharepoint_data, errors). A failure in one source does not stop the other.
+    """
+    def make_progress(source):
+        return lambda event: on_event(source, event)
+    
+    start_time = time.perf_counter()
+    
+    with ThreadPoolExecutor(max_workers=2, thread_name_prefix="data-load") as executor:
+        futures = {
+            executor.submit(load_data_incremental, progress=make_progress('sql')): 'sql',
+            executor.submit(load_data_from_sharepoint, username, password, progress=make_progress('sharepoint')): 'sharepoint'
+        }
+        
+        for future in futures:
+            future.exception()
+    
+    results = {}
+    errors = {}
+    for future, source in futures.items():
+        try:
+            results[source] = future.result()
+            on_event(source, {'level': 'progress', 'state': 'done'})
+        except Exception as e:
+            errors[source] = str(e)
+            on_event(source, {'level': 'progress', 'state': 'failed'})
+            logger.error(f"Error loading {source} data: {str(e)}")
+    
+    logger.info(f"Loaded data sources concurrently in {time.perf_counter() - start_time:.1f}s (errors: {errors or 'none'})")
+    
+    return results.get('sql'), results.get('sharepoint') or empty_sharepoint_data(), errors
+
+def compute_frame_hash(df):
+    """Content hash of a frame (column names plus row hashes), used to identify snapshot contents."""
+    hasher = hashlib.sha256()
+    hasher.update("|".join(map(str, df.columns)).encode('utf-8'))
+    if not df.empty:
+        hasher.update(pd.util.hash_pandas_object(df, index=False).values.tobytes())
+    return hasher.hexdigest()
+
+def encode_watermark(value):
+    """Make a delta-refresh watermark JSON serializable for the snapshot manifest."""
+    if value is None:
+        return None
+    if hasattr(value, 'item'):
+        value = value.item()
+    if isinstance(value, (bytes, bytearray)):
+        return {'type': 'bytes', 'value': bytes(value).hex()}
+    if isinstance(value, datetime):
+        return {'type': 'datetime', 'value': value.isoformat()}
+    if isinstance(value, (int, float)):
+        return {'type': 'number', 'value': value}
+    return {'type': 'str', 'value': str(value)}
+
+def decode_watermark(encoded):
+    if not encoded:
+        return None
+    if encoded['type'] == 'bytes':
+        return bytes.fromhex(encoded['value'])
+    if encoded['type'] == 'datetime':
+        return datetime.fromisoformat(encoded['value'])
+    return encoded['value']
+
+def read_snapshot_manifest():
+    manifest_path = os.path.join(SNAPSHOT_CONFIG['directory'], SNAPSHOT_CONFIG['manifest_file'])
+    
+    if not os.path.exists(manifest_path):
+        return None
+    
+    try:
+        with open(manifest_path, 'r', encoding='utf-8') as manifest_file:
+            return json.load(manifest_file)
+    except Exception as e:
+        logger.warning(f"Ignoring unreadable snapshot manifest: {str(e)}")
+        return None
+
+def save_data_snapshot(module_bom_simple_df, sharepoint_data):
+    """Persist the loaded frames as Parquet plus a manifest with load time, row counts and content hashes."""
+    directory = SNAPSHOT_CONFIG['directory']
+    
+    # Prefer the delta-refresh frame so the snapshot and its watermark always belong together
+    delta_state = get_module_bom_delta_state()
+    with delta_state['lock']:
+        if delta_state['frame'] is not None:
+            module_bom_simple_df = delta_state['frame']
+            sql_watermark = encode_watermark(delta_state['watermark'])
+            sql_schema_signature = [list(column) for column in delta_state['schema_signature'] or []]
+        else:
+            sql_watermark = None
+            sql_schema_signature = None
+    
+    sharepoint_state = get_sharepoint_delta_state()
+    with sharepoint_state['lock']:
+        if sharepoint_state['frame'] is not None:
+            sharepoint_data = dict(sharepoint_data or {}, component_validations_df=sharepoint_state['frame'])
+            sharepoint_watermark = sharepoint_state['watermark']
+        else:
+            sharepoint_watermark = None
+    
+    try:
+        os.makedirs(directory, exist_ok=True)
+        manifest = read_snapshot_manifest() or {'frames': {}}
+        
+        frames = {
+            'module_bom_simple': module_bom_simple_df,
+            'component_validations': sharepoint_data.get('component_validations_df') if sharepoint_data else None
+        }
+        
+        for name, df in frames.items():
+            # An empty load (e.g. missing SharePoint credentials) must not wipe a good snapshot
+            if df is None or df.empty:
+                continue
+            
+            file_name = SNAPSHOT_CONFIG['frames'][name]
+            temp_path = os.path.join(directory, f"{file_name}.tmp")
+            df.to_parquet(temp_path, index=False)
+            os.replace(temp_path, os.path.join(directory, file_name))
+            
+            manifest['frames'][name] = {
+                'file': file_name,
+                'rows': len(df),
+                'content_hash': compute_frame_hash(df),
+                'saved_at': datetime.now(pytz.utc).isoformat()
+            }
+        
+        manifest['sql_watermark'] = sql_watermark
+        manifest['sql_schema_signature'] = sql_schema_signature
+        manifest['sharepoint_watermark'] = sharepoint_watermark
+        manifest['sharepoint_field_signature'] = get_sharepoint_field_signature() if sharepoint_watermark else None
+        manifest['loaded_at'] = datetime.now(pytz.utc).isoformat()
+        manifest['source_row_counts'] = {name: entry['rows'] for name, entry in manifest['frames'].items()}
+        
+        temp_manifest_path = os.path.join(directory, f"{SNAPSHOT_CONFIG['manifest_file']}.tmp")
+        with open(temp_manifest_path, 'w', encoding='utf-8') as manifest_file:
+            json.dump(manifest, manifest_file, indent=2)
+        os.replace(temp_manifest_path, os.path.join(directory, SNAPSHOT_CONFIG['manifest_file']))
+        
+        logger.info(f"Saved data snapshot to {directory}: {manifest['source_row_counts']}")
+        return True
+        
+    except Exception as e:
+        logger.error(f"Error saving data snapshot: {str(e)}")
+        return False
+
+def load_data_snapshot():
+    """Read the Parquet snapshot. Returns (module_bom_simple_df, sharepoint_data, manifest) or None."""
+    manifest = read_snapshot_manifest()
+    
+    if not manifest or 'module_bom_simple' not in manifest.get('frames', {}):
+        return None
+    
+    try:
+        start_time = time.perf_counter()
+        frames = {}
+        
+        for name, entry in manifest['frames'].items():
+            df = pd.read_parquet(os.path.join(SNAPSHOT_CONFIG['directory'], entry['file']))
+            
+            if len(df) != entry['rows']:
+                logger.warning(f"Snapshot frame {name} has {len(df)} rows, manifest says {entry['rows']} - ignoring snapshot")
+                return None
+            
+            frames[name] = df
+        
+        if VALID_DESIGN_ID_COLUMN not in frames['module_bom_simple'].columns:
+            frames['module_bom_simple'] = add_design_id_validity(frames['module_bom_simple'])
+        
+        # Roles are always recomputed, so snapshots saved under older role rules are classified like a fresh load
+        if 'component_validations' in frames:
+            frames['component_validations'] = add_component_roles(frames['component_validations'])
+        
+        sharepoint_data = {
+            'component_validations_df': frames.get('component_validations', pd.DataFrame()),
+            'module_validation_df': pd.DataFrame(),
+            'end_products_df': pd.DataFrame()
+        }
+        
+        logger.info(f"Loaded data snapshot from {manifest['loaded_at']} in {time.perf_counter() - start_time:.2f}s")
+        return frames['module_bom_simple'], sharepoint_data, manifest
+        
+    except Exception as e:
+        logger.warning(f"Could not load data snapshot: {str(e)}")
+        return None
+
+def seed_delta_state_from_snapshot(module_bom_simple_df, manifest):
+    """Let the first refresh after a restart be a delta refresh on top of the snapshot."""
+    watermark = decode_watermark(manifest.get('sql_watermark'))
+    schema_signature = manifest.get('sql_schema_signature')
+    
+    if watermark is None or not schema_signature:
+        return
+    
+    state = get_module_bom_delta_state()
+    with state['lock']:
+        if state['frame'] is None:
+            state.update({
+                'frame': module_bom_simple_df,
+                'watermark': watermark,
+                'schema_signature': tuple(tuple(column) for column in schema_signature)
+            })
+
+def seed_sharepoint_delta_state_from_snapshot(component_validations_df, manifest):
+    """Let the first SharePoint refresh after a restart be a delta sync on top of the snapshot."""
+    watermark = manifest.get('sharepoint_watermark')
+    field_signature = [tuple(pair) for pair in manifest.get('sharepoint_field_signature') or []]
+    
+    if not is_valid_sharepoint_delta_state(component_validations_df, watermark, field_signature):
+        return
+    
+    state = get_sharepoint_delta_state()
+    with state['lock']:
+        if state['frame'] is None:
+            state.update({
+                'frame': component_validations_df,
+                'watermark': watermark,
+                'field_signature': field_signature
+            })
+
+def check_snapshot_freshness(manifest):
+    """Compare the snapshot against the source row count and watermark. Returns a freshness dict."""
+    try:
+        watermark = decode_watermark(manifest.get('sql_watermark'))
+        watermark_column = MODULE_BOM_DELTA_CONFIG['watermark_column']
+        select_list = "COUNT(*)"
+        if watermark is not None:
+            select_list += f", MAX([{watermark_column}])"
+        
+        with borrow_database_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(f"SELECT {select_list} FROM {MODULE_BOM_LOAD_CONFIG['table']}")
+            row = cursor.fetchone()
+            cursor.close()
+        
+        source_rows = row[0]
+        snapshot_rows = manifest['source_row_counts'].get('module_bom_simple')
+        stale_reasons = []
+        
+        if source_rows != snapshot_rows:
+            stale_reasons.append(f"{source_rows} rows in SQL vs {snapshot_rows} in snapshot")
+        if watermark is not None and row[1] is not None and row[1] > watermark:
+            stale_reasons.append("rows modified since the snapshot")
+        
+        freshness = {
+            'status': 'stale' if stale_reasons else 'fresh',
+            'detail': "; ".join(stale_reasons),
+            'checked_at': datetime.now(pytz.utc)
+        }
+        logger.info(f"Snapshot freshness check: {freshness['status']} {freshness['detail']}")
+        return freshness
+        
+    except Exception as e:
+        logger.warning(f"Snapshot freshness check failed: {str(e)}")
+        return {'status': 'unknown', 'detail': str(e), 'checked_at': datetime.now(pytz.utc)}
+
+def validate_data_build(sql_data, sharepoint_data):
+    """Return a list of problems that make a freshly built data version unfit to replace the current one."""
+    problems = []
+    
+    if sql_data is None:
+        problems.append("SQL data missing")
+    else:
+        if len(sql_data) < DATA_REFRESH_CONFIG['min_bom_rows']:
+            problems.append(f"only {len(sql_data)} ModuleBOM_Simple rows")
+        missing_columns = [column for column in DATA_REFRESH_CONFIG['required_bom_columns'] if column not in sql_data.columns]
+        if missing_columns:
+            problems.append(f"ModuleBOM_Simple missing columns {missing_columns}")
+    
+    return problems
+
+def frame_memory_bytes(df):
+    if df is None:
+        return 0
+    return int(df.memory_usage(deep=True).sum())
+
+def get_session_id():
+    ctx = get_script_run_ctx() if get_script_run_ctx else None
+    return ctx.session_id if ctx else "default"
+
+class DataStore:
+    """Process-wide, read-only registry of published data versions.
+    
+    Every browser session references one version by number; frames are never copied per session.
+    A version is dropped once it is no longer current and no live session references it.
+    """
+    
+    def __init__(self, session_ttl_seconds):
+        self.session_ttl_seconds = session_ttl_seconds
+        self._lock = threading.Lock()
+        self._versions = {}
+        self._current_version = None
+        self._version_counter = 0
+        self._session_refs = {}
+    
+    def publish(self, sql_data, sharepoint_data, source, build_seconds, built_at=None):
+        frames = [sql_data] + list(sharepoint_data.values())
+        
+        # Load-time search structures are built before any session can see the version. The builds hold
+        # only this frame's artifact locks, so sessions on the current version keep searching meanwhile.
+        if MPN_SEARCH_CONFIG['index'] and not MPN_SEARCH_CONFIG['pushdown'] and sql_data is not None and not sql_data.empty:
+            get_mpn_search_index(sql_data)
+            get_mpn_row_index(sql_data)
+        
+        record = {
+            'built_at': built_at or datetime.now(pytz.utc).isoformat(),
+            'build_seconds': build_seconds,
+            'source': source,
+            'sql_data': sql_data,
+            'sharepoint_data': sharepoint_data,
+            'frame_bytes': {id(df): frame_memory_bytes(df) for df in frames if df is not None}
+        }
+        
+        with self._lock:
+            self._version_counter += 1
+            record['version'] = self._version_counter
+            self._versions[record['version']] = record
+            self._current_version = record['version']
+            self._prune()
+        
+        # Number catalog frames in publish order so the decode cache always sees newer versions as larger
+        for df in sharepoint_data.values():
+            if df is not None:
+                get_catalog_version(df)
+        
+        logger.info(f"Published data version {record['version']} from {source} ({sum(record['frame_bytes'].values()) / 1024 ** 2:.1f} MB, built in {build_seconds:.1f}s)")
+        return record
+    
+    def current(self):
+        with self._lock:
+            return self._versions.get(self._current_version)
+    
+    def checkout(self, session_id):
+        """Move a session onto the current version and return it."""
+        with self._lock:
+            record = self._versions.get(self._current_version)
+            if record is None:
+                return None
+            
+            self._session_refs[session_id] = (record['version'], time.monotonic())
+            self._prune()
+            return record
+    
+    def _prune(self):
+        now = time.monotonic()
+        self._session_refs = {
+            session_id: (version, last_seen)
+            for session_id, (version, last_seen) in self._session_refs.items()
+            if now - last_seen < self.session_ttl_seconds
+        }
         
-        logger.info("Database connection successful")
-        return True
+        referenced = {version for version, _ in self._session_refs.values()}
+        referenced.add(self._current_version)
         
-    except Exception as e:
-        logger.error(f"Database connection failed: {str(e)}")
-        return False
+        for version in [version for version in self._versions if version not in referenced]:
+            del self._versions[version]
+            logger.info(f"Released data version {version}")
+    
+    def memory_report(self):
+        """Bytes held per version and live session references; frames shared between versions are counted once in the total."""
+        with self._lock:
+            self._prune()
+            sessions_per_version = {}
+            for version, _ in self._session_refs.values():
+                sessions_per_version[version] = sessions_per_version.get(version, 0) + 1
+            
+            versions = []
+            unique_frames = {}
+            for version, record in sorted(self._versions.items()):
+                unique_frames.update(record['frame_bytes'])
+                versions.append({
+                    'version': version,
+                    'source': record['source'],
+                    'current': version == self._current_version,
+                    'mb': sum(record['frame_bytes'].values()) / 1024 ** 2,
+                    'sessions': sessions_per_version.get(version, 0)
+                })
+            
+            return {
+                'versions': versions,
+                'total_mb': sum(unique_frames.values()) / 1024 ** 2,
+                'live_sessions': len(self._session_refs)
+            }
 
-def load_data_from_database():
-    try:
-        conn = get_direct_pyodbc_connection()
+@st.cache_resource
+def get_data_store():
+    return DataStore(DATA_STORE_CONFIG['session_ttl_seconds'])
+
+@st.cache_resource
+def get_frame_artifact_cache():
+    return {'entries': {}, 'lock': threading.RLock()}
+
+def get_frame_artifact(df, name, builder):
+    """Build a derived structure (index, lookup table) once per published frame and share it across sessions.
+    
+    Published frames are never modified, so a frame object stands for its data version; its artifacts are
+    dropped when the frame is garbage collected. The shared lock only guards the registry: each artifact is
+    built under its own lock, so a slow build never delays lookups of finished artifacts.
+    """
+    cache = get_frame_artifact_cache()
+    key = id(df)
+    
+    with cache['lock']:
+        entry = cache['entries'].get(key)
+        if entry is None or entry['ref']() is not df:
+            def release(_, key=key):
+                with cache['lock']:
+                    current = cache['entries'].get(key)
+                    if current is not None and current['ref']() is None:
+                        del cache['entries'][key]
+            
+            entry = {'ref': weakref.ref(df, release), 'artifacts': {}, 'build_locks': {}}
+            cache['entries'][key] = entry
         
-        # Load ModuleBOM_Simple data
-        query = "SELECT * FROM ModuleBOM_Simple"
-        module_bom_simple_df = pd.read_sql(query, conn)
+        if name in entry['artifacts']:
+            return entry['artifacts'][name]
         
-        conn.close()
+        build_lock = entry['build_locks'].setdefault(name, threading.Lock())
+    
+    # Concurrent requests for the same artifact wait for one build; everything else goes on
+    with build_lock:
+        with cache['lock']:
+            if name in entry['artifacts']:
+                return entry['artifacts'][name]
         
-        logger.info(f"Loaded {len(module_bom_simple_df)} records from ModuleBOM_Simple")
+        start_time = time.perf_counter()
+        artifact = builder()
+        logger.info(f"Built {name} for a {len(df)}-row frame in {time.perf_counter() - start_time:.2f}s")
         
-        return module_bom_simple_df
+        with cache['lock']:
+            entry['artifacts'][name] = artifact
+            entry['build_locks'].pop(name, None)
         
-    except Exception as e:
-        logger.error(f"Error loading data from database: {str(e)}")
-        raise
+        return artifact
 
-def load_data_from_sharepoint():
-    """Load data from SharePoint with comprehensive error handling."""
-    data = {
-        'component_validations_df': pd.DataFrame(),
-        'module_validation_df': pd.DataFrame(),
-        'end_products_df': pd.DataFrame()
-    }
+class DecodeCache:
+    """Process-wide LRU of decode results keyed by (clean code, segment, SOCAMM, catalog version).
     
-    # Disable SSL warnings and verification for corporate networks
-    urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
+    Only the newest catalog version is cached: the whole cache is dropped when a newer version shows up,
+    and sessions still on an older version decode without caching. Cached frames are shared and must not
+    be modified by callers.
+    """
     
-    # Set environment variables to disable SSL verification
-    os.environ['PYTHONHTTPSVERIFY'] = '0'
-    os.environ['CURL_CA_BUNDLE'] = ''
-    os.environ['REQUESTS_CA_BUNDLE'] = ''
+    def __init__(self, max_entries):
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+        self._catalog_version = None
+        self._version_counter = 0
+        self.stats = {'hits': 0, 'misses': 0, 'evictions': 0, 'invalidations': 0, 'bypassed': 0}
     
-    # Create an SSL context that doesn't verify certificates
-    ssl_context = ssl.create_default_context()
-    ssl_context.check_hostname = False
-    ssl_context.verify_mode = ssl.CERT_NONE
-
-    sharepoint_site = "https://microncorp.sharepoint.com/sites/mdg"
-    list_name = "Module HW Design Component Validations"
+    def next_catalog_version(self):
+        with self._lock:
+            self._version_counter += 1
+            return self._version_counter
     
-    # Always get credentials from session state first, then fall back to secrets
-    username = st.session_state.get("sharepoint_username", "")
-    password = st.session_state.get("sharepoint_password", "")
+    def get_or_decode(self, key, catalog_version, decoder):
+        key = key + (catalog_version,)
+        
+        with self._lock:
+            if self._catalog_version is None or catalog_version > self._catalog_version:
+                if self._entries:
+                    self.stats['invalidations'] += 1
+                self._entries.clear()
+                self._catalog_version = catalog_version
+            
+            cacheable = catalog_version == self._catalog_version
+            if cacheable:
+                result = self._entries.get(key)
+                if result is not None:
+                    self._entries.move_to_end(key)
+                    self.stats['hits'] += 1
+                    return result
+                self.stats['misses'] += 1
+            else:
+                self.stats['bypassed'] += 1
+        
+        result = decoder()
+        
+        if cacheable:
+            with self._lock:
+                if catalog_version == self._catalog_version:
+                    self._entries[key] = result
+                    self._entries.move_to_end(key)
+                    while len(self._entries) > self.max_entries:
+                        self._entries.popitem(last=False)
+                        self.stats['evictions'] += 1
+        
+        return result
     
-    # If not in session state, try secrets
-    if not username and "sharepoint_username" in st.secrets:
-        username = st.secrets["sharepoint_username"]
-    if not password and "sharepoint_password" in st.secrets:
-        password = st.secrets["sharepoint_password"]
+    def report(self):
+        with self._lock:
+            lookups = self.stats['hits'] + self.stats['misses']
+            return dict(
+                self.stats,
+                entries=len(self._entries),
+                catalog_version=self._catalog_version,
+                hit_rate=self.stats['hits'] / lookups if lookups else 0.0
+            )
+
+@st.cache_resource
+def get_decode_cache():
+    return DecodeCache(DECODE_CACHE_CONFIG['max_entries'])
+
+def get_catalog_version(component_validations_df):
+    """Version number of a catalog frame, assigned when it is published (or first decoded against, if never published)."""
+    return get_frame_artifact(component_validations_df, 'catalog_version', get_decode_cache().next_catalog_version)
+
+class BackgroundDataRefresher:
+    """Rebuilds the data in a background thread and swaps in each new version only once it is complete and valid.
     
-    if not (username and password):
-        st.sidebar.warning("Please provide SharePoint credentials to load data.")
-        return data
+    Readers always get a whole version (a dict with version, built_at, build_seconds, source, sql_data
+    and sharepoint_data) and never wait on a rebuild, except for the very first load of a process
+    when there is no snapshot to serve.
+    """
+    
+    def __init__(self, interval_seconds):
+        self.interval_seconds = interval_seconds
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._thread = None
+        self._store = get_data_store()
+        self._building = False
+        self._credentials = ("", "")
+        self._pending_manifest = None
+        self.status = {
+            'sources': {source: {'state': 'idle', 'rows': 0, 'pages': 0} for source in ('sql', 'sharepoint')},
+            'messages': [],
+            'last_error': None,
+            'last_build_at': None,
+            'snapshot_freshness': None
+        }
     
-    # Store original request methods
-    original_request = requests.Session.request
-    original_get = requests.get
-    original_post = requests.post
+    def current_version(self):
+        return self._store.current()
     
-    def patched_request(self, method, url, **kwargs):
-        kwargs['verify'] = False
-        kwargs['timeout'] = kwargs.get('timeout', 30)
-        return original_request(self, method, url, **kwargs)
+    def status_snapshot(self):
+        """A copy of the status, safe to read while the refresher thread keeps updating it."""
+        with self._lock:
+            return copy.deepcopy(self.status)
     
-    def patched_get(url, **kwargs):
-        kwargs['verify'] = False
-        kwargs['timeout'] = kwargs.get('timeout', 30)
-        return original_get(url, **kwargs)
+    def is_busy(self):
+        with self._lock:
+            return self._building or self._wake.is_set()
     
-    def patched_post(url, **kwargs):
-        kwargs['verify'] = False
-        kwargs['timeout'] = kwargs.get('timeout', 30)
-        return original_post(url, **kwargs)
+    def update_credentials(self, username, password):
+        if username and password:
+            with self._lock:
+                self._credentials = (username, password)
     
-    try:
-        # Patch requests to disable SSL verification
-        requests.Session.request = patched_request
-        requests.get = patched_get
-        requests.post = patched_post
+    def seed_from_snapshot(self):
+        """Publish the on-disk snapshot as the first version; its freshness is checked on the refresher thread."""
+        snapshot = load_data_snapshot() if SNAPSHOT_CONFIG['enabled'] else None
         
-        # Create user credentials with error handling
-        try:
-            user_credentials = UserCredential(username, password)
-        except Exception as cred_error:
-            st.sidebar.error(f"Failed to create user credentials: {str(cred_error)}")
-            return data
+        if not snapshot:
+            return False
         
-        # Create SharePoint context with error handling
-        try:
-            ctx = ClientContext(sharepoint_site).with_credentials(user_credentials)
+        module_bom_simple_df, sharepoint_data, manifest = snapshot
+        seed_delta_state_from_snapshot(module_bom_simple_df, manifest)
+        seed_sharepoint_delta_state_from_snapshot(sharepoint_data['component_validations_df'], manifest)
+        self._store.publish(module_bom_simple_df, sharepoint_data, 'snapshot', 0.0, built_at=manifest.get('loaded_at'))
+        self._pending_manifest = manifest
+        with self._lock:
+            self.status['snapshot_freshness'] = {'status': 'checking', 'detail': '', 'checked_at': None}
+        return True
+    
+    def start(self):
+        """Start the scheduler thread once per process. Without a snapshot the first build starts immediately."""
+        with self._lock:
+            if self._thread is not None:
+                return
             
-            # Test the connection by trying to get web properties
-            web = ctx.web.get().execute_query()
-            st.sidebar.success(f"Successfully connected to SharePoint site")
+            if self._store.current() is None and self._pending_manifest is None:
+                self._wake.set()
             
-        except Exception as ctx_error:
-            st.sidebar.error(f"Failed to connect to SharePoint context: {str(ctx_error)}")
-            return data
-        
-        # Get all lists with error handling
-        try:
-            all_lists = ctx.web.lists.get().execute_query()
-            available_lists = [list_item.properties.get('Title', '') for list_item in all_lists]
+            self._thread = threading.Thread(target=self._run, name="data-refresher", daemon=True)
+            self._thread.start()
+    
+    def request_refresh(self):
+        """Ask for a rebuild now; the current version keeps being served until the new one is ready."""
+        self._wake.set()
+    
+    def _run(self):
+        if self._pending_manifest is not None:
+            freshness = check_snapshot_freshness(self._pending_manifest)
+            with self._lock:
+                self.status['snapshot_freshness'] = freshness
+            self._pending_manifest = None
             
-        except Exception as list_error:
-            st.sidebar.error(f"Failed to retrieve SharePoint lists: {str(list_error)}")
-            return data
+            if freshness['status'] != 'fresh':
+                self._wake.set()
         
-        # Find the target list
-        target_list = None
-        if list_name in available_lists:
-            try:
-                target_list = ctx.web.lists.get_by_title(list_name)
-            except Exception as target_error:
-                return data
-        
-        if not target_list:
-            st.sidebar.error("Could not establish connection to any suitable list")
-            return data
-        
-        # Retrieve all items with pagination and error handling
-        all_items = []
-        page_size = 500
-        
-        try:
-            caml_query = CamlQuery()
-            caml_query.ViewXml = f"<View><RowLimit>{page_size}</RowLimit></View>"
+        while True:
+            self._wake.wait(timeout=self.interval_seconds)
             
-            items = target_list.get_items(caml_query).execute_query()
-            all_items.extend(items)
+            with self._lock:
+                self._wake.clear()
+                self._building = True
             
-            # Continue pagination if needed
-            while len(items) == page_size:
-                try:
-                    last_id = items[-1].properties.get('ID')
-                    
-                    caml_query = CamlQuery()
-                    caml_query.ViewXml = f"""
-                    <View>
-                        <Query>
-                            <Where>
-                                <Gt>
-                                    <FieldRef Name='ID' />
-                                    <Value Type='Number'>{last_id}</Value>
-                                </Gt>
-                            </Where>
-                            <OrderBy>
-                                <FieldRef Name='ID' Ascending='True' />
-                            </OrderBy>
-                        </Query>
-                        <RowLimit>{page_size}</RowLimit>
-                    </View>
-                    """
-                    
-                    items = target_list.get_items(caml_query).execute_query()
-                    all_items.extend(items)
-                    
-                    if len(items) < page_size:
-                        break
-                        
-                except Exception as pagination_error:
-                    st.sidebar.warning(f"Pagination error, stopping at {len(all_items)} items: {str(pagination_error)}")
-                    break
-                    
-        except Exception as items_error:
-            st.sidebar.error(f"Failed to retrieve items from target list: {str(items_error)}")
-            return data
+            try:
+                self._build()
+            except Exception as e:
+                with self._lock:
+                    self.status['last_error'] = str(e)
+                logger.error(f"Background data refresh failed: {str(e)}")
+            finally:
+                with self._lock:
+                    self._building = False
+    
+    def _on_event(self, source, event):
+        # Called from the loader threads while the script thread may be reading the status
+        with self._lock:
+            source_status = self.status['sources'][source]
+            for counter in ('rows', 'pages', 'state'):
+                if counter in event:
+                    source_status[counter] = event[counter]
+            if event['level'] != 'progress':
+                self.status['messages'].append((event['level'], event['message']))
+    
+    def _build(self):
+        with self._lock:
+            username, password = self._credentials
+            for source_status in self.status['sources'].values():
+                source_status.update({'state': 'loading', 'rows': 0, 'pages': 0})
+            self.status['messages'] = []
         
-        if len(all_items) == 0:
-            st.sidebar.error("No items found in the list")
-            return data
+        start_time = time.perf_counter()
+        sql_data, sharepoint_data, errors = run_loaders_concurrently(username, password, self._on_event)
+        build_seconds = time.perf_counter() - start_time
         
-        st.sidebar.success(f"Retrieved {len(all_items)} items from SharePoint")
-        
-        # Process component validations data
-        component_validations_data = []
-        
-        field_mapping = {
-            'Segment': 'Segment',
-            'Supplier': 'Supplier',
-            'Component_Generation': 'Product_x0020_Family',
-            'Revision': 'REV',
-            'Component_Type': 'ts0w',
-            'Process_Code': 'Process_x0020_Code',
-            'SPN': 'Supplier_x0020_PN',
-            'Speed': 'Product_x0020_Comment',
-            'Product_Description': 'Title',
-            'Product_Status': 'Product_x0020_Status',
-            'SAP_Number': 'SAP_x0020_Number'
-        }
-
-        for item in all_items:
-            try:
-                item_properties = item.properties
-                
-                record = {}
-                for key, field in field_mapping.items():
-                    if field and field in item_properties:
-                        if key == 'Component_Type':
-                            component_type_value = str(item_properties[field])
-                            if component_type_value and component_type_value.lower() not in ['none', 'nan', 'null', '']:
-                                record[key] = component_type_value
-                            else:
-                                # Don't try to infer from title - leave as provided or empty
-                                record[key] = component_type_value if component_type_value else ''
-                        else:
-                            record[key] = str(item_properties[field])
-                    else:
-                        record[key] = ""
-                
-                # Ensure Product_Description is set
-                if not record.get('Product_Description'):
-                    record['Product_Description'] = str(item_properties.get('Title', ''))
-                
-                # Only add records with meaningful data
-                if record.get('Segment') and (record.get('Supplier') or record.get('Component_Type') or record.get('Process_Code')):
-                    component_validations_data.append(record)
-                    
-            except Exception as item_process_error:
-                st.sidebar.warning(f"Error processing component validation item: {str(item_process_error)}")
-                continue
+        problems = validate_data_build(sql_data, sharepoint_data)
+        if 'sql' in errors:
+            problems.insert(0, f"SQL load failed: {errors['sql']}")
         
-        data['component_validations_df'] = pd.DataFrame(component_validations_data)
+        if problems:
+            with self._lock:
+                self.status['last_error'] = "; ".join(problems)
+            logger.error(f"Rejected data build, keeping the current version: {'; '.join(problems)}")
+            return
         
-    except Exception as e:
-        st.sidebar.error(f"Error connecting to SharePoint: {str(e)}")
-    
-    finally:
-        # Restore original request methods
-        try:
-            requests.Session.request = original_request
-            requests.get = original_get
-            requests.post = original_post
-        except:
-            pass
+        # A failed or credential-less SharePoint load keeps the previous SharePoint data instead of blanking it
+        current = self.current_version()
+        if sharepoint_data['component_validations_df'].empty and current is not None:
+            with self._lock:
+                if 'sharepoint' in errors:
+                    self.status['messages'].append(('error', f"SharePoint load failed: {errors['sharepoint']}"))
+                self.status['messages'].append(('warning', "Kept the previous SharePoint data"))
+            sharepoint_data = current['sharepoint_data']
         
-        # Clean up environment variables
-        try:
-            if 'PYTHONHTTPSVERIFY' in os.environ:
-                del os.environ['PYTHONHTTPSVERIFY']
-            if 'CURL_CA_BUNDLE' in os.environ:
-                del os.environ['CURL_CA_BUNDLE']
-            if 'REQUESTS_CA_BUNDLE' in os.environ:
-                del os.environ['REQUESTS_CA_BUNDLE']
-        except:
-            pass
-
-    return data
+        record = self._store.publish(sql_data, sharepoint_data, 'live', build_seconds)
+        with self._lock:
+            self.status.update({'last_build_at': record['built_at'], 'last_error': None, 'snapshot_freshness': None})
+        
+        # Replayed recordings must not overwrite the cold-start snapshot of real data
+        if SNAPSHOT_CONFIG['enabled'] and DATA_SOURCE_CONFIG['mode'] != 'replay':
+            save_data_snapshot(sql_data, sharepoint_data)
 
-@st.cache_data(ttl=3600)
-def load_data_cached():
-    return load_data_from_database()
+@st.cache_resource
+def get_data_refresher():
+    """Process-wide background refresher, seeded from the on-disk snapshot when one exists."""
+    refresher = BackgroundDataRefresher(DATA_REFRESH_CONFIG['interval_seconds'])
+    refresher.seed_from_snapshot()
+    return refresher
 
-@st.cache_data(ttl=3600)
-def load_sharepoint_data_cached():
-    return load_data_from_sharepoint()
+def wait_for_first_version(refresher):
+    """Block the very first request of a process until a version exists, showing load progress in the sidebar."""
+    placeholders = {source: st.sidebar.empty() for source in refresher.status_snapshot()['sources']}
+    
+    while refresher.current_version() is None and refresher.is_busy():
+        render_load_progress(placeholders, refresher.status_snapshot()['sources'])
+        time.sleep(0.25)
+    
+    status = refresher.status_snapshot()
+    render_load_progress(placeholders, status['sources'])
+    
+    for level, message in status['messages']:
+        getattr(st.sidebar, level)(message)
+    
+    return refresher.current_version()
 
 def show_process_code_info():
     with st.expander("Process Code Information", expanded=False):
@@ -418,11 +2488,7 @@ def get_component_type_options_by_segment(segment, component_validations_df):
     
     # Filter by segment if needed - return all types found in SharePoint for the segment
     if 'Segment' in component_validations_df.columns:
-        segment_mask = (
-            (component_validations_df['Segment'] == segment) |
-            (component_validations_df['Segment'] == 'Server/Client') |
-            (component_validations_df['Segment'] == 'Client/Server')
-        )
+        segment_mask = text_isin(component_validations_df['Segment'], [segment, 'Server/Client', 'Client/Server'])
         segment_data = component_validations_df[segment_mask]
         
         if not segment_data.empty and 'Component_Type' in segment_data.columns:
@@ -436,69 +2502,34 @@ def get_component_type_options_by_segment(segment, component_validations_df):
 def get_module_component_options_by_segment(segment, component_validations_df):
     """Get component options based on segment with proper filtering."""
     
-    if segment.lower() == 'server':
-        # Server components in position order
-        component_options = {
-            'PMIC': {'required': True, 'position': 1},
-            'SPD/Hub': {'required': True, 'position': 2},
-            'Temp Sensor': {'required': True, 'position': 3},
-            'RCD/MRCD': {'required': True, 'position': 4},
-            'Data Buffer': {'required': False, 'position': 5}
-        }
-    elif segment.lower() == 'client':
-        # Client components in position order
-        component_options = {
-            'PMIC': {'required': True, 'position': 1},
-            'SPD/Hub': {'required': True, 'position': 2},
-            'CKD': {'required': False, 'position': 3}
-        }
-    else:
+    layout = MODULE_COMPONENT_LAYOUTS.get(segment.lower())
+    if layout is None:
         # Unknown segment - return empty options
         return {}
     
+    component_options = {
+        component_type: {'required': required, 'position': position}
+        for position, (component_type, required) in enumerate(layout, start=1)
+    }
+    
     # Filter to only include component types that actually exist in SharePoint data for this segment
     if not component_validations_df.empty and 'Component_Type' in component_validations_df.columns:
         # Get components for this segment
         segment_mask = (
-            (component_validations_df['Segment'].str.lower() == segment.lower()) |
-            (component_validations_df['Segment'].str.contains('Server/Client', case=False, na=False)) |
-            (component_validations_df['Segment'].str.contains('Client/Server', case=False, na=False))
+            text_upper_equals(component_validations_df['Segment'], segment.upper()) |
+            text_contains(component_validations_df['Segment'], 'Server/Client', case=False) |
+            text_contains(component_validations_df['Segment'], 'Client/Server', case=False)
         )
         
         segment_data = component_validations_df[segment_mask]
-        available_component_types = set()
         
-        if not segment_data.empty:
-            # Get all unique component types for this segment
-            unique_component_types = segment_data['Component_Type'].dropna().unique()
-            
-            # Map SharePoint component types to our standard names using more comprehensive matching
-            for component_type in unique_component_types:
-                component_type_lower = str(component_type).lower()
-                
-                # PMIC mapping
-                if any(keyword in component_type_lower for keyword in ['pmic', 'power management', 'power mgmt']):
-                    available_component_types.add('PMIC')
-                
-                # SPD/Hub mapping - including Voltage Regulator which might be used for SPD/Hub
-                elif any(keyword in component_type_lower for keyword in ['spd', 'hub', 'serial presence', 'voltage regulator', 'vr']):
-                    available_component_types.add('SPD/Hub')
-                
-                # Temperature Sensor mapping
-                elif any(keyword in component_type_lower for keyword in ['temp', 'temperature', 'sensor', 'thermal']):
-                    available_component_types.add('Temp Sensor')
-                
-                # RCD/MRCD mapping
-                elif any(keyword in component_type_lower for keyword in ['rcd', 'mrcd', 'registering', 'clock driver', 'muxed']):
-                    available_component_types.add('RCD/MRCD')
-                
-                # Data Buffer mapping
-                elif any(keyword in component_type_lower for keyword in ['data buffer', 'buffer', 'db']):
-                    available_component_types.add('Data Buffer')
-                
-                # CKD mapping (Client only)
-                elif any(keyword in component_type_lower for keyword in ['ckd', 'clock driver']) and segment.lower() == 'client':
-                    available_component_types.add('CKD')
+        # A generator component is available if it is the primary role of any component type in the segment;
+        # CKD only counts on client
+        available_component_types = {
+            get_role_list(label)[0] for label in get_component_role_series(segment_data).dropna().unique() if label
+        }
+        if segment.lower() != 'client':
+            available_component_types.discard('CKD')
         
         # Filter component_options to only include available types
         filtered_options = {}
@@ -525,71 +2556,187 @@ def normalize_component_type(component_type):
     # Return the normalized string without hardcoded mappings
     return component_str
 
+def normalize_component_type_column(component_types):
+    """Column-wise normalize_component_type for text Series."""
+    return component_types.str.strip().str.replace('&#x2f;', '/', case=False, regex=True)
+
+def classify_component_roles(component_types):
+    """Vectorized role classification into role-set labels; keywords are matched once per category for categoricals."""
+    role_bits = np.zeros(len(component_types), dtype=np.int64)
+    for bit, (_, keywords) in enumerate(COMPONENT_ROLE_KEYWORDS):
+        pattern = '|'.join(re.escape(keyword) for keyword in keywords)
+        role_bits |= text_contains(component_types, pattern, case=False).to_numpy().astype(np.int64) << bit
+    
+    return pd.Categorical.from_codes(role_bits, categories=COMPONENT_ROLE_LABELS)
+
+def add_component_roles(component_validations_df):
+    if component_validations_df.empty or 'Component_Type' not in component_validations_df.columns:
+        return component_validations_df
+    
+    component_validations_df = component_validations_df.copy()
+    component_validations_df[COMPONENT_ROLE_COLUMN] = classify_component_roles(component_validations_df['Component_Type'])
+    return component_validations_df
+
+def get_component_role_series(component_validations_df):
+    """The precomputed role column, or roles derived once per frame for frames loaded without it."""
+    if COMPONENT_ROLE_COLUMN in component_validations_df.columns:
+        return component_validations_df[COMPONENT_ROLE_COLUMN]
+    
+    return get_frame_artifact(
+        component_validations_df,
+        COMPONENT_ROLE_COLUMN,
+        lambda: pd.Series(classify_component_roles(component_validations_df['Component_Type']), index=component_validations_df.index)
+    )
+
+def get_role_list(label):
+    return label.split(COMPONENT_ROLE_SEPARATOR) if label else []
+
+def get_canonical_role(component_type):
+    """Canonical role name for a component type filter value such as 'spd/hub'; unknown values pass through."""
+    roles_by_name = {role.lower(): role for role in COMPONENT_ROLES}
+    return roles_by_name.get(str(component_type).lower(), component_type)
+
+def get_labels_with_role(component_type):
+    """Role-set labels that include the role of a component type filter value such as 'spd/hub'; none for unknown values."""
+    role = get_canonical_role(component_type)
+    return [label for label in COMPONENT_ROLE_LABELS if role in get_role_list(label)]
+
+def role_mask(component_validations_df, component_type):
+    return text_isin(get_component_role_series(component_validations_df), get_labels_with_role(component_type)).to_numpy()
+
+GENERATOR_INDEX_COLUMNS = ['Segment', 'Component_Type', 'Supplier', 'Component_Generation', 'Revision', 'Process_Code']
+
 def get_filtered_options(df, column, **filters):
     """Get filtered options from DataFrame based on filters with improved component type mapping."""
     if df.empty or column not in df.columns:
         return []
     
-    filtered_df = df.copy()
+    filtered_df = df
     
     # Apply filters
     for filter_col, filter_value in filters.items():
         if filter_col in filtered_df.columns and filter_value:
             if filter_col == 'Component_Type':
-                # Handle component type mapping for filtering
-                component_type_mask = pd.Series([False] * len(filtered_df), index=filtered_df.index)
-                
-                for idx, row_component_type in filtered_df['Component_Type'].items():
-                    if pd.isna(row_component_type):
-                        continue
-                    
-                    row_component_type_lower = str(row_component_type).lower()
-                    filter_value_lower = filter_value.lower()
-                    
-                    # Map filter value to SharePoint component types
-                    if filter_value_lower == 'pmic':
-                        if any(keyword in row_component_type_lower for keyword in ['pmic', 'power management', 'power mgmt']):
-                            component_type_mask.loc[idx] = True
-                    elif filter_value_lower == 'spd/hub':
-                        if any(keyword in row_component_type_lower for keyword in ['spd', 'hub', 'serial presence', 'voltage regulator', 'vr']):
-                            component_type_mask.loc[idx] = True
-                    elif filter_value_lower == 'temp sensor':
-                        if any(keyword in row_component_type_lower for keyword in ['temp', 'temperature', 'sensor', 'thermal']):
-                            component_type_mask.loc[idx] = True
-                    elif filter_value_lower == 'rcd/mrcd':
-                        if any(keyword in row_component_type_lower for keyword in ['rcd', 'mrcd', 'registering', 'clock driver', 'muxed']):
-                            component_type_mask.loc[idx] = True
-                    elif filter_value_lower == 'data buffer':
-                        if any(keyword in row_component_type_lower for keyword in ['data buffer', 'buffer', 'db']):
-                            component_type_mask.loc[idx] = True
-                    elif filter_value_lower == 'ckd':
-                        if any(keyword in row_component_type_lower for keyword in ['ckd', 'clock driver']):
-                            component_type_mask.loc[idx] = True
-                
-                filtered_df = filtered_df[component_type_mask]
+                # Component types are matched on the roles assigned at load time
+                filtered_df = filtered_df[role_mask(filtered_df, filter_value)]
             else:
                 # Regular filtering for other columns
-                if filtered_df[filter_col].dtype == 'object':
-                    filtered_df = filtered_df[filtered_df[filter_col].str.contains(str(filter_value), case=False, na=False)]
+                if is_text_dtype(filtered_df[filter_col]) or isinstance(filtered_df[filter_col].dtype, pd.CategoricalDtype):
+                    filtered_df = filtered_df[text_contains(filtered_df[filter_col], str(filter_value), case=False)]
                 else:
                     filtered_df = filtered_df[filtered_df[filter_col] == filter_value]
     
-    # Get unique values and sort them
-    unique_values = filtered_df[column].dropna().unique()
+    return get_option_values(filtered_df[column].dropna().unique())
+
+def get_option_values(values):
+    """get_filtered_options' cleanup of distinct column values: stripped, non-empty and not null-like, sorted."""
+    return sorted({str(value).strip() for value in values if value and str(value).strip() and str(value).lower() not in NULL_LIKE_VALUES})
+
+def factorize_text(series):
+    """(codes, distinct values) of a column, reusing category codes for categoricals; missing values get code -1."""
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        return series.cat.codes.to_numpy(), np.asarray(series.cat.categories, dtype=object)
+    
+    codes, values = pd.factorize(series)
+    return codes, np.asarray(values, dtype=object)
+
+def contains_value_codes(values, pattern):
+    """Codes of the distinct values that str.contains(pattern, case=False) matches, as get_filtered_options filters."""
+    text = pd.Series(values, dtype=object).astype(str)
+    try:
+        return np.flatnonzero(text.str.contains(pattern, case=False, na=False).to_numpy())
+    except re.error:
+        return np.flatnonzero(text.str.contains(pattern, case=False, na=False, regex=False).to_numpy())
+
+def build_generator_option_index(component_validations_df, segment):
+    """Generator dropdowns and process code lookups for one segment, with the semantics of the filter-per-call path.
+    
+    'options' nests component type -> supplier -> generation -> revision -> leaf, each level holding what
+    get_filtered_options offers once the levels above are selected. 'lookup' maps exact (supplier, generation,
+    revision, Component_Type) values of the segment's rows to a leaf, as get_component_process_code compares
+    them. A leaf holds the catalog positions of its rows, in catalog order, and the first non-empty process
+    code among them (None when all are empty); option leaves are None when the lookup has no rows.
+    """
+    if component_validations_df.empty or any(col not in component_validations_df.columns for col in GENERATOR_INDEX_COLUMNS):
+        return {'options': {}, 'lookup': {}}
+    
+    level_columns = ['Supplier', 'Component_Generation', 'Revision']
+    
+    # Lookups: exact matches on rows of the segment or shared with it
+    lookup_positions = np.flatnonzero(text_isin(component_validations_df['Segment'], [segment, 'Server/Client', 'Client/Server']).to_numpy())
+    key_frame = component_validations_df.iloc[lookup_positions][level_columns + ['Component_Type']]
+    process_codes = component_validations_df['Process_Code'].iloc[lookup_positions]
+    has_code = (process_codes.notna() & (process_codes.astype(str).str.strip() != '')).to_numpy()
+    
+    lookup = {}
+    for key, group_positions in key_frame.groupby(level_columns + ['Component_Type'], sort=False, observed=True).indices.items():
+        coded_positions = group_positions[has_code[group_positions]]
+        lookup[key] = {
+            'process_code': str(process_codes.iloc[coded_positions[0]]) if len(coded_positions) else None,
+            'rows': lookup_positions[group_positions]
+        }
+    
+    # Dropdowns: Segment and each selected value are case-insensitive substring filters, component types match on roles
+    factorized = {column: factorize_text(component_validations_df[column]) for column in level_columns}
+    segment_positions = np.flatnonzero(text_contains(component_validations_df['Segment'], segment, case=False).to_numpy())
+    
+    def build_level(positions, depth, component_type, selection):
+        codes, values = factorized[level_columns[depth]]
+        position_codes = codes[positions]
+        present_codes = np.unique(position_codes[position_codes >= 0])
+        
+        level = {}
+        for option in get_option_values(values[present_codes]):
+            if depth == len(level_columns) - 1:
+                level[option] = lookup.get(selection + (option, component_type))
+            else:
+                option_positions = positions[np.isin(position_codes, contains_value_codes(values, option))]
+                level[option] = build_level(option_positions, depth + 1, component_type, selection + (option,))
+        return level
+    
+    options = {
+        component_type: build_level(segment_positions[role_mask(component_validations_df, component_type)[segment_positions]], 0, component_type, ())
+        for component_type in COMPONENT_ROLES
+    }
+    return {'options': options, 'lookup': lookup}
+
+def get_generator_option_index(component_validations_df, segment):
+    return get_frame_artifact(
+        component_validations_df,
+        ('generator_option_index', segment),
+        lambda: build_generator_option_index(component_validations_df, segment)
+    )
+
+def get_generator_options(component_validations_df, segment, component_type, *selections):
+    """Options for the next generator dropdown: suppliers, then generations for a supplier, then revisions for both."""
+    if component_validations_df is None or component_validations_df.empty:
+        return []
     
-    # Filter out empty/invalid values
-    valid_values = []
-    for value in unique_values:
-        if value and str(value).strip() and str(value).lower() not in ['nan', 'none', 'null', '']:
-            valid_values.append(str(value).strip())
+    node = get_generator_option_index(component_validations_df, segment)['options'].get(get_canonical_role(component_type), {})
+    for selection in selections:
+        node = node.get(selection) or {}
     
-    return sorted(list(set(valid_values)))
+    return list(node)
 
 def get_component_process_code(segment, supplier, generation, revision, component_type, component_validations_df):
     """Get process code for a specific component from SharePoint data."""
     if component_validations_df is None or component_validations_df.empty:
         return "No SharePoint data available", component_type, pd.DataFrame()
     
+    if segment and supplier and generation and revision and component_type and all(col in component_validations_df.columns for col in GENERATOR_INDEX_COLUMNS):
+        # A full selection is one exact-match lookup in the per-version generator index
+        leaf = get_generator_option_index(component_validations_df, segment)['lookup'].get((supplier, generation, revision, component_type))
+        
+        if leaf is None:
+            return "No matching component found", component_type, pd.DataFrame()
+        
+        # The published index is shared across sessions and stays read-only; the slice is taken per call
+        filtered_df = component_validations_df.iloc[leaf['rows']]
+        
+        if leaf['process_code'] is None:
+            return "Process code is empty", component_type, filtered_df
+        return leaf['process_code'], component_type, filtered_df
+    
     # Create filters
     filters = {
         'Segment': segment,
@@ -600,20 +2747,16 @@ def get_component_process_code(segment, supplier, generation, revision, componen
     }
     
     # Apply filters
-    filtered_df = component_validations_df.copy()
+    filtered_df = component_validations_df
     
     for column, value in filters.items():
         if column in filtered_df.columns and value:
             # Handle segment variations
             if column == 'Segment':
-                segment_mask = (
-                    (filtered_df[column] == value) |
-                    (filtered_df[column] == 'Server/Client') |
-                    (filtered_df[column] == 'Client/Server')
-                )
+                segment_mask = text_isin(filtered_df[column], [value, 'Server/Client', 'Client/Server'])
                 filtered_df = filtered_df[segment_mask]
             else:
-                filtered_df = filtered_df[filtered_df[column] == value]
+                filtered_df = filtered_df[text_equals(filtered_df[column], value)]
     
     if filtered_df.empty:
         return "No matching component found", component_type, pd.DataFrame()
@@ -643,6 +2786,78 @@ def get_module_process_code(pmic_code, spd_hub_code, temp_sensor_code, rcd_mrcd_
     
     return ''.join([code for code in codes if code])
 
+def get_module_code_candidates(component_validations_df, segment, suppliers=None, product_statuses=None, include_optional=True):
+    """Candidate component codes per module position, as [(component type, sorted codes)] in position order.
+    
+    Only rows the generator can select count (supplier, generation and revision all set). Optional
+    positions also offer '' for a module without that component.
+    """
+    layout = MODULE_COMPONENT_LAYOUTS.get(str(segment).lower())
+    if layout is None or component_validations_df is None or component_validations_df.empty:
+        return []
+    
+    mask = text_isin(component_validations_df['Segment'], [segment, 'Server/Client', 'Client/Server']).to_numpy()
+    if suppliers:
+        mask = mask & text_isin(component_validations_df['Supplier'], list(suppliers)).to_numpy()
+    if product_statuses:
+        mask = mask & text_isin(component_validations_df['Product_Status'], list(product_statuses)).to_numpy()
+    for col in ['Supplier', 'Component_Generation', 'Revision']:
+        mask = mask & (clean_text_column(component_validations_df[col]).str.strip() != '').to_numpy()
+    
+    codes = clean_text_column(component_validations_df.loc[mask, 'Process_Code']).str.strip()
+    
+    candidates = []
+    for component_type, required in layout:
+        type_codes = codes[role_mask(component_validations_df, component_type)[mask] & (codes != '').to_numpy()]
+        options = sorted(type_codes.unique())
+        if not required and include_optional:
+            options.append('')
+        candidates.append((component_type, options))
+    
+    return candidates
+
+def count_module_code_combinations(candidates):
+    return math.prod(len(options) for _, options in candidates) if candidates else 0
+
+def enumerate_module_codes(candidates, prune=None, limit=None):
+    """Lazily yield (module process code, {component type: code}) depth-first over the candidate sets.
+    
+    prune(selection) sees each partial selection in position order and cuts that branch when it returns
+    True; the selection dict is reused, so copy it to keep it. Stops after limit codes.
+    """
+    def walk(depth, selection):
+        if depth == len(candidates):
+            yield selection
+            return
+        
+        component_type, options = candidates[depth]
+        for code in options:
+            selection[component_type] = code
+            if prune is not None and prune(selection):
+                continue
+            yield from walk(depth + 1, selection)
+        selection.pop(component_type, None)
+    
+    if not candidates:
+        return
+    
+    for count, selection in enumerate(walk(0, {})):
+        if limit is not None and count >= limit:
+            return
+        yield ''.join(selection.values()), dict(selection)
+
+def write_module_codes_csv(module_codes, file, component_types):
+    """Stream enumerated module codes to a CSV file object row by row; returns the number written."""
+    writer = csv.writer(file)
+    writer.writerow(['Process_Code'] + list(component_types))
+    
+    written = 0
+    for process_code, selection in module_codes:
+        writer.writerow([process_code] + [selection.get(component_type, '') for component_type in component_types])
+        written += 1
+    
+    return written
+
 def convert_process_code_to_print_order(process_code, segment):
     if not process_code or segment.lower() != 'server':
         return process_code
@@ -699,6 +2914,189 @@ def get_valid_component_types_from_sharepoint(component_validations_df):
     
     return sorted(component_types.unique().tolist())
 
+# Positional layout of a process code per segment. start/length slice the code; SOCAMM uses a two-character
+# voltage regulator code at positions 2-3. Each search term is a case-insensitive substring of Component_Type.
+PROCESS_CODE_POSITION_MAPPINGS = {
+    'socamm': [
+        {'position': 1, 'start': 0, 'length': 1, 'expected_type': 'SPD/Hub', 'search_terms': ['SPD/Hub', 'SPD', 'Hub']},
+        {'position': '2-3', 'start': 1, 'length': 2, 'expected_type': 'Voltage Regulator', 'search_terms': ['Voltage Regulator', 'VR', 'Regulator']}
+    ],
+    'server': [
+        {'position': 1, 'start': 0, 'length': 1, 'expected_type': 'PMIC', 'search_terms': ['PMIC']},
+        {'position': 2, 'start': 1, 'length': 1, 'expected_type': 'SPD/Hub', 'search_terms': ['SPD/Hub', 'SPD', 'Hub']},
+        {'position': 3, 'start': 2, 'length': 1, 'expected_type': 'Temp Sensor', 'search_terms': ['Temp Sensor', 'Temperature Sensor']},
+        {'position': 4, 'start': 3, 'length': 1, 'expected_type': 'RCD/MRCD', 'search_terms': ['RCD', 'MRCD', 'Muxed RCD', 'RCD/MRCD']},
+        {'position': 5, 'start': 4, 'length': 1, 'expected_type': 'Data Buffer', 'search_terms': ['Data Buffer', 'Buffer']}
+    ],
+    'client': [
+        {'position': 1, 'start': 0, 'length': 1, 'expected_type': 'PMIC', 'search_terms': ['PMIC']},
+        {'position': 2, 'start': 1, 'length': 1, 'expected_type': 'SPD/Hub', 'search_terms': ['SPD/Hub', 'SPD', 'Hub']},
+        {'position': 3, 'start': 2, 'length': 1, 'expected_type': 'CKD', 'search_terms': ['CKD', 'Clock Driver']}
+    ]
+}
+
+def get_position_layout_key(segment, is_socamm=False):
+    return 'socamm' if is_socamm else str(segment).lower()
+
+def get_component_key(match):
+    return (
+        match.get('Component_Type', ''),
+        match.get('Supplier', ''),
+        match.get('Component_Generation', ''),
+        match.get('Revision', ''),
+        match.get('Process_Code', ''),
+        match.get('Product_Description', '')
+    )
+
+def get_component_preference(match):
+    # Prefer non-empty SAP numbers, then by supplier name
+    return (
+        match.get('SAP_Number', '') == '',
+        match.get('Supplier', ''),
+        match.get('Component_Generation', ''),
+        match.get('Revision', '')
+    )
+
+def build_position_index(component_validations_df, segment, layout_key):
+    """Map (position, process code) to the deduplicated, ordered component records for one segment and layout.
+    
+    Returns None when the segment has no rows.
+    """
+    segment_mask = text_isin(component_validations_df['Segment'], [segment, 'Server/Client', 'Client/Server'])
+    segment_data = component_validations_df[segment_mask]
+    
+    if segment_data.empty:
+        return None
+    
+    process_codes = segment_data['Process_Code'].astype(str).str.upper().to_numpy()
+    position_index = {}
+    
+    for spec in PROCESS_CODE_POSITION_MAPPINGS[layout_key]:
+        # Matches for each code in search-term order, then catalog order - the order the scan produced
+        matches_by_code = {}
+        for search_term in spec['search_terms']:
+            type_mask = text_contains(segment_data['Component_Type'], search_term, case=False).to_numpy()
+            for code, match in zip(process_codes[type_mask], segment_data[type_mask].to_dict('records')):
+                matches_by_code.setdefault(code, []).append(match)
+        
+        for code, position_matches in matches_by_code.items():
+            seen_components = set()
+            unique_matches = []
+            for match in position_matches:
+                component_key = get_component_key(match)
+                if component_key not in seen_components:
+                    seen_components.add(component_key)
+                    unique_matches.append(match)
+            
+            # SOCAMM positions keep match order
+            if layout_key != 'socamm' and len(unique_matches) > 1:
+                unique_matches.sort(key=get_component_preference)
+            
+            position_index[(spec['position'], code)] = unique_matches
+    
+    return position_index
+
+def get_position_index(component_validations_df, segment, layout_key):
+    return get_frame_artifact(
+        component_validations_df,
+        ('position_index', segment, layout_key),
+        lambda: build_position_index(component_validations_df, segment, layout_key)
+    )
+
+def get_position_catalog(component_validations_df, segment, layout_key):
+    """Long-form (position, code) -> component option table for batch joins, built from the position index.
+    
+    Returns None when the segment has no rows.
+    """
+    def build():
+        position_index = get_position_index(component_validations_df, segment, layout_key)
+        if position_index is None:
+            return None
+        
+        rows = []
+        for (position, code), matches in position_index.items():
+            for option, match in enumerate(matches):
+                row = build_decode_result_row(position, '', code, match, option + 1 if len(matches) > 1 else None)
+                row['Option_Order'] = option
+                rows.append(row)
+        
+        catalog = pd.DataFrame(rows, columns=DECODE_RESULT_COLUMNS + ['Option_Order'])
+        catalog['Position_Key'] = catalog['Position'].astype(str)
+        catalog['Option_Number'] = catalog['Option_Number'].astype('Int64')
+        return catalog.drop(columns=['Position', 'Expected_Component_Type'])
+    
+    return get_frame_artifact(component_validations_df, ('position_catalog', segment, layout_key), build)
+
+def build_decode_result_row(position, expected_type, code, match=None, option_number=None, description=None):
+    match = match or {}
+    return {
+        'Position': position,
+        'Expected_Component_Type': expected_type,
+        'Process_Code_Character': code,
+        'Product_Description': description if description is not None else match.get('Product_Description', ''),
+        'Supplier': match.get('Supplier', ''),
+        'Component_Generation': match.get('Component_Generation', ''),
+        'Revision': match.get('Revision', ''),
+        'SAP_Number': match.get('SAP_Number', ''),
+        'SPN': match.get('SPN', ''),
+        'Actual_Component_Type': match.get('Component_Type', ''),
+        'Actual_Segment': match.get('Segment', ''),
+        'Option_Number': option_number
+    }
+
+DECODE_RESULT_COLUMNS = list(build_decode_result_row(None, '', '').keys())
+
+def decode_process_code(process_code, segment, component_validations_df, is_socamm=False):
+    """Decode a cleaned, upper-case process code position by position using the per-version position index."""
+    layout_key = get_position_layout_key(segment, is_socamm)
+    layout = PROCESS_CODE_POSITION_MAPPINGS.get(layout_key)
+    
+    if layout is None:
+        return pd.DataFrame(), f"Unknown segment: {segment}"
+    
+    position_index = get_position_index(component_validations_df, segment, layout_key)
+    
+    if position_index is None:
+        return pd.DataFrame(), f"No data found for segment: {segment}"
+    
+    if is_socamm:
+        # SOCAMM positions are only decoded when the code is long enough to hold them
+        positions = [(spec, process_code[spec['start']:spec['start'] + spec['length']]) for spec in layout if len(process_code) >= spec['start'] + spec['length']]
+    else:
+        positions = [(layout[i] if i < len(layout) else None, char) for i, char in enumerate(process_code)]
+    
+    results = []
+    
+    for i, (spec, code) in enumerate(positions):
+        if spec is None:
+            # Position beyond expected range
+            results.append(build_decode_result_row(i + 1, 'Unknown', code, description=f'Position {i + 1} not defined for {segment}'))
+            continue
+        
+        unique_matches = position_index.get((spec['position'], code))
+        
+        if unique_matches:
+            for option, match in enumerate(unique_matches):
+                option_number = option + 1 if len(unique_matches) > 1 else None
+                results.append(build_decode_result_row(spec['position'], spec['expected_type'], code, match, option_number))
+        else:
+            results.append(build_decode_result_row(spec['position'], spec['expected_type'], code, description=f'No {spec["expected_type"]} found with code "{code}"'))
+    
+    results_df = pd.DataFrame(results)
+    
+    if results_df.empty:
+        return pd.DataFrame(), "No components found for this process code"
+    
+    return results_df, f"Found {len(results_df)} component options"
+
+def decode_process_code_cached(process_code, segment, component_validations_df, is_socamm=False):
+    """decode_process_code() memoized per catalog version in the process-wide decode cache."""
+    return get_decode_cache().get_or_decode(
+        (process_code, segment, bool(is_socamm)),
+        get_catalog_version(component_validations_df),
+        lambda: decode_process_code(process_code, segment, component_validations_df, is_socamm)
+    )
+
 def lookup_process_code_components(process_code, segment, component_validations_df, is_socamm=False):
     """Look up components for a given process code using positional component type mapping."""
     if component_validations_df is None or component_validations_df.empty:
@@ -707,342 +3105,202 @@ def lookup_process_code_components(process_code, segment, component_validations_
     if not process_code or str(process_code).strip() == '':
         return pd.DataFrame(), "No process code provided"
     
-    process_code = str(process_code).strip().upper()
-    
-    # Define positional component type mapping with simplified expected types
-    if is_socamm:
-        # SOCAMM: 1st character = SPD/Hub, 2nd-3rd characters = Voltage Regulator
-        position_mapping = {
-            1: {
-                'expected_type': 'SPD/Hub',
-                'search_terms': ['SPD/Hub', 'SPD', 'Hub']
-            },
-            2: {
-                'expected_type': 'Voltage Regulator',
-                'search_terms': ['Voltage Regulator', 'VR', 'Regulator']
-            }
-        }
-    elif segment.lower() == 'server':
-        position_mapping = {
-            1: {
-                'expected_type': 'PMIC',
-                'search_terms': ['PMIC']
-            },
-            2: {
-                'expected_type': 'SPD/Hub',
-                'search_terms': ['SPD/Hub', 'SPD', 'Hub']
-            },
-            3: {
-                'expected_type': 'Temp Sensor',
-                'search_terms': ['Temp Sensor', 'Temperature Sensor']
-            },
-            4: {
-                'expected_type': 'RCD/MRCD',
-                'search_terms': ['RCD', 'MRCD', 'Muxed RCD', 'RCD/MRCD']
-            },
-            5: {
-                'expected_type': 'Data Buffer',
-                'search_terms': ['Data Buffer', 'Buffer']
-            }
-        }
-    elif segment.lower() == 'client':
-        position_mapping = {
-            1: {
-                'expected_type': 'PMIC',
-                'search_terms': ['PMIC']
-            },
-            2: {
-                'expected_type': 'SPD/Hub',
-                'search_terms': ['SPD/Hub', 'SPD', 'Hub']
-            },
-            3: {
-                'expected_type': 'CKD',
-                'search_terms': ['CKD', 'Clock Driver']
-            }
-        }
-    else:
-        return pd.DataFrame(), f"Unknown segment: {segment}"
-    
-    # Get all component types available in SharePoint for this segment
-    segment_mask = (
-        (component_validations_df['Segment'] == segment) |
-        (component_validations_df['Segment'] == 'Server/Client') |
-        (component_validations_df['Segment'] == 'Client/Server')
-    )
+    process_code = str(process_code).strip().upper()
     
-    segment_data = component_validations_df[segment_mask]
+    return decode_process_code_cached(process_code, segment, component_validations_df, is_socamm)
+
+def find_material_description_column(df):
+    for candidate in ['MATERIAL_DESCRIPTION', 'Material_Description', 'Material Description']:
+        if candidate in df.columns:
+            return candidate
     
-    if segment_data.empty:
-        return pd.DataFrame(), f"No data found for segment: {segment}"
+    return None
+
+class MpnSearchIndex:
+    """N-gram inverted index over the distinct MPNs (MATERIAL_DESCRIPTION) of rows with a valid Design ID.
     
-    results = []
+    Values are kept sorted and upper-cased once. Each value is padded with n-1 end markers so every
+    character starts an n-gram: a query of at least n characters intersects the posting lists of its
+    n-grams and verifies the few candidates, and a shorter query is a prefix lookup in the sorted n-gram
+    keys. Queries containing regex metacharacters keep the regex semantics with a scan of the distinct values.
+    """
     
-    if is_socamm:
-        # Handle SOCAMM special case
-        if len(process_code) >= 1:
-            # Position 1: SPD/Hub
-            char = process_code[0]
-            mapping = position_mapping[1]
-            expected_type = mapping['expected_type']
-            search_terms = mapping['search_terms']
-            position_matches = []
-            
-            for search_term in search_terms:
-                type_matches = segment_data[
-                    (segment_data['Process_Code'].astype(str).str.upper() == char) &
-                    (segment_data['Component_Type'].str.contains(search_term, case=False, na=False))
-                ]
-                
-                if not type_matches.empty:
-                    position_matches.extend(type_matches.to_dict('records'))
-            
-            if position_matches:
-                # Deduplicate matches
-                seen_components = set()
-                unique_matches = []
-                
-                for match in position_matches:
-                    component_key = (
-                        match.get('Component_Type', ''),
-                        match.get('Supplier', ''),
-                        match.get('Component_Generation', ''),
-                        match.get('Revision', ''),
-                        match.get('Process_Code', ''),
-                        match.get('Product_Description', '')
-                    )
-                    
-                    if component_key not in seen_components:
-                        seen_components.add(component_key)
-                        unique_matches.append(match)
-                
-                # Add ALL unique matches for this position
-                for i, match in enumerate(unique_matches):
-                    results.append({
-                        'Position': 1,
-                        'Expected_Component_Type': expected_type,
-                        'Process_Code_Character': char,
-                        'Product_Description': match.get('Product_Description', ''),
-                        'Supplier': match.get('Supplier', ''),
-                        'Component_Generation': match.get('Component_Generation', ''),
-                        'Revision': match.get('Revision', ''),
-                        'SAP_Number': match.get('SAP_Number', ''),
-                        'SPN': match.get('SPN', ''),
-                        'Actual_Component_Type': match.get('Component_Type', ''),
-                        'Actual_Segment': match.get('Segment', ''),
-                        'Option_Number': i + 1 if len(unique_matches) > 1 else None
-                    })
-            else:
-                results.append({
-                    'Position': 1,
-                    'Expected_Component_Type': expected_type,
-                    'Process_Code_Character': char,
-                    'Product_Description': f'No {expected_type} found with code "{char}"',
-                    'Supplier': '',
-                    'Component_Generation': '',
-                    'Revision': '',
-                    'SAP_Number': '',
-                    'SPN': '',
-                    'Actual_Component_Type': '',
-                    'Actual_Segment': '',
-                    'Option_Number': None
-                })
+    REGEX_METACHARACTERS = set('.^$*+?{}[]\\|()')
+    PAD = '\0'
+    
+    def __init__(self, values, ngram_size):
+        self.ngram_size = ngram_size
+        self.values = np.array(sorted(values), dtype=object)
+        self.upper_values = [value.upper() for value in self.values]
+        self.postings = self._build_postings()
+        self.ngrams = sorted(self.postings)
+    
+    @classmethod
+    def from_frame(cls, module_bom_simple_df, ngram_size):
+        material_desc_col = find_material_description_column(module_bom_simple_df)
+        if not material_desc_col:
+            return None
         
-        if len(process_code) >= 3:
-            # Position 2-3: Voltage Regulator (2-character code)
-            voltage_regulator_code = process_code[1:3]
-            mapping = position_mapping[2]
-            expected_type = mapping['expected_type']
-            search_terms = mapping['search_terms']
-            position_matches = []
-            
-            for search_term in search_terms:
-                type_matches = segment_data[
-                    (segment_data['Process_Code'].astype(str).str.upper() == voltage_regulator_code) &
-                    (segment_data['Component_Type'].str.contains(search_term, case=False, na=False))
-                ]
-                
-                if not type_matches.empty:
-                    position_matches.extend(type_matches.to_dict('records'))
-            
-            if position_matches:
-                # Deduplicate matches
-                seen_components = set()
-                unique_matches = []
-                
-                for match in position_matches:
-                    component_key = (
-                        match.get('Component_Type', ''),
-                        match.get('Supplier', ''),
-                        match.get('Component_Generation', ''),
-                        match.get('Revision', ''),
-                        match.get('Process_Code', ''),
-                        match.get('Product_Description', '')
-                    )
-                    
-                    if component_key not in seen_components:
-                        seen_components.add(component_key)
-                        unique_matches.append(match)
-                
-                # Add ALL unique matches for this position
-                for i, match in enumerate(unique_matches):
-                    results.append({
-                        'Position': '2-3',
-                        'Expected_Component_Type': expected_type,
-                        'Process_Code_Character': voltage_regulator_code,
-                        'Product_Description': match.get('Product_Description', ''),
-                        'Supplier': match.get('Supplier', ''),
-                        'Component_Generation': match.get('Component_Generation', ''),
-                        'Revision': match.get('Revision', ''),
-                        'SAP_Number': match.get('SAP_Number', ''),
-                        'SPN': match.get('SPN', ''),
-                        'Actual_Component_Type': match.get('Component_Type', ''),
-                        'Actual_Segment': match.get('Segment', ''),
-                        'Option_Number': i + 1 if len(unique_matches) > 1 else None
-                    })
-            else:
-                results.append({
-                    'Position': '2-3',
-                    'Expected_Component_Type': expected_type,
-                    'Process_Code_Character': voltage_regulator_code,
-                    'Product_Description': f'No {expected_type} found with code "{voltage_regulator_code}"',
-                    'Supplier': '',
-                    'Component_Generation': '',
-                    'Revision': '',
-                    'SAP_Number': '',
-                    'SPN': '',
-                    'Actual_Component_Type': '',
-                    'Actual_Segment': '',
-                    'Option_Number': None
-                })
-    else:
-        # Handle regular (non-SOCAMM) process codes
-        for position, char in enumerate(process_code, 1):
-            if position not in position_mapping:
-                # Position beyond expected range
-                results.append({
-                    'Position': position,
-                    'Expected_Component_Type': 'Unknown',
-                    'Process_Code_Character': char,
-                    'Product_Description': f'Position {position} not defined for {segment}',
-                    'Supplier': '',
-                    'Component_Generation': '',
-                    'Revision': '',
-                    'SAP_Number': '',
-                    'SPN': '',
-                    'Actual_Component_Type': '',
-                    'Actual_Segment': '',
-                    'Option_Number': None
-                })
-                continue
-            
-            mapping = position_mapping[position]
-            expected_type = mapping['expected_type']
-            search_terms = mapping['search_terms']
-            position_matches = []
-            
-            # Look for components that match both the process code character AND the expected component type for this position
-            for search_term in search_terms:
-                # Find components that match the process code character and are of the expected type for this position
-                type_matches = segment_data[
-                    (segment_data['Process_Code'].astype(str).str.upper() == char) &
-                    (segment_data['Component_Type'].str.contains(search_term, case=False, na=False))
-                ]
-                
-                if not type_matches.empty:
-                    position_matches.extend(type_matches.to_dict('records'))
-            
-            if position_matches:
-                # Deduplicate matches based on key fields to avoid showing the same component multiple times
-                seen_components = set()
-                unique_matches = []
-                
-                for match in position_matches:
-                    # Create a unique key based on important fields
-                    component_key = (
-                        match.get('Component_Type', ''),
-                        match.get('Supplier', ''),
-                        match.get('Component_Generation', ''),
-                        match.get('Revision', ''),
-                        match.get('Process_Code', ''),
-                        match.get('Product_Description', '')
-                    )
-                    
-                    if component_key not in seen_components:
-                        seen_components.add(component_key)
-                        unique_matches.append(match)
-                
-                # If we have multiple unique matches, sort by preference
-                if len(unique_matches) > 1:
-                    # Sort by preference: prefer non-empty SAP numbers, then by supplier name
-                    unique_matches.sort(key=lambda x: (
-                        x.get('SAP_Number', '') == '',  # False (non-empty SAP) comes first
-                        x.get('Supplier', ''),
-                        x.get('Component_Generation', ''),
-                        x.get('Revision', '')
-                    ))
-                
-                # Add ALL unique matches for this position
-                for i, match in enumerate(unique_matches):
-                    results.append({
-                        'Position': position,
-                        'Expected_Component_Type': expected_type,
-                        'Process_Code_Character': char,
-                        'Product_Description': match.get('Product_Description', ''),
-                        'Supplier': match.get('Supplier', ''),
-                        'Component_Generation': match.get('Component_Generation', ''),
-                        'Revision': match.get('Revision', ''),
-                        'SAP_Number': match.get('SAP_Number', ''),
-                        'SPN': match.get('SPN', ''),
-                        'Actual_Component_Type': match.get('Component_Type', ''),
-                        'Actual_Segment': match.get('Segment', ''),
-                        'Option_Number': i + 1 if len(unique_matches) > 1 else None
-                    })
-            else:
-                # No matches found for this position and character
-                results.append({
-                    'Position': position,
-                    'Expected_Component_Type': expected_type,
-                    'Process_Code_Character': char,
-                    'Product_Description': f'No {expected_type} found with code "{char}"',
-                    'Supplier': '',
-                    'Component_Generation': '',
-                    'Revision': '',
-                    'SAP_Number': '',
-                    'SPN': '',
-                    'Actual_Component_Type': '',
-                    'Actual_Segment': '',
-                    'Option_Number': None
-                })
+        descriptions = module_bom_simple_df[material_desc_col][get_valid_design_id_mask(module_bom_simple_df)].dropna().unique()
+        values = {str(mpn) for mpn in descriptions if str(mpn).strip() and str(mpn).lower() != 'nan'}
+        return cls(values, ngram_size)
     
-    results_df = pd.DataFrame(results)
+    def _build_postings(self):
+        """Posting lists (sorted value ids) per n-gram, built column-wise one character offset at a time."""
+        if not len(self.values):
+            return {}
+        
+        padded = pd.Series(self.upper_values) + self.PAD * (self.ngram_size - 1)
+        lengths = padded.str.len().to_numpy() - (self.ngram_size - 1)
+        value_ids = np.arange(len(padded))
+        
+        gram_parts, id_parts = [], []
+        for offset in range(int(lengths.max())):
+            present = lengths > offset
+            gram_parts.append(padded[present].str.slice(offset, offset + self.ngram_size).to_numpy(dtype=object))
+            id_parts.append(value_ids[present])
+        
+        gram_codes, grams = pd.factorize(np.concatenate(gram_parts))
+        ids = np.concatenate(id_parts)
+        
+        # Sort by (n-gram, value id) and drop repeats of an n-gram within one value
+        order = np.lexsort((ids, gram_codes))
+        gram_codes, ids = gram_codes[order], ids[order]
+        keep = np.ones(len(ids), dtype=bool)
+        keep[1:] = (gram_codes[1:] != gram_codes[:-1]) | (ids[1:] != ids[:-1])
+        gram_codes, ids = gram_codes[keep], ids[keep]
+        
+        boundaries = np.flatnonzero(np.diff(gram_codes)) + 1
+        return dict(zip(grams[gram_codes[np.r_[0, boundaries]]], np.split(ids, boundaries)))
     
-    if results_df.empty:
-        return pd.DataFrame(), "No components found for this process code"
+    def search(self, search_term):
+        """Sorted MPNs containing search_term, case-insensitively, as search_mpn_in_rest_api() returns them."""
+        term = str(search_term)
+        
+        if self.REGEX_METACHARACTERS.intersection(term):
+            matches = pd.Series(self.values).str.contains(term, case=False, regex=True, na=False).to_numpy()
+            return self.values[matches].tolist()
+        
+        term = term.upper()
+        if not term:
+            return self.values.tolist()
+        
+        if len(term) < self.ngram_size:
+            # Every n-gram starting with the term marks an occurrence of it, so no verification is needed
+            start = bisect.bisect_left(self.ngrams, term)
+            end = bisect.bisect_left(self.ngrams, term + '\uffff')
+            matches = np.zeros(len(self.values), dtype=bool)
+            for gram in self.ngrams[start:end]:
+                matches[self.postings[gram]] = True
+            return self.values[matches].tolist()
+        
+        posting_lists = []
+        for offset in range(len(term) - self.ngram_size + 1):
+            posting = self.postings.get(term[offset:offset + self.ngram_size])
+            if posting is None:
+                return []
+            posting_lists.append(posting)
+        
+        posting_lists.sort(key=len)
+        candidates = posting_lists[0]
+        for posting in posting_lists[1:]:
+            candidates = np.intersect1d(candidates, posting, assume_unique=True)
+            if not len(candidates):
+                return []
+        
+        return [self.values[value_id] for value_id in candidates if term in self.upper_values[value_id]]
+
+def get_mpn_search_index(module_bom_simple_df):
+    return get_frame_artifact(
+        module_bom_simple_df,
+        'mpn_search_index',
+        lambda: MpnSearchIndex.from_frame(module_bom_simple_df, MPN_SEARCH_CONFIG['ngram_size'])
+    )
+
+def normalize_mpn(mpn):
+    return str(mpn).strip().upper()
+
+def build_mpn_row_index(module_bom_simple_df):
+    """Normalized MPN -> ascending row positions of its rows with a valid Design ID, or None without an MPN column."""
+    material_desc_col = find_material_description_column(module_bom_simple_df)
+    if not material_desc_col:
+        return None
     
-    return results_df, f"Found {len(results_df)} component options"
+    descriptions = module_bom_simple_df[material_desc_col]
+    positions = np.flatnonzero(get_valid_design_id_mask(module_bom_simple_df) & descriptions.notna().to_numpy())
+    if not len(positions):
+        return {}
+    
+    normalized = descriptions.iloc[positions].astype(str).str.strip().str.upper().to_numpy(dtype=object)
+    codes, mpns = pd.factorize(normalized)
+    order = np.argsort(codes, kind='stable')
+    codes, positions = codes[order], positions[order]
+    
+    boundaries = np.flatnonzero(np.diff(codes)) + 1
+    return dict(zip(mpns[codes[np.r_[0, boundaries]]], np.split(positions, boundaries)))
+
+def get_mpn_row_index(module_bom_simple_df):
+    return get_frame_artifact(module_bom_simple_df, 'mpn_row_index', lambda: build_mpn_row_index(module_bom_simple_df))
+
+def get_mpn_row_positions(selected_mpn, module_bom_simple_df, match='exact'):
+    """Row positions for a selected MPN from the load-time indexes, or None when the frame has no MPN column.
+    
+    'exact' is one hash lookup of the normalized MPN. 'contains' keeps the original semantics (every valid
+    row whose MPN contains the selection, case-insensitively) by expanding the selection through the
+    n-gram search index first.
+    """
+    row_index = get_mpn_row_index(module_bom_simple_df)
+    if row_index is None:
+        return None
+    
+    if match == 'exact':
+        return row_index.get(normalize_mpn(selected_mpn), np.array([], dtype=np.intp))
+    
+    matching_mpns = get_mpn_search_index(module_bom_simple_df).search(selected_mpn)
+    position_lists = [row_index[normalize_mpn(mpn)] for mpn in matching_mpns if normalize_mpn(mpn) in row_index]
+    if not position_lists:
+        return np.array([], dtype=np.intp)
+    return np.unique(np.concatenate(position_lists))
 
 def search_mpn_in_rest_api(search_term, module_bom_simple_df):
+    if MPN_SEARCH_CONFIG['pushdown']:
+        try:
+            return list(search_mpn_pushdown_cached(search_term, MPN_SEARCH_CONFIG['backend']))
+        except Exception as e:
+            st.error(f"Error searching MPNs: {e}")
+            return []
+    
+    if MPN_SEARCH_CONFIG['index'] and not module_bom_simple_df.empty:
+        try:
+            search_index = get_mpn_search_index(module_bom_simple_df)
+            if search_index is not None:
+                return search_index.search(search_term)
+        except Exception as e:
+            st.error(f"Error searching MPNs: {e}")
+            return []
+    
     matching_mpns = []
     
     try:
         if not module_bom_simple_df.empty:
-            # Filter out invalid Design IDs first
-            filtered_df = filter_valid_design_ids(module_bom_simple_df)
+            # Invalid Design IDs are excluded with the mask precomputed at load time
+            valid_mask = get_valid_design_id_mask(module_bom_simple_df)
             
             # Updated to prioritize MATERIAL_DESCRIPTION
             material_desc_columns = ['MATERIAL_DESCRIPTION', 'Material_Description', 'Material Description']
             material_desc_col = None
             
             for col_name in material_desc_columns:
-                if col_name in filtered_df.columns:
+                if col_name in module_bom_simple_df.columns:
                     material_desc_col = col_name
                     break
             
             if material_desc_col:
                 # Use partial matching - search for MPNs that contain the search term
-                matches = filtered_df[
-                    filtered_df[material_desc_col].astype(str).str.contains(search_term, case=False, na=False)
-                ][material_desc_col].unique()
+                material_descriptions = module_bom_simple_df[material_desc_col]
+                matches = material_descriptions[
+                    valid_mask & text_contains(material_descriptions, search_term, case=False).to_numpy()
+                ].unique()
                 matching_mpns.extend(matches)
             else:
                 st.error("No material description column found in the database")
@@ -1055,28 +3313,55 @@ def search_mpn_in_rest_api(search_term, module_bom_simple_df):
     
     return matching_mpns
 
-def get_process_code_from_rest_api(selected_mpn, module_bom_simple_df):
+def get_process_code_from_rest_api(selected_mpn, module_bom_simple_df, match=None):
+    """BOM rows for a selected MPN. match is 'exact' (normalized MPN equality) or 'contains' (every MPN containing
+    the selection); it defaults to MPN_SEARCH_CONFIG['selected_mpn_match']. Pushdown and scans always use contains.
+    """
+    match = match or MPN_SEARCH_CONFIG['selected_mpn_match']
+    
+    if MPN_SEARCH_CONFIG['pushdown']:
+        try:
+            matches = get_mpn_records_pushdown_cached(selected_mpn, MPN_SEARCH_CONFIG['backend'])
+        except Exception as e:
+            return f"Error: {str(e)}", None
+        
+        if matches.empty:
+            return f"No records found for MPN: {selected_mpn}", None
+        
+        return f"Found {len(matches)} records", matches
+    
     try:
         if module_bom_simple_df.empty:
             return "No data available", None
         
-        # Filter out invalid Design IDs first
-        filtered_df = filter_valid_design_ids(module_bom_simple_df)
+        if MPN_SEARCH_CONFIG['index']:
+            positions = get_mpn_row_positions(selected_mpn, module_bom_simple_df, match)
+            if positions is None:
+                return "No material description column found in database", None
+            
+            if not len(positions):
+                return f"No records found for MPN: {selected_mpn}", None
+            
+            matches = module_bom_simple_df.iloc[positions]
+            return f"Found {len(matches)} records", matches
+        
+        # Invalid Design IDs are excluded with the mask precomputed at load time
+        valid_mask = get_valid_design_id_mask(module_bom_simple_df)
         
         # Updated to prioritize MATERIAL_DESCRIPTION
         material_desc_columns = ['MATERIAL_DESCRIPTION', 'Material_Description', 'Material Description']
         material_desc_col = None
         
         for col_name in material_desc_columns:
-            if col_name in filtered_df.columns:
+            if col_name in module_bom_simple_df.columns:
                 material_desc_col = col_name
                 break
         
         if not material_desc_col:
             return "No material description column found in database", None
         
-        matches = filtered_df[
-            filtered_df[material_desc_col].astype(str).str.contains(selected_mpn, case=False, na=False)
+        matches = module_bom_simple_df[
+            valid_mask & text_contains(module_bom_simple_df[material_desc_col], selected_mpn, case=False).to_numpy()
         ]
         
         if matches.empty:
@@ -1087,34 +3372,59 @@ def get_process_code_from_rest_api(selected_mpn, module_bom_simple_df):
     except Exception as e:
         return f"Error: {str(e)}", None
 
-def filter_valid_design_ids(df):
-    """Filter out records with invalid Design IDs (starting with Z, V, or U)."""
-    if df.empty:
-        return df
-    
-    # Find Design ID column
-    design_id_column = None
+def find_design_id_column(df):
     design_id_candidates = ['DESIGN_ID', 'Design_ID', 'DesignID', 'Design ID']
     
     for candidate in design_id_candidates:
         if candidate in df.columns:
-            design_id_column = candidate
-            break
+            return candidate
+    
+    return None
+
+def compute_valid_design_id_mask(design_ids):
+    """Vectorized is_valid_design_id(): the rule runs once per distinct ID, then is broadcast by factorized codes."""
+    codes, uniques = pd.factorize(design_ids)
+    valid_uniques = np.array([is_valid_design_id(design_id) for design_id in uniques], dtype=bool)
+    
+    mask = np.zeros(len(codes), dtype=bool)
+    present = codes >= 0
+    mask[present] = valid_uniques[codes[present]]
+    return mask
+
+def add_design_id_validity(df):
+    """Add the precomputed Design ID validity column. Recomputed whenever the data is (re)loaded."""
+    if df is None or df.empty:
+        return df
     
+    design_id_column = find_design_id_column(df)
     if not design_id_column:
-        # If no Design ID column found, return original dataframe
         return df
     
-    # Filter out invalid Design IDs
-    initial_count = len(df)
-    filtered_df = df[df[design_id_column].apply(is_valid_design_id)]
-    final_count = len(filtered_df)
+    df = df.drop(columns=[VALID_DESIGN_ID_COLUMN], errors='ignore')
+    df[VALID_DESIGN_ID_COLUMN] = compute_valid_design_id_mask(df[design_id_column])
+    return df
+
+def get_valid_design_id_mask(df):
+    """Boolean array of rows with a valid Design ID, read from the precomputed column when present."""
+    if VALID_DESIGN_ID_COLUMN in df.columns:
+        return df[VALID_DESIGN_ID_COLUMN].to_numpy(dtype=bool)
+    
+    design_id_column = find_design_id_column(df)
+    if not design_id_column:
+        return np.ones(len(df), dtype=bool)
+    
+    return compute_valid_design_id_mask(df[design_id_column])
+
+def filter_valid_design_ids(df):
+    """Filter out records with invalid Design IDs (starting with Z, V, or U)."""
+    if df.empty:
+        return df
     
-    return filtered_df
+    return df[get_valid_design_id_mask(df)]
 
 def is_valid_design_id(design_id):
     """Check if Design ID is valid (doesn't start with Z, V, or U)."""
-    if not design_id or str(design_id).lower() in ['nan', 'none', '', 'null', 'na']:
+    if pd.isna(design_id) or not design_id or str(design_id).lower() in ['nan', 'none', '', 'null', 'na']:
         return False
     
     design_str = str(design_id).strip().upper()
@@ -1125,6 +3435,103 @@ def is_valid_design_id(design_id):
     
     return True
 
+def escape_like_term(term, backend):
+    """Escape LIKE wildcards so the search term is matched literally (with ESCAPE '\\')."""
+    special_chars = PUSHDOWN_DIALECTS[backend]['like_special_chars']
+    return "".join(f"\\{char}" if char in special_chars else char for char in term)
+
+def build_valid_design_id_predicate(backend, column="DESIGN_ID"):
+    """SQL equivalent of is_valid_design_id(): drop null/placeholder IDs and IDs starting with Z, V or U."""
+    quoted_column = f"[{column}]"
+    first_char = PUSHDOWN_DIALECTS[backend]['first_char'].format(column=quoted_column)
+    
+    return (
+        f"{quoted_column} IS NOT NULL "
+        f"AND LOWER({quoted_column}) NOT IN ('nan', 'none', '', 'null', 'na') "
+        f"AND UPPER({first_char}) NOT IN ('Z', 'V', 'U')"
+    )
+
+@contextmanager
+def borrow_pushdown_connection(backend):
+    """Borrow a connection for pushdown queries: the pyodbc pool, or the local SQLite stand-in."""
+    if backend == 'sqlserver':
+        with borrow_database_connection() as conn:
+            yield conn
+    elif backend == 'sqlite':
+        conn = sqlite3.connect(MPN_SEARCH_CONFIG['sqlite_path'])
+        try:
+            yield conn
+        finally:
+            conn.close()
+    else:
+        raise ValueError(f"Unknown pushdown backend: {backend}")
+
+def run_pushdown_query(backend, query, params):
+    with borrow_pushdown_connection(backend) as conn:
+        cursor = conn.cursor()
+        try:
+            cursor.execute(query, params)
+            column_names = [column[0] for column in cursor.description]
+            rows = cursor.fetchall()
+        finally:
+            cursor.close()
+    
+    return pd.DataFrame.from_records([tuple(row) for row in rows], columns=column_names)
+
+def build_mpn_pushdown_query(backend, select_list):
+    table = MODULE_BOM_LOAD_CONFIG['table']
+    return (
+        f"SELECT {select_list} FROM {table} "
+        f"WHERE UPPER([MATERIAL_DESCRIPTION]) LIKE ? ESCAPE '\\' "
+        f"AND {build_valid_design_id_predicate(backend)}"
+    )
+
+def search_mpn_pushdown(search_term, backend):
+    """Server-side version of search_mpn_in_rest_api(): returns the sorted list of matching MPNs."""
+    pattern = f"%{escape_like_term(str(search_term).upper(), backend)}%"
+    query = build_mpn_pushdown_query(backend, "DISTINCT [MATERIAL_DESCRIPTION]")
+    
+    matches = run_pushdown_query(backend, query, [pattern])['MATERIAL_DESCRIPTION']
+    
+    return sorted(set(mpn for mpn in matches if mpn and str(mpn).strip() and str(mpn).lower() != 'nan'))
+
+def get_mpn_records_pushdown(selected_mpn, backend):
+    """Server-side version of the row lookup in get_process_code_from_rest_api()."""
+    pattern = f"%{escape_like_term(str(selected_mpn).upper(), backend)}%"
+    select_list = ", ".join(f"[{column}]" for column in MODULE_BOM_LOAD_CONFIG['columns'])
+    
+    return run_pushdown_query(backend, build_mpn_pushdown_query(backend, select_list), [pattern])
+
+@st.cache_data(max_entries=MPN_SEARCH_CONFIG['cache_size'], ttl=MPN_SEARCH_CONFIG['cache_ttl'], show_spinner=False)
+def search_mpn_pushdown_cached(search_term, backend):
+    return tuple(search_mpn_pushdown(search_term, backend))
+
+@st.cache_data(max_entries=MPN_SEARCH_CONFIG['cache_size'], ttl=MPN_SEARCH_CONFIG['cache_ttl'], show_spinner=False)
+def get_mpn_records_pushdown_cached(selected_mpn, backend):
+    return get_mpn_records_pushdown(selected_mpn, backend)
+
+def build_sqlite_standin(module_bom_simple_df, sqlite_path=None):
+    """Write the BOM frame into a local SQLite database so pushdown search can run offline."""
+    sqlite_path = sqlite_path or MPN_SEARCH_CONFIG['sqlite_path']
+    directory = os.path.dirname(sqlite_path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    
+    standin_df = module_bom_simple_df.copy()
+    for column in standin_df.columns:
+        if isinstance(standin_df[column].dtype, (pd.CategoricalDtype, pd.StringDtype)):
+            standin_df[column] = standin_df[column].astype(object).where(standin_df[column].notna(), None)
+    
+    conn = sqlite3.connect(sqlite_path)
+    try:
+        standin_df.to_sql(MODULE_BOM_LOAD_CONFIG['table'], conn, if_exists='replace', index=False)
+        conn.commit()
+    finally:
+        conn.close()
+    
+    logger.info(f"Wrote {len(standin_df)} rows to SQLite stand-in {sqlite_path}")
+    return sqlite_path
+
 def extract_form_factors_from_sql(module_bom_simple_df):
     default_form_factors = ["No Filter", "CSODIMM", "CUDIMM", "MRDIMM", "RDIMM", "SODIMM", "UDIMM", "LPCAMM", "SlimCAMM", "SOCAMM", "NA"]
     
@@ -1227,11 +3634,8 @@ def initialize_data_loading():
     if 'data_loaded' not in st.session_state:
         st.session_state.data_loaded = False
     
-    if 'sql_data' not in st.session_state:
-        st.session_state.sql_data = None
-    
-    if 'sharepoint_data' not in st.session_state:
-        st.session_state.sharepoint_data = None
+    if 'data_version' not in st.session_state:
+        st.session_state.data_version = None
     
     if 'data_load_error' not in st.session_state:
         st.session_state.data_load_error = None
@@ -1240,14 +3644,19 @@ def load_all_data():
     try:
         st.session_state.data_load_error = None
         
-        with st.spinner("Loading SQL data..."):
-            sql_data = load_data_cached()
-            st.session_state.sql_data = sql_data
+        refresher = get_data_refresher()
+        refresher.update_credentials(*get_sharepoint_credentials())
+        refresher.start()
+        
+        current = refresher.current_version()
+        if current is None:
+            with st.spinner("Loading SQL and SharePoint data..."):
+                current = wait_for_first_version(refresher)
         
-        with st.spinner("Loading SharePoint data..."):
-            sharepoint_data = load_sharepoint_data_cached()
-            st.session_state.sharepoint_data = sharepoint_data
+        if current is None:
+            raise Exception(refresher.status_snapshot()['last_error'] or "Data could not be loaded")
         
+        st.session_state.data_version = current['version']
         st.session_state.data_loaded = True
         return True
         
@@ -1260,7 +3669,14 @@ def get_cached_data():
     if not st.session_state.data_loaded:
         return None, None
     
-    return st.session_state.sql_data, st.session_state.sharepoint_data
+    # Sessions hold only a version number; the frames live once in the shared store.
+    # Each rerun moves the session onto the newest version - never waits on a rebuild.
+    record = get_data_store().checkout(get_session_id())
+    if record is None:
+        return None, None
+    
+    st.session_state.data_version = record['version']
+    return record['sql_data'], record['sharepoint_data']
 
 def show_data_loading_interface():
     st.sidebar.header("Data Management")
@@ -1291,15 +3707,44 @@ def show_data_loading_interface():
     st.session_state["sharepoint_username"] = sharepoint_username
     st.session_state["sharepoint_password"] = sharepoint_password
     
+    refresher = get_data_refresher()
+    refresher.update_credentials(sharepoint_username, sharepoint_password)
+    
     if st.session_state.data_loaded:
         sql_data, sharepoint_data = get_cached_data()
+        current = refresher.current_version()
+        status = refresher.status_snapshot()
         
-        if 'last_refresh_time' in st.session_state:
+        if current is not None:
             local_timezone = pytz.timezone('America/Denver')
-            local_time_obj = datetime.now(local_timezone)
+            local_time_obj = datetime.fromisoformat(current['built_at']).astimezone(local_timezone)
             formatted_time = local_time_obj.strftime('%Y-%m-%d %H:%M:%S')
             tz_abbr = local_time_obj.strftime('%Z')
-            st.sidebar.info(f"Last refreshed: {formatted_time} {tz_abbr}")
+            st.sidebar.info(f"Data version {current['version']} ({current['source']}), built {formatted_time} {tz_abbr}")
+            
+            freshness = status['snapshot_freshness']
+            if current['source'] == 'snapshot' and freshness:
+                if freshness['status'] == 'stale':
+                    st.sidebar.warning(f"Snapshot is out of date ({freshness['detail']}). Newer data is loading in the background.")
+                elif freshness['status'] == 'fresh':
+                    st.sidebar.success("Snapshot matches the database")
+        
+        with st.sidebar.expander("Data store memory"):
+            report = get_data_store().memory_report()
+            st.caption(f"{report['total_mb']:.1f} MB held for {report['live_sessions']} live sessions")
+            st.dataframe(pd.DataFrame(report['versions']), use_container_width=True)
+            
+            decode_report = get_decode_cache().report()
+            st.caption(
+                f"Decode cache: {decode_report['entries']} codes, {decode_report['hit_rate']:.0%} hit rate "
+                f"({decode_report['hits']} hits, {decode_report['misses']} misses, {decode_report['evictions']} evictions)"
+            )
+        
+        if refresher.is_busy():
+            st.sidebar.caption("Refreshing in the background - the current data stays available until the new version is ready.")
+            render_load_progress({source: st.sidebar.empty() for source in status['sources']}, status['sources'])
+        elif status['last_error']:
+            st.sidebar.error(f"Last refresh failed, still serving the previous version: {status['last_error']}")
     
     else:
         st.sidebar.warning("Data not loaded")
@@ -1307,24 +3752,13 @@ def show_data_loading_interface():
             st.sidebar.error(f"Error: {st.session_state.data_load_error}")
     
     if st.sidebar.button("Refresh Data", key="refresh_data_button", help="Reload data from SQL Database and SharePoint"):
-        with st.spinner("Refreshing data..."):
-            if hasattr(load_data_cached, 'clear'):
-                load_data_cached.clear()
-            if hasattr(load_sharepoint_data_cached, 'clear'):
-                load_sharepoint_data_cached.clear()
-            
-            for key in ['sql_data', 'sharepoint_data', 'data_loaded', 'data_load_error']:
-                if key in st.session_state:
-                    del st.session_state[key]
-            
-            success = load_all_data()
-            
-            if success:
-                st.session_state.last_refresh_time = datetime.now()
-                st.sidebar.success("Data refreshed successfully!")
-                st.rerun()
-            else:
-                st.sidebar.error("Failed to refresh data")
+        if hasattr(search_mpn_pushdown_cached, 'clear'):
+            search_mpn_pushdown_cached.clear()
+        if hasattr(get_mpn_records_pushdown_cached, 'clear'):
+            get_mpn_records_pushdown_cached.clear()
+        
+        refresher.request_refresh()
+        st.sidebar.success("Refresh started in the background")
 
 def explain_process_code_without_zeros(process_code, segment):
     """Explain process code using only non-zero characters."""
@@ -1367,317 +3801,171 @@ def lookup_process_code_components_without_zeros(process_code, segment, componen
     if not clean_process_code:
         return pd.DataFrame(), "Process code contains only zeros"
     
-    # Define positional component type mapping with simplified expected types
-    if is_socamm:
-        # SOCAMM: 1st character = SPD/Hub, 2nd-3rd characters = Voltage Regulator
-        position_mapping = {
-            1: {
-                'expected_type': 'SPD/Hub',
-                'search_terms': ['SPD/Hub', 'SPD', 'Hub']
-            },
-            2: {
-                'expected_type': 'Voltage Regulator',
-                'search_terms': ['Voltage Regulator', 'VR', 'Regulator']
-            }
-        }
-    elif segment.lower() == 'server':
-        position_mapping = {
-            1: {
-                'expected_type': 'PMIC',
-                'search_terms': ['PMIC']
-            },
-            2: {
-                'expected_type': 'SPD/Hub',
-                'search_terms': ['SPD/Hub', 'SPD', 'Hub']
-            },
-            3: {
-                'expected_type': 'Temp Sensor',
-                'search_terms': ['Temp Sensor', 'Temperature Sensor']
-            },
-            4: {
-                'expected_type': 'RCD/MRCD',
-                'search_terms': ['RCD', 'MRCD', 'Muxed RCD', 'RCD/MRCD']
-            },
-            5: {
-                'expected_type': 'Data Buffer',
-                'search_terms': ['Data Buffer', 'Buffer']
-            }
-        }
-    elif segment.lower() == 'client':
-        position_mapping = {
-            1: {
-                'expected_type': 'PMIC',
-                'search_terms': ['PMIC']
-            },
-            2: {
-                'expected_type': 'SPD/Hub',
-                'search_terms': ['SPD/Hub', 'SPD', 'Hub']
-            },
-            3: {
-                'expected_type': 'CKD',
-                'search_terms': ['CKD', 'Clock Driver']
-            }
-        }
+    return decode_process_code_cached(clean_process_code, segment, component_validations_df, is_socamm)
+
+TRUE_FLAG_VALUES = ['TRUE', 'T', 'YES', 'Y']
+
+def parse_flag_column(values):
+    """Booleans from a column of bools, numbers or text: 'true'/'yes' and non-zero numbers are True, anything else False."""
+    values = pd.Series(values, dtype=object)
+    numbers = pd.to_numeric(values, errors='coerce')
+    text = values.where(values.notna(), '').astype(str).str.strip().str.upper()
+    return (text.isin(TRUE_FLAG_VALUES) | (numbers.notna() & (numbers != 0))).to_numpy(dtype=bool)
+
+def normalize_decode_requests(requests, segment=None, is_socamm=False):
+    """Turn a frame (Process_Code, Segment, Is_SOCAMM), a Series of codes or an iterable of
+    (code, segment, is_socamm) tuples into one request frame; Request_ID is the position in the input.
+    """
+    if isinstance(requests, pd.DataFrame):
+        code_column = next((col for col in ['Process_Code', 'PROCESS_CODE', 'Process Code'] if col in requests.columns), None)
+        if code_column is None:
+            raise ValueError("Decode requests need a Process_Code column")
+        
+        frame = pd.DataFrame({
+            'Input_Process_Code': requests[code_column].to_numpy(dtype=object),
+            'Segment': requests['Segment'].to_numpy(dtype=object) if 'Segment' in requests.columns else segment,
+            'Is_SOCAMM': requests['Is_SOCAMM'].to_numpy(dtype=object) if 'Is_SOCAMM' in requests.columns else is_socamm
+        })
+    elif isinstance(requests, pd.Series):
+        frame = pd.DataFrame({'Input_Process_Code': requests.to_numpy(dtype=object), 'Segment': segment, 'Is_SOCAMM': is_socamm})
     else:
-        return pd.DataFrame(), f"Unknown segment: {segment}"
+        frame = pd.DataFrame.from_records(list(requests), columns=['Input_Process_Code', 'Segment', 'Is_SOCAMM'])
     
-    # Get all component types available in SharePoint for this segment
-    segment_mask = (
-        (component_validations_df['Segment'] == segment) |
-        (component_validations_df['Segment'] == 'Server/Client') |
-        (component_validations_df['Segment'] == 'Client/Server')
-    )
+    frame['Segment'] = frame['Segment'].fillna('Unknown').astype(str)
+    frame['Is_SOCAMM'] = parse_flag_column(frame['Is_SOCAMM'])
+    frame.insert(0, 'Request_ID', np.arange(len(frame)))
     
-    segment_data = component_validations_df[segment_mask]
+    return frame
+
+def split_process_code_positions(clean_codes, layout, is_socamm, segment):
+    """Explode clean codes (indexed by Decode_Key) into one row per decoded position, one vectorized slice per position."""
+    lengths = clean_codes.str.len()
+    pieces = []
     
-    if segment_data.empty:
-        return pd.DataFrame(), f"No data found for segment: {segment}"
+    for order, spec in enumerate(layout):
+        end = spec['start'] + spec['length']
+        present = clean_codes[lengths >= end]
+        pieces.append(pd.DataFrame({
+            'Position_Order': order,
+            'Position': spec['position'],
+            'Position_Key': str(spec['position']),
+            'Expected_Component_Type': spec['expected_type'],
+            'Process_Code_Character': present.str.slice(spec['start'], end)
+        }))
     
-    results = []
+    # Characters beyond the layout are reported as undefined positions (SOCAMM ignores them)
+    max_length = int(lengths.max()) if not is_socamm and len(lengths) else 0
+    for order in range(len(layout), max_length):
+        present = clean_codes[lengths > order]
+        pieces.append(pd.DataFrame({
+            'Position_Order': order,
+            'Position': order + 1,
+            'Position_Key': str(order + 1),
+            'Expected_Component_Type': 'Unknown',
+            'Process_Code_Character': present.str.slice(order, order + 1),
+            'Product_Description': f'Position {order + 1} not defined for {segment}'
+        }))
     
-    if is_socamm:
-        # Handle SOCAMM special case
-        if len(clean_process_code) >= 1:
-            # Position 1: SPD/Hub
-            char = clean_process_code[0]
-            mapping = position_mapping[1]
-            expected_type = mapping['expected_type']
-            search_terms = mapping['search_terms']
-            position_matches = []
-            
-            for search_term in search_terms:
-                type_matches = segment_data[
-                    (segment_data['Process_Code'].astype(str).str.upper() == char) &
-                    (segment_data['Component_Type'].str.contains(search_term, case=False, na=False))
-                ]
-                
-                if not type_matches.empty:
-                    position_matches.extend(type_matches.to_dict('records'))
-            
-            if position_matches:
-                # Deduplicate matches
-                seen_components = set()
-                unique_matches = []
-                
-                for match in position_matches:
-                    component_key = (
-                        match.get('Component_Type', ''),
-                        match.get('Supplier', ''),
-                        match.get('Component_Generation', ''),
-                        match.get('Revision', ''),
-                        match.get('Process_Code', ''),
-                        match.get('Product_Description', '')
-                    )
-                    
-                    if component_key not in seen_components:
-                        seen_components.add(component_key)
-                        unique_matches.append(match)
-                
-                # Add ALL unique matches for this position
-                for i, match in enumerate(unique_matches):
-                    results.append({
-                        'Position': 1,
-                        'Expected_Component_Type': expected_type,
-                        'Process_Code_Character': char,
-                        'Product_Description': match.get('Product_Description', ''),
-                        'Supplier': match.get('Supplier', ''),
-                        'Component_Generation': match.get('Component_Generation', ''),
-                        'Revision': match.get('Revision', ''),
-                        'SAP_Number': match.get('SAP_Number', ''),
-                        'SPN': match.get('SPN', ''),
-                        'Actual_Component_Type': match.get('Component_Type', ''),
-                        'Actual_Segment': match.get('Segment', ''),
-                        'Option_Number': i + 1 if len(unique_matches) > 1 else None
-                    })
-            else:
-                results.append({
-                    'Position': 1,
-                    'Expected_Component_Type': expected_type,
-                    'Process_Code_Character': char,
-                    'Product_Description': f'No {expected_type} found with code "{char}"',
-                    'Supplier': '',
-                    'Component_Generation': '',
-                    'Revision': '',
-                    'SAP_Number': '',
-                    'SPN': '',
-                    'Actual_Component_Type': '',
-                    'Actual_Segment': '',
-                    'Option_Number': None
-                })
+    positions = pd.concat(pieces)
+    positions.index.name = 'Decode_Key'
+    return positions.reset_index()
+
+def decode_process_codes_batch(requests, component_validations_df, segment=None, is_socamm=False, remove_zeros=True):
+    """Decode many process codes at once with joins against the per-version position catalog.
+    
+    Returns one long-form frame with a row per request and decoded position/option, in the same shape as
+    decode_process_code() plus Request_ID, the input, the clean code and a per-request Decode_Message.
+    Requests that cannot be decoded get a single row carrying only the message.
+    """
+    frame = normalize_decode_requests(requests, segment, is_socamm)
+    
+    # Decode each distinct (code, segment, SOCAMM) once and fan the results back out to the requests
+    frame['Decode_Key'] = frame.groupby(['Input_Process_Code', 'Segment', 'Is_SOCAMM'], sort=False, dropna=False).ngroup()
+    distinct = frame.drop_duplicates('Decode_Key').set_index('Decode_Key')[['Input_Process_Code', 'Segment', 'Is_SOCAMM']]
+    
+    input_codes = distinct['Input_Process_Code'].astype(str).str.strip()
+    missing_code = distinct['Input_Process_Code'].isna() | (input_codes == '')
+    if remove_zeros:
+        clean_codes = input_codes.str.replace('0', '', regex=False).str.strip().str.upper()
+    else:
+        clean_codes = input_codes.str.upper()
+    clean_codes[missing_code] = ''
+    layout_keys = distinct['Segment'].str.lower().where(~distinct['Is_SOCAMM'], 'socamm')
+    
+    messages = pd.Series(None, index=distinct.index, dtype=object)
+    messages[missing_code] = "No process code provided"
+    messages[~missing_code & (clean_codes == '')] = "Process code contains only zeros"
+    unknown_layout = messages.isna() & ~layout_keys.isin(PROCESS_CODE_POSITION_MAPPINGS.keys())
+    messages[unknown_layout] = "Unknown segment: " + distinct.loc[unknown_layout, 'Segment']
+    
+    if component_validations_df is None or component_validations_df.empty:
+        messages[messages.isna()] = "No SharePoint data available"
+    
+    decoded_groups = []
+    decodable = messages.isna()
+    
+    for (segment_value, layout_key), keys in distinct[decodable].groupby([distinct.loc[decodable, 'Segment'], layout_keys[decodable]], sort=False).groups.items():
+        catalog = get_position_catalog(component_validations_df, segment_value, layout_key)
         
-        if len(clean_process_code) >= 3:
-            # Position 2-3: Voltage Regulator (2-character code)
-            voltage_regulator_code = clean_process_code[1:3]
-            mapping = position_mapping[2]
-            expected_type = mapping['expected_type']
-            search_terms = mapping['search_terms']
-            position_matches = []
-            
-            for search_term in search_terms:
-                type_matches = segment_data[
-                    (segment_data['Process_Code'].astype(str).str.upper() == voltage_regulator_code) &
-                    (segment_data['Component_Type'].str.contains(search_term, case=False, na=False))
-                ]
-                
-                if not type_matches.empty:
-                    position_matches.extend(type_matches.to_dict('records'))
-            
-            if position_matches:
-                # Deduplicate matches
-                seen_components = set()
-                unique_matches = []
-                
-                for match in position_matches:
-                    component_key = (
-                        match.get('Component_Type', ''),
-                        match.get('Supplier', ''),
-                        match.get('Component_Generation', ''),
-                        match.get('Revision', ''),
-                        match.get('Process_Code', ''),
-                        match.get('Product_Description', '')
-                    )
-                    
-                    if component_key not in seen_components:
-                        seen_components.add(component_key)
-                        unique_matches.append(match)
-                
-                # Add ALL unique matches for this position
-                for i, match in enumerate(unique_matches):
-                    results.append({
-                        'Position': '2-3',
-                        'Expected_Component_Type': expected_type,
-                        'Process_Code_Character': voltage_regulator_code,
-                        'Product_Description': match.get('Product_Description', ''),
-                        'Supplier': match.get('Supplier', ''),
-                        'Component_Generation': match.get('Component_Generation', ''),
-                        'Revision': match.get('Revision', ''),
-                        'SAP_Number': match.get('SAP_Number', ''),
-                        'SPN': match.get('SPN', ''),
-                        'Actual_Component_Type': match.get('Component_Type', ''),
-                        'Actual_Segment': match.get('Segment', ''),
-                        'Option_Number': i + 1 if len(unique_matches) > 1 else None
-                    })
-            else:
-                results.append({
-                    'Position': '2-3',
-                    'Expected_Component_Type': expected_type,
-                    'Process_Code_Character': voltage_regulator_code,
-                    'Product_Description': f'No {expected_type} found with code "{voltage_regulator_code}"',
-                    'Supplier': '',
-                    'Component_Generation': '',
-                    'Revision': '',
-                    'SAP_Number': '',
-                    'SPN': '',
-                    'Actual_Component_Type': '',
-                    'Actual_Segment': '',
-                    'Option_Number': None
-                })
+        if catalog is None:
+            messages.loc[keys] = f"No data found for segment: {segment_value}"
+            continue
+        
+        positions = split_process_code_positions(clean_codes.loc[keys], PROCESS_CODE_POSITION_MAPPINGS[layout_key], layout_key == 'socamm', segment_value)
+        decoded = positions.drop(columns=['Product_Description'], errors='ignore').merge(
+            catalog, on=['Position_Key', 'Process_Code_Character'], how='left', indicator=True
+        )
+        
+        no_match = (decoded['_merge'] == 'left_only').to_numpy()
+        undefined = (decoded['Expected_Component_Type'] == 'Unknown').to_numpy()
+        decoded.loc[no_match, 'Product_Description'] = (
+            'No ' + decoded.loc[no_match, 'Expected_Component_Type'] + ' found with code "' + decoded.loc[no_match, 'Process_Code_Character'] + '"'
+        )
+        decoded.loc[undefined, 'Product_Description'] = 'Position ' + decoded.loc[undefined, 'Position_Key'] + f' not defined for {segment_value}'
+        decoded_groups.append(decoded.drop(columns=['_merge']))
+    
+    if decoded_groups:
+        results = pd.concat(decoded_groups, ignore_index=True)
+        match_columns = [col for col in DECODE_RESULT_COLUMNS if col not in ('Position', 'Option_Number')]
+        results[match_columns] = results[match_columns].fillna('')
+        results['Option_Order'] = results['Option_Order'].fillna(0)
+        results = results.sort_values(['Decode_Key', 'Position_Order', 'Option_Order'], kind='stable')
+        
+        option_counts = results.groupby('Decode_Key').size()
+        messages.loc[option_counts.index] = "Found " + option_counts.astype(str) + " component options"
+        results = results.drop(columns=['Position_Order', 'Position_Key', 'Option_Order'])
     else:
-        # Handle regular (non-SOCAMM) process codes
-        for position, char in enumerate(clean_process_code, 1):
-            if position not in position_mapping:
-                # Position beyond expected range
-                results.append({
-                    'Position': position,
-                    'Expected_Component_Type': 'Unknown',
-                    'Process_Code_Character': char,
-                    'Product_Description': f'Position {position} not defined for {segment}',
-                    'Supplier': '',
-                    'Component_Generation': '',
-                    'Revision': '',
-                    'SAP_Number': '',
-                    'SPN': '',
-                    'Actual_Component_Type': '',
-                    'Actual_Segment': '',
-                    'Option_Number': None
-                })
-                continue
-            
-            mapping = position_mapping[position]
-            expected_type = mapping['expected_type']
-            search_terms = mapping['search_terms']
-            position_matches = []
-            
-            # Look for components that match both the process code character AND the expected component type for this position
-            for search_term in search_terms:
-                # Find components that match the process code character and are of the expected type for this position
-                type_matches = segment_data[
-                    (segment_data['Process_Code'].astype(str).str.upper() == char) &
-                    (segment_data['Component_Type'].str.contains(search_term, case=False, na=False))
-                ]
-                
-                if not type_matches.empty:
-                    position_matches.extend(type_matches.to_dict('records'))
-            
-            if position_matches:
-                # Deduplicate matches based on key fields to avoid showing the same component multiple times
-                seen_components = set()
-                unique_matches = []
-                
-                for match in position_matches:
-                    # Create a unique key based on important fields
-                    component_key = (
-                        match.get('Component_Type', ''),
-                        match.get('Supplier', ''),
-                        match.get('Component_Generation', ''),
-                        match.get('Revision', ''),
-                        match.get('Process_Code', ''),
-                        match.get('Product_Description', '')
-                    )
-                    
-                    if component_key not in seen_components:
-                        seen_components.add(component_key)
-                        unique_matches.append(match)
-                
-                # If we have multiple unique matches, sort by preference
-                if len(unique_matches) > 1:
-                    # Sort by preference: prefer non-empty SAP numbers, then by supplier name
-                    unique_matches.sort(key=lambda x: (
-                        x.get('SAP_Number', '') == '',  # False (non-empty SAP) comes first
-                        x.get('Supplier', ''),
-                        x.get('Component_Generation', ''),
-                        x.get('Revision', '')
-                    ))
-                
-                # Add ALL unique matches for this position
-                for i, match in enumerate(unique_matches):
-                    results.append({
-                        'Position': position,
-                        'Expected_Component_Type': expected_type,
-                        'Process_Code_Character': char,
-                        'Product_Description': match.get('Product_Description', ''),
-                        'Supplier': match.get('Supplier', ''),
-                        'Component_Generation': match.get('Component_Generation', ''),
-                        'Revision': match.get('Revision', ''),
-                        'SAP_Number': match.get('SAP_Number', ''),
-                        'SPN': match.get('SPN', ''),
-                        'Actual_Component_Type': match.get('Component_Type', ''),
-                        'Actual_Segment': match.get('Segment', ''),
-                        'Option_Number': i + 1 if len(unique_matches) > 1 else None
-                    })
-            else:
-                # No matches found for this position and character
-                results.append({
-                    'Position': position,
-                    'Expected_Component_Type': expected_type,
-                    'Process_Code_Character': char,
-                    'Product_Description': f'No {expected_type} found with code "{char}"',
-                    'Supplier': '',
-                    'Component_Generation': '',
-                    'Revision': '',
-                    'SAP_Number': '',
-                    'SPN': '',
-                    'Actual_Component_Type': '',
-                    'Actual_Segment': '',
-                    'Option_Number': None
-                })
+        results = pd.DataFrame(columns=['Decode_Key'] + DECODE_RESULT_COLUMNS)
     
-    results_df = pd.DataFrame(results)
+    # Requests without decoded positions keep a single message-only row
+    results = pd.concat([results, pd.DataFrame({'Decode_Key': messages.index[~messages.index.isin(results['Decode_Key'])]})], ignore_index=True)
+    results['Option_Number'] = results['Option_Number'].astype('Int64')
+    results['Result_Order'] = np.arange(len(results))
     
-    if results_df.empty:
-        return pd.DataFrame(), "No components found for this process code"
+    summary = pd.DataFrame({'Clean_Process_Code': clean_codes, 'Decode_Message': messages})
+    output = frame.merge(summary, left_on='Decode_Key', right_index=True, how='left').merge(results, on='Decode_Key', how='left')
+    output = output.sort_values(['Request_ID', 'Result_Order']).reset_index(drop=True)
     
-    return results_df, f"Found {len(results_df)} component options"
+    return output[['Request_ID', 'Input_Process_Code', 'Segment', 'Is_SOCAMM', 'Clean_Process_Code'] + DECODE_RESULT_COLUMNS + ['Decode_Message']]
+
+def build_module_bom_decode_requests(module_bom_simple_df):
+    """Distinct ModuleBOM_Simple process codes with the segment the MPN tab infers from the clean code length."""
+    if module_bom_simple_df is None or module_bom_simple_df.empty or 'PROCESS_CODE' not in module_bom_simple_df.columns:
+        return pd.DataFrame(columns=['Process_Code', 'Form_Factor', 'Segment', 'Is_SOCAMM', 'BOM_Rows'])
+    
+    form_factors = module_bom_simple_df['FORM_FACTOR'] if 'FORM_FACTOR' in module_bom_simple_df.columns else pd.Series('', index=module_bom_simple_df.index)
+    requests = pd.DataFrame({
+        'Process_Code': module_bom_simple_df['PROCESS_CODE'].astype(object),
+        'Form_Factor': form_factors.astype(object).fillna('').astype(str).str.strip().str.upper()
+    })
+    requests = requests[requests['Process_Code'].notna()]
+    requests = requests.groupby(['Process_Code', 'Form_Factor'], sort=False).size().rename('BOM_Rows').reset_index()
+    
+    clean_lengths = requests['Process_Code'].astype(str).str.strip().str.replace('0', '', regex=False).str.len()
+    requests['Segment'] = np.select([clean_lengths.isin([2, 3]), clean_lengths.isin([4, 5])], ['Client', 'Server'], default='Unknown')
+    requests['Is_SOCAMM'] = requests['Form_Factor'] == 'SOCAMM'
+    
+    return requests[['Process_Code', 'Form_Factor', 'Segment', 'Is_SOCAMM', 'BOM_Rows']]
 
 def main():
     st.title("Process Code & MPN Lookup")
@@ -1910,6 +4198,42 @@ def main():
                         st.warning(f"No components found: {message}")
                 else:
                     st.warning("SharePoint data not available for component lookup")
+        
+        with st.expander("Batch Decode", expanded=False):
+            batch_source = st.radio(
+                "Process codes to decode",
+                options=["All ModuleBOM_Simple process codes", "Uploaded CSV"],
+                key="batch_decode_source",
+                help="The CSV needs a Process_Code column and may add Segment and Is_SOCAMM columns"
+            )
+            
+            batch_requests = None
+            if batch_source == "Uploaded CSV":
+                uploaded_codes = st.file_uploader("Process code CSV", type=["csv"], key="batch_decode_upload")
+                if uploaded_codes is not None:
+                    batch_requests = pd.read_csv(uploaded_codes, dtype=str)
+            else:
+                batch_requests = build_module_bom_decode_requests(module_bom_simple_df)
+            
+            if batch_requests is not None and st.button("Decode All", key="batch_decode_button"):
+                try:
+                    with st.spinner(f"Decoding {len(batch_requests)} process codes..."):
+                        batch_results = decode_process_codes_batch(batch_requests, component_validations_df, segment=lookup_segment)
+                    
+                    decoded_requests = batch_results.drop_duplicates('Request_ID')
+                    failed_requests = decoded_requests['Position'].isna().sum()
+                    st.success(f"Decoded {len(decoded_requests) - failed_requests} of {len(decoded_requests)} process codes into {len(batch_results)} rows")
+                    
+                    st.dataframe(batch_results.head(1000), use_container_width=True)
+                    st.download_button(
+                        "Download Results (CSV)",
+                        data=batch_results.to_csv(index=False).encode('utf-8'),
+                        file_name="process_code_decode.csv",
+                        mime="text/csv",
+                        key="batch_decode_download"
+                    )
+                except ValueError as e:
+                    st.error(f"Error decoding process codes: {e}")
 
     with tab2:
         st.write("Generate a process code by selecting individual components:")
@@ -1944,8 +4268,7 @@ def main():
                 col1, col2, col3, col4 = st.columns(4)
                 
                 with col1:
-                    suppliers = get_filtered_options(component_validations_df, 'Supplier', 
-                                                   Segment=generator_segment, Component_Type=component_type)
+                    suppliers = get_generator_options(component_validations_df, generator_segment, component_type)
                     if suppliers:
                         selected_supplier = st.selectbox(f"Supplier", suppliers, key=f"{component_type}_supplier")
                     else:
@@ -1954,9 +4277,7 @@ def main():
                 
                 with col2:
                     if selected_supplier:
-                        generations = get_filtered_options(component_validations_df, 'Component_Generation',
-                                                         Segment=generator_segment, Component_Type=component_type, 
-                                                         Supplier=selected_supplier)
+                        generations = get_generator_options(component_validations_df, generator_segment, component_type, selected_supplier)
                         if generations:
                             selected_generation = st.selectbox(f"Generation", generations, key=f"{component_type}_generation")
                         else:
@@ -1968,9 +4289,7 @@ def main():
                 
                 with col3:
                     if selected_supplier and selected_generation:
-                        revisions = get_filtered_options(component_validations_df, 'Revision',
-                                                       Segment=generator_segment, Component_Type=component_type,
-                                                       Supplier=selected_supplier, Component_Generation=selected_generation)
+                        revisions = get_generator_options(component_validations_df, generator_segment, component_type, selected_supplier, selected_generation)
                         if revisions:
                             selected_revision = st.selectbox(f"Revision", revisions, key=f"{component_type}_revision")
                         else:
@@ -2033,6 +4352,55 @@ def main():
                     st.dataframe(summary_df, use_container_width=True)
                 else:
                     st.error("Failed to generate process code")
+            
+            with st.expander("All Valid Module Codes", expanded=False):
+                enumeration_suppliers = st.multiselect("Suppliers", predefined_options['supplier'], key="enumeration_suppliers")
+                enumeration_statuses = st.multiselect(
+                    "Product Status",
+                    get_filtered_options(component_validations_df, 'Product_Status'),
+                    key="enumeration_statuses"
+                )
+                
+                candidates = get_module_code_candidates(component_validations_df, generator_segment, enumeration_suppliers, enumeration_statuses)
+                combination_count = count_module_code_combinations(candidates)
+                st.caption(
+                    f"{combination_count:,} {generator_segment} module codes: "
+                    + ", ".join(f"{component_type} {len(options)}" for component_type, options in candidates)
+                )
+                
+                enumeration_limit = st.number_input(
+                    "Maximum codes",
+                    min_value=1,
+                    max_value=MODULE_CODE_ENUMERATION_CONFIG['max_limit'],
+                    value=MODULE_CODE_ENUMERATION_CONFIG['default_limit'],
+                    key="enumeration_limit",
+                    help=f"Downloads are built in server memory, so at most {MODULE_CODE_ENUMERATION_CONFIG['max_limit']:,} codes are generated at a time"
+                )
+                if combination_count > MODULE_CODE_ENUMERATION_CONFIG['max_limit']:
+                    st.caption(
+                        f"Only the first {MODULE_CODE_ENUMERATION_CONFIG['max_limit']:,} codes can be downloaded. "
+                        "Filter by supplier or product status to download the rest."
+                    )
+                
+                if combination_count and st.button("Generate Module Codes", key="enumeration_button"):
+                    # Rows are encoded straight into one bytes buffer, which the download serves without another copy
+                    csv_buffer = io.BytesIO()
+                    csv_text = io.TextIOWrapper(csv_buffer, encoding='utf-8', newline='', write_through=True)
+                    written = write_module_codes_csv(
+                        enumerate_module_codes(candidates, limit=min(int(enumeration_limit), MODULE_CODE_ENUMERATION_CONFIG['max_limit'])),
+                        csv_text,
+                        [component_type for component_type, _ in candidates]
+                    )
+                    csv_text.detach()
+                    
+                    st.success(f"Generated {written:,} of {combination_count:,} module codes")
+                    st.download_button(
+                        "Download Module Codes (CSV)",
+                        data=csv_buffer.getvalue(),
+                        file_name=f"{generator_segment.lower()}_module_codes.csv",
+                        mime="text/csv",
+                        key="enumeration_download"
+                    )
         
         else:
             st.warning("SharePoint data not available. Cannot generate process codes.")
@@ -2060,9 +4428,18 @@ def main():
                 
                 selected_mpn = st.selectbox("Select an MPN:", matching_mpns, key="selected_mpn")
                 
+                include_containing_mpns = st.checkbox(
+                    "Include MPNs containing the selection",
+                    value=MPN_SEARCH_CONFIG['selected_mpn_match'] == 'contains',
+                    key="include_containing_mpns",
+                    help="Also show rows for longer MPNs that contain the selected one"
+                )
+                
                 if selected_mpn:
                     with st.spinner("Getting process code information..."):
-                        result_message, result_data = get_process_code_from_rest_api(selected_mpn, module_bom_simple_df)
+                        result_message, result_data = get_process_code_from_rest_api(
+                            selected_mpn, module_bom_simple_df, 'contains' if include_containing_mpns else 'exact'
+                        )
                     
                     st.info(result_message)
                     